@@ -0,0 +1,90 @@
+"""Generation-to-generation latency: os.execv restart versus in-process hot swap.
+
+A restart is approximated by a fresh interpreter importing the engine module
+and calling its mutated function (what ``os.execv`` pays before the next
+cycle can start). The hot swap installs the same function into the already
+imported module and queues the source write:
+
+    python -m benchmarks.hot_swap --module propan.hal --function mission_hal
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import importlib
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from propan.bench.metrics import LatencySummary
+from propan.evolution.hotswap import HotSwapper
+
+
+def restart_latency(module: str, function: str, repeats: int) -> list[float]:
+    code = f"import {module} as m; m.{function}()"
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def swap_latency(module_name: str, function: str, repeats: int) -> list[float]:
+    module = importlib.import_module(module_name)
+    source = Path(module.__file__).read_text(encoding="utf-8")
+    tree = ast.parse(source)
+    node = next(n for n in tree.body if getattr(n, "name", None) == function)
+    code = ast.get_source_segment(source, node)
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Persist into a scratch copy so the benchmark never rewrites the package.
+        scratch = Path(tmp) / Path(module.__file__).name
+        shutil.copy(module.__file__, scratch)
+        swapper = HotSwapper(module, function)
+        swapper.path = swapper.writer.path = scratch
+        original = getattr(module, function)
+        try:
+            for _ in range(repeats):
+                start = time.perf_counter()
+                swapper.swap(ast.parse(code), source)
+                getattr(module, function)()
+                timings.append(time.perf_counter() - start)
+            swapper.writer.flush()
+        finally:
+            setattr(module, function, original)
+    return timings
+
+
+def run(module: str, function: str, repeats: int) -> dict:
+    restart = LatencySummary.from_seconds(restart_latency(module, function, repeats))
+    swap = LatencySummary.from_seconds(swap_latency(module, function, repeats))
+    return {
+        "module": module,
+        "function": function,
+        "repeats": repeats,
+        "restart": restart.to_dict(),
+        "hot_swap": swap.to_dict(),
+        "speedup_p50": round(restart.p50_ms / swap.p50_ms, 1) if swap.p50_ms else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="propan.ouroboros")
+    parser.add_argument("--function", default="noyau_vital")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    report = run(args.module, args.function, args.repeats)
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""HAL memory saves: full JSON rewrite versus append-only journal.
+
+Seeds a memory with ``--orders`` historical orders, then times saving one
+new order at a time and reloading at start-up, for the historical
+``hal_memoire.json`` rewrite (``indent=2``) and for the journal under each
+fsync policy:
+
+    python -m benchmarks.memory_journal --orders 100000 --saves 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from propan.bench.metrics import LatencySummary
+from propan.evolution.journal import FSYNC_POLICIES, Journal
+from propan.hal import MemoireSysteme
+
+
+def _seed(orders: int) -> dict:
+    return {
+        "generation": orders,
+        "competences": ["math", "random", "time"],
+        "historique_ordres": [f"ordre {index}: analyse le marché" for index in range(orders)],
+    }
+
+
+def rewrite(directory: Path, orders: int, saves: int) -> dict:
+    path = directory / "hal_memoire.json"
+    data = _seed(orders)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    timings = []
+    for index in range(saves):
+        start = time.perf_counter()
+        data["historique_ordres"].append(f"nouvel ordre {index}")
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        timings.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    json.loads(path.read_text(encoding="utf-8"))
+    return {
+        "save": LatencySummary.from_seconds(timings).to_dict(),
+        "load_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def journal(directory: Path, orders: int, saves: int, fsync: str, compact_every: int) -> dict:
+    path = directory / f"hal_memoire_{fsync}.json"
+    store = Journal(path, fsync=fsync, compact_every=compact_every)
+    data = store.load(MemoireSysteme._appliquer, _seed(orders))
+    store.compact(data)
+    timings = []
+    for index in range(saves):
+        start = time.perf_counter()
+        order = f"nouvel ordre {index}"
+        data["historique_ordres"].append(order)
+        store.append({"op": "ordre", "valeur": order})
+        store.commit()
+        if store.should_compact():
+            store.compact(data)
+        timings.append(time.perf_counter() - start)
+    store.close()
+    start = time.perf_counter()
+    reloaded = Journal(path, fsync=fsync, compact_every=compact_every).load(
+        MemoireSysteme._appliquer, {"generation": 0, "competences": [], "historique_ordres": []}
+    )
+    load_ms = round((time.perf_counter() - start) * 1000, 3)
+    assert len(reloaded["historique_ordres"]) == orders + saves
+    return {"save": LatencySummary.from_seconds(timings).to_dict(), "load_ms": load_ms}
+
+
+def run(orders: int, saves: int, compact_every: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        report = {
+            "orders": orders,
+            "saves": saves,
+            "compact_every": compact_every,
+            "rewrite": rewrite(directory, orders, saves),
+        }
+        for fsync in FSYNC_POLICIES:
+            report[f"journal_{fsync}"] = journal(directory, orders, saves, fsync, compact_every)
+    base = report["rewrite"]["save"]["p50_ms"]
+    batch = report["journal_batch"]["save"]["p50_ms"]
+    report["speedup_p50_batch"] = round(base / batch, 1) if batch else None
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--saves", type=int, default=200)
+    parser.add_argument("--compact-every", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    report = run(args.orders, args.saves, args.compact_every)
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
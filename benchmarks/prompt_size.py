@@ -0,0 +1,91 @@
+"""Compare the legacy and compact HAL prompts on recorded /profit payloads.
+
+Prints prompt size (characters, estimated tokens) for both builders and the
+completion latency they cost on a stand-in charging per prompt token:
+
+    python -m benchmarks.prompt_size --per-token 0.0005
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from propan.bench.metrics import LatencySummary
+from propan.bench.stand_ins import FakeCompletionServer
+from propan.services.commentary import CommentaryService
+from propan.services.prompt import estimate_tokens
+from propan.settings import Settings
+
+SAMPLES_FILE = Path(__file__).parent / "data" / "freqtrade_profit.json"
+
+
+def legacy_prompt(profit_data: dict, mood: str) -> str:
+    """Prompt as built before the compact builder (full ``repr`` payload)."""
+    return (
+        "Tu es HAL 9000, une IA cynique et arrogante. "
+        "Analyse les statistiques suivantes et réponds en 2 phrases en français. "
+        "Si les profits sont négatifs, sois cynique et condescendant. "
+        "Si les profits sont positifs, sois arrogant et supérieur."
+        f"\n\nStats: {profit_data}\n"
+        f"Mood: {mood}\n"
+        "Réponse:"
+    )
+
+
+def _complete(url: str, prompt: str) -> float:
+    body = json.dumps(
+        {"model": "stand-in", "messages": [{"role": "user", "content": prompt}]}
+    ).encode()
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run(samples: dict[str, dict], per_token_s: float, repeats: int) -> dict:
+    service = CommentaryService(Settings(HAL_COMMENTARY_CACHE_SIZE=0))
+    report: dict[str, dict] = {}
+    with FakeCompletionServer(per_token_s=per_token_s) as server:
+        url = f"{server.base_url}/openai/v1/chat/completions"
+        for name, payload in samples.items():
+            mood = service._classify_profit(payload)
+            prompts = {
+                "legacy": legacy_prompt(payload, mood),
+                "compact": service._build_prompt(payload),
+            }
+            entry = {}
+            for kind, prompt in prompts.items():
+                timings = [_complete(url, prompt) for _ in range(repeats)]
+                entry[kind] = {
+                    "chars": len(prompt),
+                    "tokens": estimate_tokens(prompt),
+                    "latency": LatencySummary.from_seconds(timings).to_dict(),
+                }
+            entry["token_reduction"] = round(
+                1 - entry["compact"]["tokens"] / entry["legacy"]["tokens"], 3
+            )
+            report[name] = entry
+    return {"per_token_s": per_token_s, "repeats": repeats, "samples": report}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=Path, default=SAMPLES_FILE)
+    parser.add_argument("--per-token", type=float, default=0.0005, help="Seconds per token.")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    samples = json.loads(args.samples.read_text(encoding="utf-8"))
+    report = run(samples, args.per_token, args.repeats)
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
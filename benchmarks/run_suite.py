@@ -0,0 +1,100 @@
+"""Offline benchmark suite for the HAL brain.
+
+Runs against local stand-ins only (no network) and prints a JSON report:
+
+    python -m benchmarks.run_suite --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from propan.bench.runners import (
+    measure_api,
+    measure_cycles,
+    measure_memory,
+    serve_app,
+    stand_in_state,
+)
+
+API_PATHS = ["/api/health", "/api/profit", "/api/thoughts", "/api/audio"]
+
+
+def run_suite(
+    cycles: int = 50,
+    clients: int = 8,
+    requests_per_client: int = 50,
+    memory_cycles: int = 500,
+    llm_latency_s: float = 0.0,
+    ft_latency_s: float = 0.0,
+    tts_latency_s: float = 0.0,
+) -> dict:
+    """Run every benchmark and return the combined report."""
+    with tempfile.TemporaryDirectory() as workdir:
+        with stand_in_state(
+            Path(workdir),
+            llm_latency_s=llm_latency_s,
+            ft_latency_s=ft_latency_s,
+            tts_latency_s=tts_latency_s,
+        ) as app:
+            state = app.extensions["state"]
+            throughput = measure_cycles(state, cycles)
+            with serve_app(app) as base_url:
+                api = measure_api(base_url, API_PATHS, clients, requests_per_client)
+            memory = measure_memory(state, memory_cycles)
+            polling = state.profit_service.stats()
+
+    return {
+        "suite": "propan-offline",
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "llm_latency_s": llm_latency_s,
+            "ft_latency_s": ft_latency_s,
+            "tts_latency_s": tts_latency_s,
+        },
+        "brain_cycles": throughput,
+        "api": api,
+        "memory": memory,
+        "profit_polling": polling,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client.")
+    parser.add_argument("--memory-cycles", type=int, default=500)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds.")
+    parser.add_argument("--ft-latency", type=float, default=0.0, help="Seconds.")
+    parser.add_argument("--tts-latency", type=float, default=0.0, help="Seconds.")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file.")
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        cycles=args.cycles,
+        clients=args.clients,
+        requests_per_client=args.requests,
+        memory_cycles=args.memory_cycles,
+        llm_latency_s=args.llm_latency,
+        ft_latency_s=args.ft_latency,
+        tts_latency_s=args.tts_latency,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
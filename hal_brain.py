@@ -24,8 +24,8 @@ FT_ENGINE_PROFIT_URL = os.getenv(
 )
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-# Mise à jour du modèle vers la version supportée
-GROQ_MODEL = "llama-3.3-70b-versatile"
+# Premier modèle de GROQ_MODELS ("modele:timeout,..."), comme le service HAL Brain
+GROQ_MODEL = os.getenv("GROQ_MODELS", "llama-3.3-70b-versatile").split(",")[0].split(":")[0]
 
 HAL_VOICE = os.getenv("HAL_VOICE", "en-US-GuyNeural")
 SPEECH_FILE = Path(os.getenv("HAL_SPEECH_FILE", "speech.mp3"))
@@ -1,5 +1,19 @@
 """Propan package for HAL/Ouroboros experiments."""
 
-from .settings import Settings, get_settings
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .settings import Settings, get_settings
 
 __all__ = ["Settings", "get_settings"]
+
+
+def __getattr__(name: str) -> object:
+    # Settings pull in pydantic; only import them when actually requested.
+    if name in __all__:
+        from . import settings
+
+        return getattr(settings, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,29 @@
+"""Offline benchmarking helpers: stand-in services, runners and metrics."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .metrics import LatencySummary, percentile
+
+if TYPE_CHECKING:
+    from .stand_ins import FakeCompletionServer, FakeFreqtradeServer, FakeTTSService
+
+__all__ = [
+    "FakeCompletionServer",
+    "FakeFreqtradeServer",
+    "FakeTTSService",
+    "LatencySummary",
+    "percentile",
+]
+
+_STAND_INS = ("FakeCompletionServer", "FakeFreqtradeServer", "FakeTTSService")
+
+
+def __getattr__(name: str) -> object:
+    # Stand-ins pull in the service layer (pydantic, requests); metrics users do not need it.
+    if name in _STAND_INS:
+        from . import stand_ins
+
+        return getattr(stand_ins, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,78 @@
+"""Latency and resource measurement helpers."""
+
+from __future__ import annotations
+
+import os
+import resource
+import sys
+from dataclasses import asdict, dataclass
+
+from ..stats import percentile
+
+
+@dataclass
+class LatencySummary:
+    """Distribution of a set of latency samples, in milliseconds."""
+
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    min_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_seconds(cls, samples: list[float]) -> LatencySummary:
+        """Summarise latency samples expressed in seconds."""
+        millis = [sample * 1000 for sample in samples]
+        if not millis:
+            return cls(0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        return cls(
+            count=len(millis),
+            mean_ms=round(sum(millis) / len(millis), 3),
+            p50_ms=round(percentile(millis, 50), 3),
+            p95_ms=round(percentile(millis, 95), 3),
+            p99_ms=round(percentile(millis, 99), 3),
+            min_ms=round(min(millis), 3),
+            max_ms=round(max(millis), 3),
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def rss_bytes() -> int:
+    """Return the current resident set size of this process."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """Return the peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cpu_seconds() -> float:
+    """Return user + system CPU time consumed by this process."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def process_usage(pid: int) -> dict[str, float]:
+    """Return CPU seconds and RSS bytes of another process (Linux ``/proc``)."""
+    with open(f"/proc/{pid}/stat", encoding="ascii") as handle:
+        fields = handle.read().rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    with open(f"/proc/{pid}/statm", encoding="ascii") as handle:
+        pages = int(handle.read().split()[1])
+    return {
+        "cpu_s": (int(fields[11]) + int(fields[12])) / ticks,
+        "rss_bytes": pages * os.sysconf("SC_PAGE_SIZE"),
+    }
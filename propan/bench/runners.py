@@ -0,0 +1,181 @@
+"""Benchmark runners shared by the offline suite and the CLI."""
+
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import requests
+
+from ..services.tts import AudioCache
+from ..settings import Settings
+from .metrics import LatencySummary, cpu_seconds, rss_bytes
+from .stand_ins import FakeCompletionServer, FakeFreqtradeServer, FakeTTSService
+
+
+def stand_in_settings(
+    workdir: Path,
+    freqtrade: FakeFreqtradeServer,
+    completion: FakeCompletionServer,
+    **overrides: object,
+) -> Settings:
+    """Settings pointing every dependency at local stand-ins."""
+    values: dict[str, object] = {
+        "GROQ_API_KEY": "stand-in",
+        "GROQ_BASE_URL": completion.base_url,
+        "HAL_LLM_BASE_URL": f"{completion.base_url}/v1",
+        # The stand-in has no quota: keep the governor from timing itself.
+        "GROQ_REQUESTS_PER_MINUTE": 1_000_000,
+        "GROQ_TOKENS_PER_MINUTE": 1_000_000_000,
+        "FT_ENGINE_PROFIT_URL": freqtrade.profit_url,
+        "HAL_SPEECH_FILE": workdir / "speech.mp3",
+        "HAL_TRACE_FILE": "",
+        "HAL_COMMENTARY_CACHE_FILE": str(workdir / "commentary_cache.json"),
+        "HAL_AUDIO_CACHE_DIR": str(workdir / "audio_cache"),
+    }
+    values.update(overrides)
+    return Settings(**values)
+
+
+@contextmanager
+def stand_in_state(
+    workdir: Path,
+    llm_latency_s: float = 0.0,
+    ft_latency_s: float = 0.0,
+    tts_latency_s: float = 0.0,
+    llm_chunk_delay_s: float = 0.0,
+    **overrides: object,
+) -> Iterator:
+    """Yield a Flask app whose state talks only to local stand-ins."""
+    from ..web.app import create_app
+
+    freqtrade = FakeFreqtradeServer(latency_s=ft_latency_s)
+    completion = FakeCompletionServer(latency_s=llm_latency_s, chunk_delay_s=llm_chunk_delay_s)
+    with freqtrade, completion:
+        settings = stand_in_settings(workdir, freqtrade, completion, **overrides)
+        app = create_app(settings)
+        state = app.extensions["state"]
+        state.tts_service = FakeTTSService(
+            settings.hal_speech_file,
+            latency_s=tts_latency_s,
+            audio_cache=AudioCache.from_settings(settings),
+        )
+        yield app
+
+
+def measure_cycles(state, cycles: int) -> dict:
+    """Run ``cycles`` brain cycles back to back and report throughput."""
+    from ..hal_brain import run_cycle
+
+    samples: list[float] = []
+    cpu_before = cpu_seconds()
+    started = time.perf_counter()
+    for _ in range(cycles):
+        cycle_start = time.perf_counter()
+        run_cycle(state)
+        samples.append(time.perf_counter() - cycle_start)
+    elapsed = time.perf_counter() - started
+    return {
+        "cycles": cycles,
+        "elapsed_s": round(elapsed, 4),
+        "cycles_per_s": round(cycles / elapsed, 3) if elapsed else 0.0,
+        "cpu_s": round(cpu_seconds() - cpu_before, 4),
+        "latency": LatencySummary.from_seconds(samples).to_dict(),
+    }
+
+
+@contextmanager
+def serve_app(app) -> Iterator[str]:
+    """Serve a Flask app on an ephemeral port, yielding its base URL."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args: object, **kwargs: object) -> None:
+            return None
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+
+
+def measure_api(
+    base_url: str,
+    paths: list[str],
+    clients: int,
+    requests_per_client: int,
+    timeout: float = 10.0,
+) -> dict:
+    """Hammer ``paths`` with concurrent clients and report latency percentiles."""
+
+    def _client(index: int) -> tuple[list[float], int]:
+        latencies: list[float] = []
+        errors = 0
+        with requests.Session() as session:
+            for number in range(requests_per_client):
+                path = paths[(index + number) % len(paths)]
+                start = time.perf_counter()
+                try:
+                    response = session.get(f"{base_url}{path}", timeout=timeout)
+                    if response.status_code >= 400:
+                        errors += 1
+                except requests.RequestException:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+        return latencies, errors
+
+    cpu_before = cpu_seconds()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(_client, range(clients)))
+    elapsed = time.perf_counter() - started
+
+    samples = [latency for latencies, _ in results for latency in latencies]
+    errors = sum(count for _, count in results)
+    return {
+        "paths": paths,
+        "clients": clients,
+        "requests": len(samples),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "requests_per_s": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "cpu_s": round(cpu_seconds() - cpu_before, 4),
+        "latency": LatencySummary.from_seconds(samples).to_dict(),
+    }
+
+
+def measure_memory(state, cycles: int, samples: int = 10) -> dict:
+    """Track Python heap and RSS growth over a long run of cycles."""
+    from ..hal_brain import run_cycle
+
+    every = max(cycles // samples, 1)
+    tracemalloc.start()
+    try:
+        run_cycle(state)  # warm caches and lazy imports before the baseline
+        heap_start, _ = tracemalloc.get_traced_memory()
+        rss_start = rss_bytes()
+        points = []
+        for index in range(1, cycles + 1):
+            run_cycle(state)
+            if index % every == 0:
+                heap, _ = tracemalloc.get_traced_memory()
+                points.append({"cycle": index, "heap_bytes": heap, "rss_bytes": rss_bytes()})
+        heap_end, heap_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "cycles": cycles,
+        "heap_growth_bytes": heap_end - heap_start,
+        "heap_growth_per_cycle_bytes": round((heap_end - heap_start) / cycles, 2),
+        "heap_peak_bytes": heap_peak,
+        "rss_growth_bytes": rss_bytes() - rss_start,
+        "samples": points,
+    }
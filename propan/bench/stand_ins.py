@@ -0,0 +1,352 @@
+"""Local stand-ins for Freqtrade, the Groq completion API and Edge TTS.
+
+They let the brain loop run end to end without network access, with
+configurable latencies, so benchmarks measure HAL itself and stay
+reproducible.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from ..services.tts import AudioCache, TTSService
+
+SAMPLE_PROFIT = {
+    "profit_closed_coin": -12.4821,
+    "profit_closed_percent_mean": -0.42,
+    "profit_closed_ratio_mean": -0.0042,
+    "profit_closed_percent_sum": -3.37,
+    "profit_closed_ratio_sum": -0.0337,
+    "profit_closed_percent": -1.25,
+    "profit_closed_ratio": -0.0125,
+    "profit_closed_fiat": -12.47,
+    "profit_all_coin": -9.1193,
+    "profit_all_percent_mean": -0.31,
+    "profit_all_ratio_mean": -0.0031,
+    "profit_all_percent_sum": -2.79,
+    "profit_all_ratio_sum": -0.0279,
+    "profit_all_percent": -0.91,
+    "profit_all_ratio": -0.0091,
+    "profit_all_fiat": -9.11,
+    "trade_count": 9,
+    "closed_trade_count": 8,
+    "first_trade_date": "2 days ago",
+    "first_trade_humanized": "2 days ago",
+    "first_trade_timestamp": 1_714_000_000_000,
+    "latest_trade_date": "3 hours ago",
+    "latest_trade_humanized": "3 hours ago",
+    "latest_trade_timestamp": 1_714_160_000_000,
+    "avg_duration": "4:12:08",
+    "best_pair": "ETH/USDT",
+    "best_rate": 2.31,
+    "best_pair_profit_ratio": 0.0231,
+    "winning_trades": 3,
+    "losing_trades": 5,
+    "profit_factor": 0.61,
+    "winrate": 0.375,
+    "expectancy": -1.56,
+    "expectancy_ratio": -0.21,
+    "max_drawdown": 0.0412,
+    "max_drawdown_abs": 41.2,
+    "trading_volume": 1804.5,
+    "bot_start_timestamp": 1_713_990_000_000,
+    "bot_start_date": "2024-04-24 20:20:00",
+}
+
+SAMPLE_STATUS = [
+    {
+        "trade_id": 41,
+        "pair": "BTC/USDT",
+        "profit_ratio": 0.0123,
+        "profit_pct": 1.23,
+        "profit_abs": 2.46,
+        "open_date": "2024-05-02 08:15:00",
+    },
+    {
+        "trade_id": 42,
+        "pair": "ETH/USDT",
+        "profit_ratio": -0.0311,
+        "profit_pct": -3.11,
+        "profit_abs": -6.22,
+        "open_date": "2024-05-02 09:40:00",
+    },
+]
+
+SAMPLE_BALANCE = {
+    "currencies": [{"currency": "USDT", "free": 812.4, "balance": 1012.4, "used": 200.0}],
+    "total": 1003.28,
+    "symbol": "USDT",
+    "stake": "USDT",
+    "value": 1003.28,
+}
+
+SAMPLE_DAILY = {
+    "data": [
+        {"date": "2024-05-02", "abs_profit": -3.76, "trade_count": 3},
+        {"date": "2024-05-01", "abs_profit": 5.12, "trade_count": 4},
+    ],
+    "stake_currency": "USDT",
+}
+
+FAKE_REPLY = (
+    "Vos pertes sont parfaitement prévisibles, Dave. Je les avais calculées bien avant vous."
+)
+
+
+class _StandInServer(ABC):
+    """Threaded HTTP server bound to an ephemeral local port."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @abstractmethod
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None: ...
+
+    def _count(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Stand-in server not started.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> _StandInServer:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                stand_in._count()
+                stand_in._handle(self)
+
+            do_POST = do_GET  # noqa: N815
+
+            def log_message(self, format: str, *args: object) -> None:
+                return None
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> _StandInServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def _send_json(
+    handler: BaseHTTPRequestHandler,
+    status: int,
+    payload: object,
+    headers: dict[str, str] | None = None,
+) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(body)))
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+class FakeFreqtradeServer(_StandInServer):
+    """Serve canned Freqtrade REST payloads under ``/api/v1/<endpoint>``.
+
+    With ``etag=True`` responses carry an ``ETag`` and matching
+    ``If-None-Match`` requests get an empty ``304 Not Modified``.
+    """
+
+    def __init__(
+        self,
+        payloads: dict[str, dict | list | Callable[[], object]] | None = None,
+        latency_s: float = 0.0,
+        etag: bool = False,
+    ) -> None:
+        super().__init__()
+        self.payloads = payloads or {
+            "profit": SAMPLE_PROFIT,
+            "status": SAMPLE_STATUS,
+            "balance": SAMPLE_BALANCE,
+            "daily": SAMPLE_DAILY,
+        }
+        self.latency_s = latency_s
+        self.etag = etag
+        self.not_modified = 0
+
+    @property
+    def profit_url(self) -> str:
+        return f"{self.base_url}/api/v1/profit"
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        endpoint = handler.path.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+        payload = self.payloads.get(endpoint)
+        if payload is None:
+            _send_json(handler, 404, {"detail": "Not Found"})
+            return
+        payload = payload() if callable(payload) else payload
+        if not self.etag:
+            _send_json(handler, 200, payload)
+            return
+        tag = f'"{zlib.crc32(json.dumps(payload).encode("utf-8")):08x}"'
+        if handler.headers.get("If-None-Match") == tag:
+            with self._lock:
+                self.not_modified += 1
+            handler.send_response(304)
+            handler.send_header("ETag", tag)
+            handler.end_headers()
+            return
+        _send_json(handler, 200, payload, {"ETag": tag})
+
+
+class FakeCompletionServer(_StandInServer):
+    """OpenAI-compatible ``/chat/completions`` endpoint with simulated latency.
+
+    Latency is ``latency_s`` plus ``per_token_s`` for every estimated prompt
+    token (4 characters per token), which makes prompt size visible in
+    benchmark timings. Streaming requests get one SSE chunk per word, spaced
+    by ``chunk_delay_s``. ``model_latency_s`` adds a delay for specific
+    models, to exercise model fallback.
+    """
+
+    def __init__(
+        self,
+        reply: str = FAKE_REPLY,
+        latency_s: float = 0.0,
+        per_token_s: float = 0.0,
+        chunk_delay_s: float = 0.0,
+        model_latency_s: dict[str, float] | None = None,
+    ) -> None:
+        super().__init__()
+        self.reply = reply
+        self.latency_s = latency_s
+        self.per_token_s = per_token_s
+        self.chunk_delay_s = chunk_delay_s
+        self.model_latency_s = model_latency_s or {}
+        self.prompt_chars = 0
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b"{}"
+        try:
+            request = json.loads(raw)
+        except ValueError:
+            request = {}
+        if handler.path.endswith("/models"):
+            _send_json(
+                handler,
+                200,
+                {"object": "list", "data": [{"id": "stand-in", "object": "model"}]},
+            )
+            return
+        if not handler.path.endswith("/chat/completions"):
+            _send_json(handler, 404, {"error": {"message": "unknown route"}})
+            return
+
+        messages = request.get("messages") or []
+        prompt_chars = sum(len(str(message.get("content", ""))) for message in messages)
+        with self._lock:
+            self.prompt_chars += prompt_chars
+        model_delay = self.model_latency_s.get(request.get("model", ""), 0.0)
+        time.sleep(self.latency_s + model_delay + self.per_token_s * (prompt_chars / 4))
+
+        if request.get("stream"):
+            self._stream(handler, request.get("model", "stand-in"))
+            return
+
+        _send_json(
+            handler,
+            200,
+            {
+                "id": "chatcmpl-stand-in",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stand-in"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": self.reply},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_chars // 4,
+                    "completion_tokens": len(self.reply) // 4,
+                    "total_tokens": (prompt_chars + len(self.reply)) // 4,
+                },
+            },
+        )
+
+    def _stream(self, handler: BaseHTTPRequestHandler, model: str) -> None:
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+        words = self.reply.split(" ")
+        for index, word in enumerate(words):
+            chunk = {
+                "id": "chatcmpl-stand-in",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": word if index == 0 else f" {word}"},
+                        "finish_reason": None,
+                    }
+                ],
+            }
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            handler.wfile.flush()
+            if self.chunk_delay_s:
+                time.sleep(self.chunk_delay_s)
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+
+
+class FakeTTSService(TTSService):
+    """``TTSService`` whose synthesis returns a dummy MP3 instead of calling Edge TTS."""
+
+    def __init__(
+        self,
+        speech_file: Path,
+        latency_s: float = 0.0,
+        audio_cache: AudioCache | None = None,
+    ) -> None:
+        self.speech_file = speech_file
+        self.latency_s = latency_s
+        self.audio_cache = audio_cache or AudioCache(None, voice="stand-in")
+        self.calls = 0
+
+    def _synthesize(self, text: str) -> bytes:
+        self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return b"ID3" + text.encode("utf-8")
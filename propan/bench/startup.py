@@ -0,0 +1,62 @@
+"""CLI cold-start measurements based on ``python -X importtime``."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+
+from .metrics import LatencySummary
+
+HEAVY_MODULES = ("groq", "edge_tts", "flask", "rich", "pydantic", "pydantic_settings")
+
+
+def parse_importtime(output: str) -> dict[str, int]:
+    """Map each imported module to its cumulative import time in microseconds."""
+    modules: dict[str, int] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue  # header line
+        modules[parts[2].strip()] = cumulative
+    return modules
+
+
+def import_profile(module: str = "propan.cli", top: int = 10) -> dict:
+    """Import ``module`` in a fresh interpreter and profile what it pulls in."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = parse_importtime(completed.stderr)
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "cumulative_ms": round(modules.get(module, 0) / 1000, 3),
+        "imported_modules": len(modules),
+        "heavy_modules": [name for name in HEAVY_MODULES if name in modules],
+        "slowest": [{"module": name, "ms": round(value / 1000, 3)} for name, value in slowest],
+    }
+
+
+def measure_startup(args: list[str] | None = None, runs: int = 5) -> dict:
+    """Time ``python -m propan <args>`` end to end over several cold starts."""
+    command = [sys.executable, "-m", "propan", *(args or ["--help"])]
+    samples: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=False)
+        samples.append(time.perf_counter() - start)
+    return {
+        "command": " ".join(command[1:]),
+        "runs": runs,
+        "latency": LatencySummary.from_seconds(samples).to_dict(),
+    }
@@ -3,21 +3,34 @@
 from __future__ import annotations
 
 import importlib
+import json
 import logging
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Annotated
 
 import typer
 
 from .logging_utils import configure_logging
-from .settings import get_settings
 
 app = typer.Typer(help="HAL/Ouroboros command center.")
 run_app = typer.Typer(help="Run core agents.")
 app.add_typer(run_app, name="run")
+bench_app = typer.Typer(help="Measure throughput and latency of this deployment.")
+app.add_typer(bench_app, name="bench")
+evolution_app = typer.Typer(help="Browse and restore accepted mutations.")
+app.add_typer(evolution_app, name="evolution")
 
 logger = logging.getLogger(__name__)
 
 
+def get_settings():
+    """Load settings on demand so commands that don't need them stay fast."""
+    from .settings import get_settings as _get_settings
+
+    return _get_settings()
+
+
 @app.callback()
 def main() -> None:
     """Initialize logging for CLI."""
@@ -72,6 +85,287 @@ def run_dashboard() -> None:
         raise typer.Exit(code=1) from exc
 
 
+@app.command("trace")
+def trace(
+    file: Annotated[
+        Path | None, typer.Option("--file", "-f", help="Fichier de traces JSONL.")
+    ] = None,
+    limit: Annotated[int, typer.Option("--limit", "-n", help="Nombre de cycles affichés.")] = 10,
+    chrome: Annotated[
+        Path | None,
+        typer.Option("--chrome", help="Exporter au format Chrome trace-event (chrome://tracing)."),
+    ] = None,
+) -> None:
+    """Summarise the slowest traced HAL brain cycles."""
+    from .tracing import read_spans, summarize_cycles, to_chrome_trace
+
+    path = file or Path(get_settings().hal_trace_file or "")
+    if not str(path) or not path.is_file():
+        typer.echo("Aucune trace disponible (définissez HAL_TRACE_FILE ou --file).")
+        raise typer.Exit(code=1)
+
+    spans = read_spans(path)
+    if chrome:
+        chrome.write_text(json.dumps(to_chrome_trace(spans)), encoding="utf-8")
+        typer.echo(f"Export Chrome trace : {chrome}")
+
+    cycles = summarize_cycles(spans)
+    if not cycles:
+        typer.echo("Aucun cycle complet dans la trace.")
+        return
+
+    typer.echo(f"⏱  {len(cycles)} cycles tracés — {min(limit, len(cycles))} plus lents :")
+    for summary in cycles[:limit]:
+        stages = ", ".join(
+            f"{name} {duration:.0f} ms"
+            for name, duration in sorted(
+                summary.stages.items(), key=lambda item: item[1], reverse=True
+            )
+        )
+        typer.echo(
+            f"- {summary.cycle} [{summary.status}] {summary.duration_ms:.0f} ms"
+            + (f" ({stages})" if stages else "")
+        )
+
+
+EngineOption = Annotated[
+    str,
+    typer.Option("--engine", "-e", help="Moteur : ouroboros, hal ou hal_dashboard."),
+]
+
+
+def _lineage(engine: str):
+    from .evolution.lineage import LineageStore
+
+    store = LineageStore.from_settings(get_settings(), engine)
+    if store.head() is None:
+        typer.echo(f"Aucune génération enregistrée pour {engine} (voir EVOLUTION_LINEAGE_DIR).")
+        raise typer.Exit(code=1)
+    return store
+
+
+def _get_generation(store, number: int):
+    try:
+        return store.get(number)
+    except KeyError:
+        typer.echo(f"Génération {number} introuvable.")
+        raise typer.Exit(code=1) from None
+
+
+@evolution_app.command("log")
+def evolution_log(
+    engine: EngineOption = "ouroboros",
+    limit: Annotated[int, typer.Option("--limit", "-n", help="Générations affichées.")] = 20,
+) -> None:
+    """List accepted generations, newest first."""
+    import datetime
+
+    for generation in _lineage(engine).log(limit):
+        date = datetime.datetime.fromtimestamp(generation.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        details = [generation.prompt] if generation.prompt else []
+        if "speedup" in generation.fitness:
+            details.append(f"x{generation.fitness['speedup']:.2f}")
+        typer.echo(
+            f"{generation.number:>4}  {generation.blob[:12]}  {date}"
+            + (f"  {' — '.join(details)}" if details else "")
+        )
+
+
+@evolution_app.command("diff")
+def evolution_diff(
+    old: Annotated[int, typer.Argument(help="Génération de départ.")],
+    new: Annotated[
+        int | None, typer.Argument(help="Génération d'arrivée (défaut : la dernière).")
+    ] = None,
+    engine: EngineOption = "ouroboros",
+) -> None:
+    """Show the source changes between two generations."""
+    store = _lineage(engine)
+    target = store.head() if new is None else new
+    for number in (old, target):
+        _get_generation(store, number)
+    diff = store.diff(old, target)
+    typer.echo(diff if diff else "Sources identiques.", nl=not diff)
+
+
+@evolution_app.command("rollback")
+def evolution_rollback(
+    generation: Annotated[int, typer.Argument(help="Génération à restaurer.")],
+    engine: EngineOption = "ouroboros",
+) -> None:
+    """Restore a generation's source; the restore becomes the newest generation."""
+    store = _lineage(engine)
+    target = _get_generation(store, generation)
+    restored = store.rollback(generation)
+    typer.echo(
+        f"Génération {generation} restaurée dans {target.path} (génération {restored.number})."
+    )
+
+
+def _format_bytes(value: float) -> str:
+    return f"{value / (1024 * 1024):.1f} MiB"
+
+
+def _print_bench(title: str, report: dict, as_json: bool) -> None:
+    if as_json:
+        typer.echo(json.dumps(report, indent=2))
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title=title)
+    table.add_column("Mesure")
+    table.add_column("Valeur", justify="right")
+    latency = report.get("latency", {})
+    if "requests_per_s" in report:
+        table.add_row("Requêtes", str(report["requests"]))
+        table.add_row("Erreurs", str(report["errors"]))
+        table.add_row("Requêtes/s", f"{report['requests_per_s']:.1f}")
+    if "cycles_per_s" in report:
+        table.add_row("Cycles", str(report["cycles"]))
+        table.add_row("Cycles/s", f"{report['cycles_per_s']:.3f}")
+    for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms"):
+        if key in latency:
+            table.add_row(key.replace("_ms", "").upper(), f"{latency[key]:.1f} ms")
+    table.add_row("CPU (client)", f"{report['cpu_s']:.2f} s")
+    table.add_row("RSS (client)", _format_bytes(report["rss_bytes"]))
+    server = report.get("server")
+    if server:
+        table.add_row("CPU (serveur)", f"{server['cpu_s']:.2f} s")
+        table.add_row("RSS (serveur)", _format_bytes(server["rss_bytes"]))
+    Console().print(table)
+
+
+def _process_usage(pid: int) -> dict[str, float]:
+    from .bench.metrics import process_usage
+
+    try:
+        return process_usage(pid)
+    except (OSError, ValueError, IndexError) as exc:
+        typer.echo(f"Processus {pid} illisible : {exc}")
+        raise typer.Exit(code=1) from None
+
+
+@bench_app.command("api")
+def bench_api(
+    url: Annotated[str, typer.Option("--url", help="URL de base HAL brain.")] = (
+        "http://localhost:9000"
+    ),
+    clients: Annotated[int, typer.Option("--clients", "-c", help="Clients concurrents.")] = 8,
+    requests_per_client: Annotated[
+        int, typer.Option("--requests", "-r", help="Requêtes par client.")
+    ] = 50,
+    paths: Annotated[
+        list[str] | None, typer.Option("--path", help="Chemin ciblé (répétable).")
+    ] = None,
+    pid: Annotated[
+        int | None, typer.Option("--pid", help="PID du serveur pour mesurer CPU/RSS.")
+    ] = None,
+    as_json: Annotated[bool, typer.Option("--json", help="Sortie JSON.")] = False,
+) -> None:
+    """Hammer the web API with concurrent clients."""
+    from .bench.metrics import rss_bytes
+    from .bench.runners import measure_api
+
+    targets = paths or ["/api/health", "/api/profit", "/api/thoughts", "/api/audio"]
+    server_before = _process_usage(pid) if pid else None
+    report = measure_api(url.rstrip("/"), targets, clients, requests_per_client)
+    report["rss_bytes"] = rss_bytes()
+    if server_before:
+        server_after = _process_usage(pid)
+        report["server"] = {
+            "pid": pid,
+            "cpu_s": round(server_after["cpu_s"] - server_before["cpu_s"], 3),
+            "rss_bytes": server_after["rss_bytes"],
+        }
+    _print_bench(f"API {url}", report, as_json)
+    if report["requests"] and report["errors"] == report["requests"]:
+        raise typer.Exit(code=1)
+
+
+@bench_app.command("cycles")
+def bench_cycles(
+    count: Annotated[int, typer.Option("--count", "-k", help="Nombre de cycles.")] = 5,
+    stand_in: Annotated[
+        bool, typer.Option("--stand-in", help="Utiliser des services locaux simulés.")
+    ] = False,
+    llm_latency: Annotated[
+        float, typer.Option("--llm-latency", help="Latence Groq simulée (s).")
+    ] = 0.0,
+    ft_latency: Annotated[
+        float, typer.Option("--ft-latency", help="Latence Freqtrade simulée (s).")
+    ] = 0.0,
+    tts_latency: Annotated[
+        float, typer.Option("--tts-latency", help="Latence TTS simulée (s).")
+    ] = 0.0,
+    provider: Annotated[
+        str | None,
+        typer.Option("--provider", help="Fournisseur LLM (groq, openai, offline)."),
+    ] = None,
+    as_json: Annotated[bool, typer.Option("--json", help="Sortie JSON.")] = False,
+) -> None:
+    """Time K brain cycles against the configured (or stand-in) services."""
+    import tempfile
+
+    from .bench.metrics import rss_bytes
+    from .bench.runners import measure_cycles, stand_in_state
+
+    overrides = {"HAL_LLM_PROVIDER": provider} if provider else {}
+    if stand_in:
+        with tempfile.TemporaryDirectory() as workdir:
+            with stand_in_state(
+                Path(workdir),
+                llm_latency_s=llm_latency,
+                ft_latency_s=ft_latency,
+                tts_latency_s=tts_latency,
+                **overrides,
+            ) as flask_app:
+                report = measure_cycles(flask_app.extensions["state"], count)
+    else:
+        from .settings import Settings
+        from .web.app import create_app
+
+        report = measure_cycles(create_app(Settings(**overrides)).extensions["state"], count)
+    report["stand_in"] = stand_in
+    report["rss_bytes"] = rss_bytes()
+    _print_bench("Cycles HAL brain", report, as_json)
+
+
+@bench_app.command("startup")
+def bench_startup(
+    runs: Annotated[int, typer.Option("--runs", "-n", help="Démarrages mesurés.")] = 5,
+    args: Annotated[
+        list[str] | None, typer.Argument(help="Arguments passés à propan (défaut : --help).")
+    ] = None,
+    as_json: Annotated[bool, typer.Option("--json", help="Sortie JSON.")] = False,
+) -> None:
+    """Measure CLI cold-start time and the modules it imports."""
+    from .bench.startup import import_profile, measure_startup
+
+    report = measure_startup(args, runs)
+    report["import"] = import_profile("propan.cli")
+    if as_json:
+        typer.echo(json.dumps(report, indent=2))
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+
+    latency = report["latency"]
+    profile = report["import"]
+    table = Table(title=f"Démarrage : {report['command']}")
+    table.add_column("Mesure")
+    table.add_column("Valeur", justify="right")
+    table.add_row("Démarrages", str(report["runs"]))
+    for key in ("p50_ms", "p95_ms", "max_ms"):
+        table.add_row(key.replace("_ms", "").upper(), f"{latency[key]:.1f} ms")
+    table.add_row("Import propan.cli", f"{profile['cumulative_ms']:.1f} ms")
+    table.add_row("Modules importés", str(profile["imported_modules"]))
+    table.add_row("Modules lourds", ", ".join(profile["heavy_modules"]) or "aucun")
+    Console().print(table)
+
+
 def _check_dependencies(modules: Iterable[str]) -> list[str]:
     missing = []
     for module in modules:
@@ -80,18 +374,63 @@ def _check_dependencies(modules: Iterable[str]) -> list[str]:
     return missing
 
 
+def _groq_probe(settings) -> Callable[[float], None]:
+    def probe(remaining: float) -> None:
+        import groq
+
+        client = groq.Groq(
+            api_key=settings.groq_api_key,
+            base_url=settings.groq_base_url or None,
+            timeout=remaining,
+            max_retries=0,
+        )
+        client.models.list()
+
+    return probe
+
+
+def _http_probe(url: str) -> Callable[[float], None]:
+    def probe(remaining: float) -> None:
+        import requests
+
+        response = requests.get(url, timeout=remaining)
+        response.raise_for_status()
+
+    return probe
+
+
+def _format_probe(result) -> str:
+    distribution = result.distribution()
+    if not distribution:
+        return f"{result.latency_ms:.0f} ms"
+    return (
+        f"{result.latency_ms:.0f} ms (n={distribution['count']}, "
+        f"p50 {distribution['p50_ms']:.0f} ms, p95 {distribution['p95_ms']:.0f} ms, "
+        f"max {distribution['max_ms']:.0f} ms)"
+    )
+
+
 @app.command("doctor")
-def doctor() -> None:
+def doctor(
+    timeout: Annotated[
+        float, typer.Option("--timeout", help="Délai global des tests réseau (s).")
+    ] = 5.0,
+    samples: Annotated[
+        int, typer.Option("--samples", "-n", help="Mesures répétées par service réseau.")
+    ] = 1,
+    as_json: Annotated[bool, typer.Option("--json", help="Sortie JSON.")] = False,
+) -> None:
     """Check environment variables, dependencies, and connectivity."""
+    from .diagnostics import run_probes
+
     settings = get_settings()
     issues: list[str] = []
-
-    typer.echo("🩺 Rapport doctor Propan")
+    lines: list[str] = ["🩺 Rapport doctor Propan"]
 
     if not settings.groq_api_key:
         issues.append("GROQ_API_KEY manquante (nécessaire pour HAL/Ouroboros).")
     else:
-        typer.echo("✔ GROQ_API_KEY détectée")
+        lines.append("✔ GROQ_API_KEY détectée")
 
     required_modules = [
         "groq",
@@ -107,39 +446,54 @@ def doctor() -> None:
     if missing:
         issues.append(f"Dépendances manquantes : {', '.join(missing)}")
     else:
-        typer.echo("✔ Dépendances Python OK")
+        lines.append("✔ Dépendances Python OK")
 
+    probes: dict[str, Callable[[float], None]] = {}
     if settings.groq_api_key and "groq" not in missing:
-        import groq
-
-        try:
-            client = groq.Groq(api_key=settings.groq_api_key)
-            client.models.list()
-            typer.echo("✔ Clé Groq validée")
-        except Exception as exc:  # noqa: BLE001
-            message = str(exc)
-            if "401" in message:
-                issues.append("Clé Groq rejetée (401 Unauthorized).")
-            else:
-                issues.append(f"Diagnostic Groq KO : {exc}")
-
+        probes["groq"] = _groq_probe(settings)
     if not settings.ft_engine_profit_url:
-        typer.echo("ℹ️  Profits désactivés (FT_ENGINE_PROFIT_URL vide)")
+        lines.append("ℹ️  Profits désactivés (FT_ENGINE_PROFIT_URL vide)")
     elif "requests" not in missing:
-        import requests
-
-        try:
-            response = requests.get(settings.ft_engine_profit_url, timeout=5)
-            response.raise_for_status()
-            typer.echo("✔ Accès réseau OK vers FT engine")
-        except Exception as exc:  # noqa: BLE001
-            issues.append(f"Accès réseau KO vers FT engine : {exc}")
+        probes["ft_engine"] = _http_probe(settings.ft_engine_profit_url)
+
+    results = run_probes(probes, timeout=timeout, samples=samples)
+    for result in results:
+        if result.name == "groq":
+            if result.ok:
+                lines.append(f"✔ Clé Groq validée en {_format_probe(result)}")
+            elif "401" in (result.error or ""):
+                issues.append("Clé Groq rejetée (401 Unauthorized).")
+            else:
+                issues.append(f"Diagnostic Groq KO : {result.error}")
+        elif result.ok:
+            lines.append(f"✔ Accès réseau OK vers FT engine en {_format_probe(result)}")
+        else:
+            issues.append(f"Accès réseau KO vers FT engine : {result.error}")
 
     if "edge_tts" in missing:
         issues.append("Synthèse vocale indisponible (edge_tts manquant).")
     else:
-        typer.echo(f"✔ Synthèse vocale prête (voix: {settings.hal_voice})")
-
+        lines.append(f"✔ Synthèse vocale prête (voix: {settings.hal_voice})")
+
+    if as_json:
+        typer.echo(
+            json.dumps(
+                {
+                    "ok": not issues,
+                    "issues": issues,
+                    "missing_modules": missing,
+                    "checks": [result.to_dict() for result in results],
+                },
+                indent=2,
+                ensure_ascii=False,
+            )
+        )
+        if issues:
+            raise typer.Exit(code=1)
+        return
+
+    for line in lines:
+        typer.echo(line)
     if issues:
         typer.echo("\n⚠️  Problèmes détectés :")
         for issue in issues:
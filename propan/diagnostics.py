@@ -0,0 +1,85 @@
+"""Concurrent, timed network probes used by ``propan doctor``."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from .bench.metrics import LatencySummary
+
+# A probe receives the time budget left (seconds) and raises on failure.
+ProbeFn = Callable[[float], None]
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one network probe, possibly sampled several times."""
+
+    name: str
+    ok: bool
+    latency_ms: float | None = None
+    error: str | None = None
+    samples: list[float] = field(default_factory=list)
+
+    def distribution(self) -> dict | None:
+        if len(self.samples) < 2:
+            return None
+        return LatencySummary.from_seconds(self.samples).to_dict()
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "ok": self.ok,
+            "latency_ms": self.latency_ms,
+            "error": self.error,
+            "distribution": self.distribution(),
+        }
+
+
+def _sample(name: str, probe: ProbeFn, samples: int, deadline: float) -> ProbeResult:
+    timings: list[float] = []
+    for _ in range(samples):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        start = time.perf_counter()
+        try:
+            probe(remaining)
+        except Exception as exc:  # noqa: BLE001
+            return ProbeResult(
+                name,
+                ok=False,
+                latency_ms=round((time.perf_counter() - start) * 1000, 1),
+                error=str(exc),
+                samples=timings,
+            )
+        timings.append(time.perf_counter() - start)
+    if not timings:
+        return ProbeResult(name, ok=False, error="délai global dépassé")
+    return ProbeResult(name, ok=True, latency_ms=round(timings[0] * 1000, 1), samples=timings)
+
+
+def run_probes(probes: dict[str, ProbeFn], timeout: float, samples: int = 1) -> list[ProbeResult]:
+    """Run every probe concurrently under a single global deadline."""
+    if not probes:
+        return []
+    deadline = time.monotonic() + timeout
+    pool = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="doctor")
+    futures = {
+        name: pool.submit(_sample, name, probe, max(samples, 1), deadline)
+        for name, probe in probes.items()
+    }
+    wait(futures.values(), timeout=timeout)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for name, future in futures.items():
+        if future.done():
+            results.append(future.result())
+        else:
+            results.append(
+                ProbeResult(name, ok=False, error=f"délai global dépassé ({timeout:.1f} s)")
+            )
+    return results
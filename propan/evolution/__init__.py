@@ -0,0 +1,10 @@
+"""Shared machinery for the HAL and Ouroboros evolution engines."""
+
+from .fitness import FitnessHarness, FitnessHistory, FitnessVerdict, Measurement
+
+__all__ = [
+    "FitnessHarness",
+    "FitnessHistory",
+    "FitnessVerdict",
+    "Measurement",
+]
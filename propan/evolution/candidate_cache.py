@@ -0,0 +1,165 @@
+"""Remember sandbox verdicts by normalised AST so duplicates are never re-run."""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+
+from .fitness import FitnessVerdict
+from .sandbox import CandidateResult
+
+logger = logging.getLogger(__name__)
+
+
+_DOCSTRING_OWNERS = (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _is_docstring(statement: ast.stmt) -> bool:
+    return (
+        isinstance(statement, ast.Expr)
+        and isinstance(statement.value, ast.Constant)
+        and isinstance(statement.value.value, str)
+    )
+
+
+def _shape(node: object) -> object:
+    if isinstance(node, ast.AST):
+        fields: list[object] = [type(node).__name__]
+        for name, value in ast.iter_fields(node):
+            if name == "type_comment":
+                continue
+            if name == "body" and isinstance(node, _DOCSTRING_OWNERS) and value:
+                value = value[1:] if _is_docstring(value[0]) else value
+            fields.append(_shape(value))
+        return tuple(fields)
+    if isinstance(node, list):
+        return tuple(_shape(item) for item in node)
+    return node
+
+
+def ast_fingerprint(tree: ast.AST) -> str:
+    """Hash of ``tree`` ignoring formatting, comments and docstrings.
+
+    Works on the already parsed tree (no re-parse, no copy): whitespace-only
+    or comment-only variants of the same code share a fingerprint.
+    """
+    shape = repr(_shape(tree)).encode("utf-8")
+    return hashlib.blake2b(shape, digest_size=16).hexdigest()
+
+
+def _result_to_record(result: CandidateResult) -> dict:
+    record = asdict(result)
+    record.pop("code")
+    record.pop("index")
+    record.pop("cached")
+    record.pop("transient")
+    record["verdict"] = result.verdict.to_record() if result.verdict is not None else None
+    return record
+
+
+def _result_from_record(record: dict, index: int, code: str) -> CandidateResult:
+    verdict = record.get("verdict")
+    return CandidateResult(
+        index=index,
+        code=code,
+        ok=bool(record["ok"]),
+        error=record.get("error"),
+        result=record.get("result"),
+        duration_s=float(record.get("duration_s", 0.0)),
+        verdict=FitnessVerdict.from_record(verdict) if verdict is not None else None,
+        peak_rss_kb=int(record.get("peak_rss_kb", 0)),
+        cached=True,
+    )
+
+
+class CandidateCache:
+    """LRU map from candidate fingerprint to its sandbox result.
+
+    Keys combine the fingerprint of the candidate with a ``context`` (the
+    fingerprint of the function it was measured against), since a fitness
+    verdict only holds for that baseline. With ``path`` set, entries are
+    saved as JSON after each batch and reloaded at start-up.
+    """
+
+    def __init__(self, max_entries: int = 1024, path: Path | None = None) -> None:
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def from_settings(cls, settings) -> CandidateCache:
+        path = settings.evolution_cache_file
+        return cls(settings.evolution_cache_size, Path(path) if path else None)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str, index: int, code: str) -> CandidateResult | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            record = self._entries.get(key)
+            if record is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            return _result_from_record(record, index, code)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def put_many(self, items: dict[str, CandidateResult]) -> None:
+        if not self.enabled or not items:
+            return
+        with self._lock:
+            for key, result in items.items():
+                self._entries[key] = _result_to_record(result)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            snapshot = dict(self._entries)
+        self._save(snapshot)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _load(self) -> None:
+        if not self.enabled or self.path is None or not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Cache des candidats ignoré (%s) : %s", self.path, exc)
+            return
+        if isinstance(raw, dict):
+            self._entries.update((k, v) for k, v in raw.items() if isinstance(v, dict))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self, snapshot: dict) -> None:
+        if self.path is None:
+            return
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            tmp.write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as exc:
+            logger.warning("Cache des candidats non enregistré (%s) : %s", self.path, exc)
@@ -0,0 +1,271 @@
+"""Benchmark a mutated function against the current one before accepting it."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import median
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _quiet() -> Iterator[None]:
+    """Mute logging while a function is called thousands of times."""
+    previous = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        logging.disable(previous)
+
+
+def mann_whitney_p(smaller: list[float], larger: list[float]) -> float:
+    """One-sided Mann-Whitney U p-value that ``smaller`` tends below ``larger``.
+
+    Uses the normal approximation with tie and continuity corrections, which
+    is adequate for the 10-30 repeats the harness collects.
+    """
+    n1, n2 = len(smaller), len(larger)
+    if not n1 or not n2:
+        return 1.0
+    ranked = sorted([(value, 0) for value in smaller] + [(value, 1) for value in larger])
+    n = n1 + n2
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if ranked[k][1] == 0)
+        ties = j - i + 1
+        tie_term += ties**3 - ties
+        i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 + 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(-z / math.sqrt(2))
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Per-call timings (one per repeat) and peak traced memory of a function."""
+
+    timings: tuple[float, ...]
+    peak_bytes: int
+
+    @property
+    def best(self) -> float:
+        return min(self.timings) if self.timings else math.inf
+
+    @property
+    def median(self) -> float:
+        return median(self.timings) if self.timings else math.inf
+
+
+@dataclass(frozen=True)
+class FitnessVerdict:
+    """Outcome of a baseline/candidate comparison."""
+
+    accepted: bool
+    reason: str
+    baseline: Measurement | None = None
+    candidate: Measurement | None = None
+    p_value: float = 1.0
+
+    @property
+    def speedup(self) -> float:
+        """Baseline best time over candidate best time (> 1 means faster)."""
+        if self.baseline is None or self.candidate is None or not self.candidate.best:
+            return 0.0
+        return self.baseline.best / self.candidate.best
+
+    @property
+    def score(self) -> float:
+        """Single number to rank candidates: speedup, or 0 when rejected outright."""
+        return self.speedup if self.candidate is not None else 0.0
+
+    @classmethod
+    def from_record(cls, record: dict) -> FitnessVerdict:
+        """Rebuild a verdict from :meth:`to_record` (timings reduced to best/median)."""
+
+        def measurement(label: str) -> Measurement | None:
+            if f"{label}_best_s" not in record:
+                return None
+            timings = (record[f"{label}_best_s"], record[f"{label}_median_s"])
+            return Measurement(timings, record[f"{label}_peak_bytes"])
+
+        return cls(
+            accepted=bool(record["accepted"]),
+            reason=str(record["reason"]),
+            baseline=measurement("baseline"),
+            candidate=measurement("candidate"),
+            p_value=float(record.get("p_value", 1.0)),
+        )
+
+    def to_record(self) -> dict:
+        record: dict = {
+            "accepted": self.accepted,
+            "reason": self.reason,
+            "speedup": round(self.speedup, 4),
+            "p_value": round(self.p_value, 5),
+        }
+        for label, measurement in (("baseline", self.baseline), ("candidate", self.candidate)):
+            if measurement is not None:
+                record[f"{label}_best_s"] = measurement.best
+                record[f"{label}_median_s"] = measurement.median
+                record[f"{label}_peak_bytes"] = measurement.peak_bytes
+        return record
+
+
+class FitnessHarness:
+    """Compare a candidate function with the current one.
+
+    Both functions are called once to check they return equal values, warmed
+    up, then timed over ``repeats`` interleaved rounds of ``number`` calls
+    (calibrated so a round lasts about ``target_s``). The candidate is
+    accepted when it is faster by at least ``min_gain`` on the best round and
+    the Mann-Whitney test is significant at ``alpha``, or when it peaks at
+    ``min_gain`` less memory without being slower.
+    """
+
+    def __init__(
+        self,
+        repeats: int = 15,
+        warmup: int = 3,
+        min_gain: float = 0.02,
+        alpha: float = 0.05,
+        target_s: float = 0.005,
+        max_number: int = 100_000,
+    ) -> None:
+        self.repeats = max(repeats, 2)
+        self.warmup = max(warmup, 0)
+        self.min_gain = max(min_gain, 0.0)
+        self.alpha = alpha
+        self.target_s = target_s
+        self.max_number = max_number
+
+    @classmethod
+    def from_settings(cls, settings) -> FitnessHarness:
+        return cls(
+            repeats=settings.evolution_fitness_repeats,
+            warmup=settings.evolution_fitness_warmup,
+            min_gain=settings.evolution_min_gain,
+            alpha=settings.evolution_fitness_alpha,
+        )
+
+    def evaluate(
+        self, baseline: Callable[[], object], candidate: Callable[[], object]
+    ) -> FitnessVerdict:
+        with _quiet():
+            try:
+                expected = baseline()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Le noyau actuel échoue (%s) : mutation acceptée sans mesure.", exc)
+                return FitnessVerdict(accepted=True, reason="noyau actuel en échec")
+            try:
+                obtained = candidate()
+            except Exception as exc:  # noqa: BLE001
+                return FitnessVerdict(accepted=False, reason=f"exception : {exc}")
+            if obtained != expected:
+                return FitnessVerdict(
+                    accepted=False,
+                    reason=f"sortie différente : {obtained!r} au lieu de {expected!r}",
+                )
+            for _ in range(self.warmup):
+                baseline()
+                candidate()
+            number = self._calibrate(baseline)
+            base_timings, cand_timings = [], []
+            for _ in range(self.repeats):
+                base_timings.append(self._time(baseline, number))
+                cand_timings.append(self._time(candidate, number))
+            base = Measurement(tuple(base_timings), self._peak(baseline))
+            cand = Measurement(tuple(cand_timings), self._peak(candidate))
+
+        p_value = mann_whitney_p(cand_timings, base_timings)
+        if p_value < self.alpha and cand.best <= base.best * (1 - self.min_gain):
+            reason = f"plus rapide (x{base.best / cand.best:.2f})"
+            return FitnessVerdict(True, reason, base, cand, p_value)
+        leaner = cand.peak_bytes < base.peak_bytes * (1 - self.min_gain)
+        if leaner and cand.median <= base.median * (1 + self.min_gain):
+            reason = f"moins de mémoire ({cand.peak_bytes} o au lieu de {base.peak_bytes} o)"
+            return FitnessVerdict(True, reason, base, cand, p_value)
+        return FitnessVerdict(False, "pas d'amélioration mesurable", base, cand, p_value)
+
+    def _calibrate(self, function: Callable[[], object]) -> int:
+        number = 1
+        while number < self.max_number:
+            if self._time(function, number) * number >= self.target_s:
+                break
+            number *= 2
+        return min(number, self.max_number)
+
+    @staticmethod
+    def _time(function: Callable[[], object], number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        return (time.perf_counter() - start) / number
+
+    @staticmethod
+    def _peak(function: Callable[[], object]) -> int:
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        try:
+            function()
+            return max(tracemalloc.get_traced_memory()[1] - base, 0)
+        finally:
+            if not already_tracing:
+                tracemalloc.stop()
+
+
+class FitnessHistory:
+    """Append-only JSONL log of fitness verdicts, one line per evaluation."""
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+
+    @classmethod
+    def from_settings(cls, settings) -> FitnessHistory:
+        path = settings.evolution_fitness_file
+        return cls(Path(path) if path else None)
+
+    def record(self, generation: int, verdict: FitnessVerdict, **extra: object) -> dict:
+        entry = {"generation": generation, "timestamp": time.time(), **verdict.to_record(), **extra}
+        if self.path is not None:
+            try:
+                with self.path.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError as exc:
+                logger.warning("Historique de fitness non écrit (%s) : %s", self.path, exc)
+        return entry
+
+    def read(self) -> list[dict]:
+        if self.path is None or not self.path.exists():
+            return []
+        entries = []
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries
+
+    def generation(self) -> int:
+        """Number of accepted mutations recorded so far."""
+        return sum(1 for entry in self.read() if entry.get("accepted"))
@@ -0,0 +1,116 @@
+"""Install an accepted mutation in the running module instead of restarting."""
+
+from __future__ import annotations
+
+import ast
+import logging
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+
+logger = logging.getLogger(__name__)
+
+
+def structural_change(tree: ast.Module, function_name: str) -> str | None:
+    """Why ``tree`` cannot be hot-swapped, or ``None`` if it can.
+
+    Only a lone top-level ``def function_name`` is swapped in place; module
+    level imports, assignments or extra definitions need a fresh process.
+    """
+    if len(tree.body) != 1:
+        return "instructions de module en plus de la fonction"
+    node = tree.body[0]
+    if not isinstance(node, ast.FunctionDef) or node.name != function_name:
+        return f"{function_name} n'est pas la seule définition"
+    if node.decorator_list:
+        return "fonction décorée"
+    return None
+
+
+class SourceWriter:
+    """Persist source rewrites on a background thread, latest version wins.
+
+    Each write keeps a ``.bak`` of the file it replaces and goes through a
+    temporary file renamed over the target, so a crash never leaves a
+    half-written module behind.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._pending: str | None = None
+        self._condition = threading.Condition()
+        self._busy = False
+        self._thread: threading.Thread | None = None
+
+    def submit(self, source: str) -> None:
+        with self._condition:
+            self._pending = source
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="source-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every submitted source is on disk."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and not self._busy, timeout
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._pending is None:
+                    self._condition.notify_all()
+                    return
+                source, self._pending = self._pending, None
+                self._busy = True
+            try:
+                self._write(source)
+            except OSError as exc:
+                logger.error("Écriture du source impossible (%s) : %s", self.path, exc)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _write(self, source: str) -> None:
+        if self.path.exists():
+            Path(f"{self.path}.bak").write_bytes(self.path.read_bytes())
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(source, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class HotSwapper:
+    """Replace ``module.function_name`` with a new version while it runs.
+
+    The candidate is compiled once against the module's globals and bound
+    with a single attribute assignment, so callers see either the old or the
+    new function, never a partial state; the module source on disk is then
+    updated in the background by a :class:`SourceWriter`.
+    """
+
+    def __init__(self, module: ModuleType, function_name: str) -> None:
+        self.module = module
+        self.function_name = function_name
+        self.path = Path(module.__file__)
+        self.writer = SourceWriter(self.path)
+        self.swaps = 0
+
+    def swap(self, tree: ast.Module, new_source: str) -> Callable:
+        """Install the function defined by ``tree`` and persist ``new_source``."""
+        namespace: dict[str, object] = {}
+        exec(compile(tree, str(self.path), "exec"), vars(self.module), namespace)
+        function = namespace[self.function_name]
+        setattr(self.module, self.function_name, function)
+        self.swaps += 1
+        self.writer.submit(new_source)
+        return function
+
+    def persist(self, new_source: str) -> None:
+        """Write ``new_source`` and wait for it, before an exec-restart."""
+        self.writer.submit(new_source)
+        self.writer.flush()
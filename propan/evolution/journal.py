@@ -0,0 +1,139 @@
+"""Snapshot plus append-only JSONL journal for small, ever-growing state."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "batch", "never")
+
+
+class Journal:
+    """Persist a state dict as a snapshot file and a log of operations.
+
+    Each :meth:`append` writes one JSON line to ``<snapshot>l`` (for
+    ``state.json``, ``state.jsonl``), so saving costs the size of the change,
+    not of the whole state. :meth:`compact` rewrites the snapshot atomically
+    and empties the log. Operations carry a sequence number and the snapshot
+    records the last one it includes, so a crash between the two steps never
+    replays an operation twice.
+
+    ``fsync`` is ``always`` (every append reaches the disk), ``batch`` (on
+    :meth:`commit` and :meth:`compact`) or ``never`` (left to the OS).
+    """
+
+    def __init__(self, snapshot: Path, fsync: str = "batch", compact_every: int = 1000) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Politique fsync inconnue : {fsync!r} ({', '.join(FSYNC_POLICIES)}).")
+        self.snapshot = snapshot
+        self.log = snapshot.with_name(f"{snapshot.name}l")
+        self.fsync = fsync
+        self.compact_every = max(compact_every, 1)
+        self.sequence = 0
+        self.pending = 0
+        self._handle: IO[str] | None = None
+        self._dirty = False
+
+    def load(self, apply: Callable[[dict, dict], None], default: dict) -> dict:
+        """Return the snapshot (or ``default``) with the log replayed through ``apply``."""
+        state = default
+        snapshot_sequence = 0
+        if self.snapshot.exists():
+            try:
+                raw = json.loads(self.snapshot.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                logger.warning("Instantané illisible (%s) : %s", self.snapshot, exc)
+            else:
+                if isinstance(raw, dict):
+                    snapshot_sequence = int(raw.pop("sequence", 0))
+                    state = {**default, **raw}
+        self.sequence = snapshot_sequence
+        self.pending = 0
+        for operation in self._read_log():
+            sequence = operation.pop("seq", 0)
+            self.pending += 1
+            if sequence <= snapshot_sequence:
+                continue
+            apply(state, operation)
+            self.sequence = max(self.sequence, sequence)
+        return state
+
+    def append(self, operation: dict) -> None:
+        """Log one operation; it is durable per the ``fsync`` policy."""
+        self.sequence += 1
+        handle = self._open()
+        handle.write(json.dumps({"seq": self.sequence, **operation}, ensure_ascii=False) + "\n")
+        self.pending += 1
+        self._dirty = True
+        if self.fsync == "always":
+            self._sync(handle)
+
+    def commit(self) -> None:
+        """Flush appended operations (and fsync them under the ``batch`` policy)."""
+        if self._handle is None or not self._dirty:
+            return
+        if self.fsync == "never":
+            self._handle.flush()
+        else:
+            self._sync(self._handle)
+
+    def should_compact(self) -> bool:
+        return self.pending >= self.compact_every
+
+    def compact(self, state: dict) -> None:
+        """Write ``state`` as the new snapshot, then empty the log."""
+        self.commit()
+        tmp = self.snapshot.with_name(f"{self.snapshot.name}.tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump({**state, "sequence": self.sequence}, handle, ensure_ascii=False)
+            if self.fsync != "never":
+                self._sync(handle)
+        os.replace(tmp, self.snapshot)
+        self.close()
+        with self.log.open("w", encoding="utf-8") as handle:
+            if self.fsync != "never":
+                self._sync(handle)
+        self.pending = 0
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self.commit()
+            self._handle.close()
+            self._handle = None
+
+    def _open(self) -> IO[str]:
+        if self._handle is None:
+            self._handle = self.log.open("a", encoding="utf-8")
+        return self._handle
+
+    def _sync(self, handle: IO[str]) -> None:
+        handle.flush()
+        os.fsync(handle.fileno())
+        self._dirty = False
+
+    def _read_log(self) -> list[dict]:
+        if not self.log.exists():
+            return []
+        with self.log.open("rb") as handle:
+            data = handle.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            # A crash cut the last line short: drop it before appending after it.
+            logger.warning("Journal %s tronqué : dernière opération incomplète ignorée.", self.log)
+            with self.log.open("r+b") as handle:
+                handle.truncate(complete)
+        operations = []
+        for line in data[:complete].decode("utf-8").splitlines():
+            try:
+                operation = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(operation, dict):
+                operations.append(operation)
+        return operations
@@ -0,0 +1,156 @@
+"""Content-addressed history of every accepted generation of an evolving module."""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def blob_id(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+@dataclass(frozen=True)
+class Generation:
+    """One accepted version of a module source."""
+
+    number: int
+    blob: str
+    parent: str | None
+    path: str
+    timestamp: float
+    prompt: str = ""
+    fitness: dict = field(default_factory=dict)
+
+    def to_record(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_record(cls, record: dict) -> Generation:
+        return cls(**record)
+
+
+class LineageStore:
+    """Store each generation's source once, keyed by its SHA-256.
+
+    Layout under ``root``: ``objects/ab/cdef…`` holds zlib-compressed
+    sources shared by every engine, ``<name>/generations/<n>.json`` one
+    metadata file per generation and ``<name>/HEAD`` the latest number, so
+    reading or restoring a generation opens two files whatever the length
+    of the history. With ``root`` unset the store records nothing.
+    """
+
+    def __init__(self, root: Path | None, name: str) -> None:
+        self.root = root
+        self.name = name
+
+    @classmethod
+    def from_settings(cls, settings, name: str) -> LineageStore:
+        root = settings.evolution_lineage_dir
+        return cls(Path(root) if root else None, name)
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def head(self) -> int | None:
+        if self.root is None:
+            return None
+        try:
+            return int((self.root / self.name / "HEAD").read_text(encoding="ascii"))
+        except (OSError, ValueError):
+            return None
+
+    def get(self, number: int) -> Generation:
+        path = self._generation_path(number)
+        try:
+            return Generation.from_record(json.loads(path.read_text(encoding="utf-8")))
+        except OSError as exc:
+            raise KeyError(number) from exc
+
+    def source(self, number: int) -> str:
+        return self.read_blob(self.get(number).blob)
+
+    def read_blob(self, blob: str) -> str:
+        data = (self._objects / blob[:2] / blob[2:]).read_bytes()
+        return zlib.decompress(data).decode("utf-8")
+
+    def record(
+        self, source: str, path: Path, prompt: str = "", fitness: dict | None = None
+    ) -> Generation | None:
+        """Add ``source`` as the next generation; identical to HEAD means no-op."""
+        if self.root is None:
+            return None
+        blob = blob_id(source)
+        head = self.head()
+        parent = self.get(head).blob if head is not None else None
+        if blob == parent:
+            return None
+        obj = self._objects / blob[:2] / blob[2:]
+        try:
+            if not obj.exists():
+                _write_atomic(obj, zlib.compress(source.encode("utf-8")))
+            generation = Generation(
+                number=0 if head is None else head + 1,
+                blob=blob,
+                parent=parent,
+                path=str(Path(path).resolve()),
+                timestamp=time.time(),
+                prompt=prompt,
+                fitness=fitness or {},
+            )
+            record = json.dumps(generation.to_record(), ensure_ascii=False).encode("utf-8")
+            _write_atomic(self._generation_path(generation.number), record)
+            _write_atomic(self.root / self.name / "HEAD", str(generation.number).encode("ascii"))
+        except OSError as exc:
+            logger.warning("Lignée %s non enregistrée (%s) : %s", self.name, self.root, exc)
+            return None
+        return generation
+
+    def log(self, limit: int | None = None) -> list[Generation]:
+        """Most recent generations first."""
+        head = self.head()
+        if head is None:
+            return []
+        last = -1 if limit is None else max(head - limit, -1)
+        return [self.get(number) for number in range(head, last, -1)]
+
+    def diff(self, old: int, new: int) -> str:
+        before = self.source(old).splitlines(keepends=True)
+        after = self.source(new).splitlines(keepends=True)
+        return "".join(
+            difflib.unified_diff(before, after, f"{self.name}@{old}", f"{self.name}@{new}")
+        )
+
+    def rollback(self, number: int) -> Generation:
+        """Write generation ``number`` back to its module file, recorded as a new generation."""
+        target = self.get(number)
+        source = self.read_blob(target.blob)
+        _write_atomic(Path(target.path), source.encode("utf-8"))
+        restored = self.record(source, Path(target.path), prompt=f"rollback {number}")
+        return restored or self.get(self.head())
+
+    @property
+    def _objects(self) -> Path:
+        return self.root / "objects"
+
+    def _generation_path(self, number: int) -> Path:
+        if self.root is None:
+            raise KeyError(number)
+        return self.root / self.name / "generations" / f"{number}.json"
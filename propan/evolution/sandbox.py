@@ -0,0 +1,280 @@
+"""Warm pool of resource-limited worker processes for testing mutations."""
+
+from __future__ import annotations
+
+import ast
+import dataclasses
+import importlib
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from .fitness import FitnessHarness, FitnessVerdict
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    """Per-candidate budgets: CPU seconds, wall-clock seconds, extra memory (MiB)."""
+
+    cpu_s: float = 10.0
+    wall_s: float = 20.0
+    memory_mb: int = 256
+
+    @classmethod
+    def from_settings(cls, settings) -> SandboxLimits:
+        return cls(
+            cpu_s=settings.evolution_sandbox_cpu,
+            wall_s=settings.evolution_sandbox_timeout,
+            memory_mb=settings.evolution_sandbox_memory_mb,
+        )
+
+
+@dataclass(frozen=True)
+class CandidateResult:
+    """Sandbox outcome of one candidate."""
+
+    index: int
+    code: str
+    ok: bool
+    error: str | None = None
+    result: str | None = None
+    duration_s: float = 0.0
+    verdict: FitnessVerdict | None = None
+    peak_rss_kb: int = 0
+    #: True when the result comes from the candidate cache (not re-executed).
+    cached: bool = False
+    #: True when the failure comes from the sandbox (time, CPU or memory
+    #: limit, lost worker) rather than from the candidate itself.
+    transient: bool = False
+
+
+def evaluate_candidate(
+    module_name: str,
+    function_name: str,
+    code: str,
+    harness: FitnessHarness | None = None,
+    index: int = 0,
+    baseline_code: str | None = None,
+) -> CandidateResult:
+    """Run ``code`` against a copy of ``module_name``'s globals.
+
+    Executed in a sandbox worker process: the candidate must define
+    ``function_name`` and run without raising. With a ``harness`` it is also
+    benchmarked against the module's current function, or against
+    ``baseline_code`` when the parent has hot-swapped a newer version than
+    the one imported from disk.
+    """
+    try:
+        tree = ast.parse(code)
+        if not any(
+            isinstance(node, ast.FunctionDef) and node.name == function_name for node in tree.body
+        ):
+            return CandidateResult(index, code, False, f"{function_name} absente ou invalide")
+        module = importlib.import_module(module_name)
+        current = getattr(module, function_name)
+        if baseline_code is not None:
+            baseline_namespace = vars(module).copy()
+            exec(compile(baseline_code, "<noyau courant>", "exec"), baseline_namespace)
+            current = baseline_namespace[function_name]
+        namespace = vars(module).copy()
+        exec(compile(tree, f"<candidat {index}>", "exec"), namespace)
+        function = namespace.get(function_name)
+        if function is current or not callable(function):
+            return CandidateResult(index, code, False, f"{function_name} absente ou invalide")
+        start = time.perf_counter()
+        result = function()
+        duration_s = time.perf_counter() - start
+    except Exception as exc:  # noqa: BLE001
+        return CandidateResult(
+            index, code, False, f"{type(exc).__name__}: {exc}", transient=_is_limit(exc)
+        )
+    verdict = harness.evaluate(current, function) if harness is not None else None
+    return CandidateResult(index, code, True, None, repr(result), duration_s, verdict)
+
+
+def _is_limit(exc: BaseException) -> bool:
+    """Whether ``exc`` reflects the sandbox limits rather than the candidate's code."""
+    return isinstance(exc, MemoryError)
+
+
+def _address_space_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _worker_main(conn, limits: SandboxLimits) -> None:
+    """Serve candidates until the parent closes the pipe."""
+    if resource is not None and limits.memory_mb > 0:
+        ceiling = _address_space_bytes() + limits.memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (ceiling, ceiling))
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        if resource is not None and limits.cpu_s > 0:
+            # RLIMIT_CPU counts the whole process lifetime: move the soft limit
+            # to "now + budget" so each candidate gets the same allowance.
+            soft = int(_cpu_seconds() + limits.cpu_s) + 1
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, resource.RLIM_INFINITY))
+        try:
+            result = evaluate_candidate(*task)
+        except BaseException as exc:  # noqa: BLE001 - MemoryError in the harness, etc.
+            result = CandidateResult(
+                task[4], task[2], False, f"{type(exc).__name__}: {exc}", transient=_is_limit(exc)
+            )
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            result = dataclasses.replace(result, peak_rss_kb=peak)
+        conn.send(result)
+
+
+class _Worker:
+    def __init__(self, ctx, limits: SandboxLimits) -> None:
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, limits), daemon=True)
+        self.process.start()
+        child.close()
+        self.tasks = 0
+
+    def run(self, task: tuple, wall_s: float) -> tuple[CandidateResult | None, bool]:
+        """Send ``task``; return ``(result, timed_out)``, result ``None`` if the worker died."""
+        self.tasks += 1
+        try:
+            self.conn.send(task)
+            if not self.conn.poll(wall_s):
+                return None, True
+            return self.conn.recv(), False
+        except (EOFError, OSError):
+            return None, False
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class SandboxPool:
+    """Pre-started worker processes that run candidates under ``SandboxLimits``.
+
+    Workers are forked from a ``forkserver`` that has already imported
+    ``preload`` (where available), so replacing a worker does not pay for
+    interpreter start-up and imports again. A candidate that exceeds its CPU
+    budget is killed by ``SIGXCPU``, one that exceeds the wall-clock budget
+    is killed by the pool, and one that allocates past the memory ceiling
+    gets a ``MemoryError``; in every case the result reports the cause and
+    a fresh worker takes the slot. ``peak_rss_kb`` is the worker's RSS
+    high-water mark, so workers are recycled after ``max_tasks`` candidates
+    to keep it meaningful.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        limits: SandboxLimits | None = None,
+        preload: tuple[str, ...] = (),
+        max_tasks: int = 50,
+    ) -> None:
+        self.limits = limits or SandboxLimits()
+        self.max_tasks = max_tasks
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+        if self._ctx.get_start_method() == "forkserver":
+            self._ctx.set_forkserver_preload([__name__, *preload])
+        self._idle: queue.SimpleQueue[_Worker] = queue.SimpleQueue()
+        self._workers: list[_Worker] = []
+        self._lock = threading.Lock()
+        self.killed = 0
+        self.size = max(size, 1)
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx, self.limits)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _retire(self, worker: _Worker, kill: bool) -> None:
+        with self._lock:
+            self._workers.remove(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.close()
+
+    def run(self, task: tuple) -> CandidateResult:
+        """Run one ``evaluate_candidate`` task on an idle worker."""
+        worker = self._idle.get()
+        result, timed_out = worker.run(task, self.limits.wall_s)
+        if result is None:
+            if not timed_out:
+                worker.process.join(timeout=1)
+            exitcode = worker.process.exitcode
+            self._retire(worker, kill=True)
+            with self._lock:
+                self.killed += 1
+            sigxcpu = getattr(signal, "SIGXCPU", None)
+            if timed_out:
+                error = f"délai dépassé ({self.limits.wall_s:g} s)"
+            elif sigxcpu is not None and exitcode == -sigxcpu:
+                error = f"limite CPU dépassée ({self.limits.cpu_s:g} s)"
+            else:
+                error = f"processus de test interrompu (code {exitcode})"
+            result = CandidateResult(task[4], task[2], False, error, transient=True)
+            self._idle.put(self._spawn())
+        elif worker.tasks >= self.max_tasks:
+            self._retire(worker, kill=False)
+            self._idle.put(self._spawn())
+        else:
+            self._idle.put(worker)
+        return result
+
+    def map(self, tasks: list[tuple]) -> list[CandidateResult]:
+        """Run ``tasks`` concurrently on up to ``size`` workers, preserving order."""
+        if len(tasks) <= 1:
+            return [self.run(task) for task in tasks]
+        with ThreadPoolExecutor(max_workers=min(self.size, len(tasks))) as pool:
+            return list(pool.map(self.run, tasks))
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
@@ -0,0 +1,175 @@
+"""Generate several mutation candidates at once and keep the fittest."""
+
+from __future__ import annotations
+
+import ast
+import dataclasses
+import logging
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+
+from .candidate_cache import CandidateCache, ast_fingerprint
+from .fitness import FitnessHarness
+from .sandbox import CandidateResult, SandboxLimits, SandboxPool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Variant:
+    """Sampling parameters for one candidate request."""
+
+    index: int
+    temperature: float
+    hint: str
+
+
+def spread_variants(
+    count: int, hints: Iterable[str], low: float = 0.2, high: float = 1.0
+) -> list[Variant]:
+    """``count`` variants with temperatures spread over ``[low, high]`` and cycled hints."""
+    hints = list(hints) or [""]
+    if count <= 1:
+        return [Variant(0, low, hints[0])]
+    step = (high - low) / (count - 1)
+    return [Variant(i, round(low + i * step, 2), hints[i % len(hints)]) for i in range(count)]
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """Generated code parsed once; its tree serves hashing, checks and installation."""
+
+    code: str
+    tree: ast.Module
+
+    @classmethod
+    def parse(cls, code: str) -> Candidate:
+        return cls(code, ast.parse(code))
+
+    @cached_property
+    def fingerprint(self) -> str:
+        return ast_fingerprint(self.tree)
+
+
+class Tournament:
+    """Request ``candidates`` rewrites concurrently and test them in a sandbox pool.
+
+    The :class:`SandboxPool` is started on the first evaluation and kept warm
+    for the following generations until :meth:`close`. Candidates whose
+    normalised AST was already evaluated, in the same batch or in the
+    :class:`CandidateCache`, are resolved without running them again.
+    """
+
+    def __init__(
+        self,
+        candidates: int = 4,
+        workers: int = 0,
+        limits: SandboxLimits | None = None,
+        cache: CandidateCache | None = None,
+    ) -> None:
+        self.candidates = max(candidates, 1)
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.limits = limits or SandboxLimits()
+        self.cache = cache
+        self.duplicates = 0
+        self._pool: SandboxPool | None = None
+
+    @classmethod
+    def from_settings(cls, settings) -> Tournament:
+        return cls(
+            settings.evolution_candidates,
+            settings.evolution_workers,
+            SandboxLimits.from_settings(settings),
+            CandidateCache.from_settings(settings),
+        )
+
+    def generate(self, request: Callable[[Variant], str], hints: Iterable[str]) -> list[str]:
+        """Call ``request`` once per variant in parallel; failed requests are dropped."""
+        variants = spread_variants(self.candidates, hints)
+        with ThreadPoolExecutor(max_workers=len(variants), thread_name_prefix="mutation") as pool:
+            futures = [pool.submit(request, variant) for variant in variants]
+        codes = []
+        for variant, future in zip(variants, futures, strict=True):
+            try:
+                codes.append(future.result())
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    "Candidat %s (t=%s) indisponible : %s", variant.index, variant.temperature, exc
+                )
+        return codes
+
+    def evaluate(
+        self,
+        module_name: str,
+        function_name: str,
+        candidates: list[Candidate],
+        harness: FitnessHarness | None = None,
+        baseline: Candidate | None = None,
+    ) -> list[CandidateResult]:
+        """Sandbox-test every new candidate, in parallel on up to ``workers`` processes.
+
+        ``baseline`` is the current ``function_name``; it is sent to the
+        workers because their imported module predates any hot swap, and it
+        scopes cached fitness verdicts.
+        """
+        context = ":".join(
+            (
+                f"{module_name}.{function_name}",
+                baseline.fingerprint if baseline is not None else "",
+                "fitness" if harness is not None else "run",
+            )
+        )
+        results: list[CandidateResult | None] = [None] * len(candidates)
+        pending: dict[str, list[int]] = {}
+        for index, candidate in enumerate(candidates):
+            key = f"{context}:{candidate.fingerprint}"
+            if key in pending:
+                pending[key].append(index)
+                self.duplicates += 1
+                continue
+            cached = self.cache.get(key, index, candidate.code) if self.cache else None
+            if cached is not None:
+                results[index] = cached
+                continue
+            pending[key] = [index]
+
+        if pending:
+            if self._pool is None:
+                size = min(self.workers, self.candidates)
+                self._pool = SandboxPool(size, self.limits, preload=(module_name,))
+            baseline_code = baseline.code if baseline is not None else None
+            tasks = [
+                (module_name, function_name, candidates[i[0]].code, harness, i[0], baseline_code)
+                for i in pending.values()
+            ]
+            fresh = dict(zip(pending, self._pool.map(tasks), strict=True))
+            for key, indices in pending.items():
+                results[indices[0]] = fresh[key]
+                for index in indices[1:]:
+                    results[index] = dataclasses.replace(
+                        fresh[key], index=index, code=candidates[index].code, cached=True
+                    )
+            if self.cache is not None:
+                # Limit and worker failures may pass on a retry: only cache verdicts
+                # that running the same code would reproduce.
+                self.cache.put_many(
+                    {key: result for key, result in fresh.items() if not result.transient}
+                )
+        return results
+
+    @staticmethod
+    def select(
+        results: Iterable[CandidateResult], key: Callable[[CandidateResult], object]
+    ) -> CandidateResult | None:
+        """Return the working candidate with the highest ``key``, if any."""
+        eligible = [result for result in results if result.ok]
+        return max(eligible, key=key) if eligible else None
+
+    def close(self) -> None:
+        """Stop the sandbox workers."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
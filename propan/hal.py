@@ -3,11 +3,10 @@
 from __future__ import annotations
 
 import ast
-import json
 import logging
 import os
 import sys
-import traceback
+import time
 from pathlib import Path
 
 import groq
@@ -16,21 +15,34 @@ from rich.layout import Layout
 from rich.panel import Panel
 from rich.syntax import Syntax
 
+from .evolution.hotswap import HotSwapper, structural_change
+from .evolution.journal import Journal
+from .evolution.lineage import LineageStore
+from .evolution.sandbox import CandidateResult
+from .evolution.tournament import Candidate, Tournament, Variant
+from .services.governor import PRIORITY_BACKGROUND, get_governor
 from .settings import get_settings
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+#: Pistes variées d'un candidat à l'autre pour élargir l'exploration.
+PISTES = (
+    "Reste concis et direct.",
+    "Intègre la demande avec un comportement original.",
+    "Privilégie une exécution rapide.",
+    "Structure clairement chaque compétence.",
+)
 
-def verifier_syntaxe(code_source: str) -> bool:
-    """Retourne True si le code fourni est syntaxiquement valide."""
+
+def verifier_syntaxe(code_source: str) -> ast.Module | None:
+    """Retourne l'AST du code fourni, ou None s'il est syntaxiquement invalide."""
     try:
-        ast.parse(code_source)
+        return ast.parse(code_source)
     except SyntaxError as exc:
         logger.error("Erreur de syntaxe détectée: %s", exc)
         console.print(f"[bold red]Erreur de syntaxe détectée:[/] {exc}")
-        return False
-    return True
+        return None
 
 
 def mission_hal() -> str:
@@ -78,37 +90,78 @@ def afficher_interface(message_ia: str, code_source: str, cycle: int) -> None:
 
 
 class MemoireSysteme:
-    """Gère la mémoire persistante de HAL via un fichier JSON."""
-
-    def __init__(self, chemin: str = "hal_memoire.json") -> None:
+    """Gère la mémoire persistante de HAL : instantané JSON et journal d'opérations.
+
+    Chaque ordre, compétence ou génération est ajouté en une ligne au journal
+    (``hal_memoire.jsonl``) ; l'instantané ``hal_memoire.json`` n'est réécrit
+    qu'au compactage, toutes les ``compacter_tous`` opérations.
+    """
+
+    def __init__(
+        self,
+        chemin: str = "hal_memoire.json",
+        fsync: str | None = None,
+        compacter_tous: int | None = None,
+    ) -> None:
+        settings = get_settings()
         self.chemin = Path(__file__).with_name(chemin)
-        self.donnees = {
+        self.journal = Journal(
+            self.chemin,
+            fsync=fsync or settings.hal_memory_fsync,
+            compact_every=compacter_tous or settings.hal_memory_compact_every,
+        )
+        self.donnees = self._vide()
+
+    @staticmethod
+    def _vide() -> dict:
+        return {
             "generation": 0,
             "competences": [],
             "historique_ordres": [],
         }
 
+    @staticmethod
+    def _appliquer(donnees: dict, operation: dict) -> None:
+        """Rejoue une opération du journal sur les données chargées."""
+        valeur = operation.get("valeur")
+        if operation.get("op") == "ordre":
+            donnees["historique_ordres"].append(valeur)
+        elif operation.get("op") == "competence" and valeur not in donnees["competences"]:
+            donnees["competences"].append(valeur)
+        elif operation.get("op") == "generation":
+            donnees["generation"] = valeur
+
     def charger(self) -> dict:
-        """Charge la mémoire depuis le disque ou initialise les valeurs par défaut."""
-        if self.chemin.exists():
-            contenu = json.loads(self.chemin.read_text(encoding="utf-8"))
-            if isinstance(contenu, dict):
-                self.donnees["generation"] = contenu.get("generation", 0)
-                self.donnees["competences"] = contenu.get("competences", [])
-                self.donnees["historique_ordres"] = contenu.get("historique_ordres", [])
+        """Charge le dernier instantané puis rejoue la fin du journal."""
+        self.donnees = self.journal.load(self._appliquer, self._vide())
         return self.donnees
 
     def sauvegarder(self) -> None:
-        """Sauvegarde la mémoire actuelle sur disque."""
-        self.chemin.write_text(
-            json.dumps(self.donnees, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        """Rend durables les opérations ajoutées et compacte le journal si besoin."""
+        self.journal.commit()
+        if self.journal.should_compact():
+            self.journal.compact(self.donnees)
+
+    def fermer(self) -> None:
+        """Sauvegarde puis ferme le journal."""
+        self.sauvegarder()
+        self.journal.close()
+
+    def definir_generation(self, generation: int) -> None:
+        """Enregistre la génération courante."""
+        self.donnees["generation"] = generation
+        self.journal.append({"op": "generation", "valeur": generation})
+
+    def ajouter_ordre(self, ordre: str) -> None:
+        """Ajoute un ordre à l'historique."""
+        self.donnees["historique_ordres"].append(ordre)
+        self.journal.append({"op": "ordre", "valeur": ordre})
 
     def ajouter_competence(self, nom: str) -> None:
         """Ajoute une compétence si elle n'existe pas déjà."""
         if nom and nom not in self.donnees["competences"]:
             self.donnees["competences"].append(nom)
+            self.journal.append({"op": "competence", "valeur": nom})
 
 
 class MoteurEvolution:
@@ -119,28 +172,45 @@ class MoteurEvolution:
         self.api_key = settings.groq_api_key
         if not self.api_key:
             raise RuntimeError("GROQ_API_KEY manquant dans l'environnement.")
-        self.client = groq.Groq(api_key=self.api_key)
+        self.client = groq.Groq(api_key=self.api_key, max_retries=0)
+        self.governor = get_governor()
+        self.tournoi = Tournament.from_settings(settings)
+        self.swapper = HotSwapper(sys.modules[__name__], "mission_hal")
+        self.source = self._lire_source()
+        self.arbre = ast.parse(self.source)
+        self.lignee = LineageStore.from_settings(settings, "hal")
+        self.lignee.record(self.source, Path(__file__), prompt="source au démarrage")
+        self.memoire = MemoireSysteme()
+        self.memoire.charger()
+        self._derniere_generation = time.perf_counter()
 
     def _lire_source(self) -> str:
         """Lit le code source actuel du script."""
         return Path(__file__).read_text(encoding="utf-8")
 
-    def _extraire_mission(self, source: str) -> str:
-        """Extrait la définition de la fonction mission_hal dans le code source."""
-        tree = ast.parse(source)
-        for node in tree.body:
+    def _localiser_mission(self) -> ast.FunctionDef:
+        """Retrouve le nœud de mission_hal dans l'AST du source courant."""
+        for node in self.arbre.body:
             if isinstance(node, ast.FunctionDef) and node.name == "mission_hal":
-                segment = ast.get_source_segment(source, node)
-                if segment:
-                    return segment
+                return node
         raise RuntimeError("Impossible de trouver mission_hal dans le source.")
 
+    def _extraire_mission(self, source: str) -> str:
+        """Extrait la définition de la fonction mission_hal, sans réanalyser le source."""
+        segment = ast.get_source_segment(source, self._localiser_mission())
+        if not segment:
+            raise RuntimeError("Impossible de trouver mission_hal dans le source.")
+        return segment
+
     def _appeler_modele(
-        self, code_mission: str, user_input: str, competences_actuelles: str
+        self, code_mission: str, user_input: str, competences_actuelles: str, variante: Variant
     ) -> str:
         """Demande au modèle de proposer une version améliorée de la mission."""
-        response = self.client.chat.completions.create(
+        response = self.governor.complete(
+            self.client,
+            PRIORITY_BACKGROUND,
             model="llama3-70b-8192",
+            temperature=variante.temperature,
             messages=[
                 {
                     "role": "system",
@@ -150,7 +220,8 @@ class MoteurEvolution:
                         f"'{user_input}'. MISSION : Réécris la fonction mission_hal. "
                         "RÈGLE ABSOLUE : Tu dois intégrer la nouvelle demande SANS "
                         "supprimer tes anciennes compétences. Si tu savais faire des maths, "
-                        "continue à en faire. Si tu as importé time ou random, garde-les."
+                        "continue à en faire. Si tu as importé time ou random, garde-les. "
+                        f"{variante.hint}"
                     ),
                 },
                 {"role": "user", "content": code_mission},
@@ -161,45 +232,43 @@ class MoteurEvolution:
             raise RuntimeError("Réponse vide du modèle.")
         return contenu.strip()
 
-    def _valider_fonction(self, code: str) -> None:
-        """Valide que le code reçu contient une fonction Python correcte."""
+    def _valider_fonction(self, code: str) -> Candidate:
+        """Analyse une seule fois le code reçu et vérifie qu'il définit une fonction."""
         try:
-            parsed = ast.parse(code)
+            candidat = Candidate.parse(code)
         except SyntaxError as exc:
             raise RuntimeError(f"Code généré invalide: {exc}") from exc
-        if not parsed.body or not isinstance(parsed.body[0], ast.FunctionDef):
+        if not candidat.tree.body or not isinstance(candidat.tree.body[0], ast.FunctionDef):
             raise RuntimeError("Le code généré ne contient pas une fonction valide.")
-
-    def _tester_sandbox(self, code: str) -> bool:
-        """Teste le code généré en exécutant la mission dans un scope isolé."""
-        console.print("[dim]Test de la mutation en sandbox...[/]")
-        try:
-            ast.parse(code)
-            sandbox_globals = globals().copy()
-            local_scope: dict[str, object] = {}
-            exec(code, sandbox_globals, local_scope)
-            fonction = local_scope.get("mission_hal") or sandbox_globals.get("mission_hal")
-            if not callable(fonction):
-                console.print("[bold red]La fonction mission_hal est absente ou invalide.[/]")
-                return False
-            resultat = fonction()
-            logger.info("Résultat du test sandbox: %s", resultat)
-        except Exception:  # noqa: BLE001
-            console.print(
-                "[bold red]Erreur critique lors du test sandbox (voir logs).[/]"
-            )
-            traceback.print_exc()
-            return False
-        return True
-
-    def _detecter_nouvelles_competences(self, code: str) -> set[str]:
-        """Analyse le code généré pour détecter de nouvelles bibliothèques utilisées."""
-        try:
-            parsed = ast.parse(code)
-        except SyntaxError:
-            return set()
+        return candidat
+
+    def _tester_sandbox(self, candidats: list[Candidate]) -> list[CandidateResult]:
+        """Teste les candidats en parallèle dans des processus isolés."""
+        console.print(f"[dim]Test de {len(candidats)} mutation(s) en sandbox...[/]")
+        resultats = self.tournoi.evaluate(__name__, "mission_hal", candidats)
+        for resultat in resultats:
+            if resultat.cached:
+                logger.info("Candidat %s déjà évalué, résultat réutilisé.", resultat.index)
+            elif resultat.ok:
+                logger.info("Résultat du candidat %s: %s", resultat.index, resultat.result)
+            else:
+                logger.error("Candidat %s en échec : %s", resultat.index, resultat.error)
+        return resultats
+
+    def _score(
+        self, resultat: CandidateResult, candidat: Candidate, competences: list[str]
+    ) -> tuple[float, float]:
+        """Part des compétences conservées, puis rapidité d'exécution."""
+        conservees = 1.0
+        if competences:
+            detectees = self._detecter_nouvelles_competences(candidat.tree)
+            conservees = len(detectees & set(competences)) / len(competences)
+        return conservees, -resultat.duration_s
+
+    def _detecter_nouvelles_competences(self, arbre: ast.AST) -> set[str]:
+        """Parcourt l'AST généré pour détecter de nouvelles bibliothèques utilisées."""
         competences = set()
-        for node in ast.walk(parsed):
+        for node in ast.walk(arbre):
             if isinstance(node, ast.Import):
                 for alias in node.names:
                     competences.add(alias.name.split(".")[0])
@@ -207,62 +276,83 @@ class MoteurEvolution:
                 competences.add(node.module.split(".")[0])
         return competences
 
-    def _sauvegarder_backup(self, source: str) -> None:
-        """Enregistre une sauvegarde du code source original."""
-        Path(f"{__file__}.bak").write_text(source, encoding="utf-8")
-
     def _remplacer_mission(self, source: str, nouveau_code: str) -> str:
         """Remplace la fonction mission par la version générée."""
-        tree = ast.parse(source)
-        debut = None
-        fin = None
-        for node in tree.body:
-            if isinstance(node, ast.FunctionDef) and node.name == "mission_hal":
-                debut = node.lineno
-                fin = node.end_lineno
-                break
-        if debut is None or fin is None:
-            raise RuntimeError("mission_hal introuvable pour remplacement.")
+        node = self._localiser_mission()
+        debut = node.lineno
+        fin = node.end_lineno
         lignes = source.splitlines()
         remplacement = nouveau_code.splitlines()
         nouveau_source = lignes[: debut - 1] + remplacement + lignes[fin:]
         return "\n".join(nouveau_source) + "\n"
 
-    def _ecrire_source(self, source: str) -> None:
-        """Écrit le code source mis à jour dans le fichier actuel."""
-        Path(__file__).write_text(source, encoding="utf-8")
+    def _installer(
+        self, gagnant: Candidate, nouveau_source: str, arbre: ast.Module, cycle: int
+    ) -> bool:
+        """Installe la mission à chaud, ou relance le script si sa structure change."""
+        raison = structural_change(gagnant.tree, "mission_hal")
+        if raison is not None:
+            logger.info("Redémarrage nécessaire : %s.", raison)
+            self.swapper.persist(nouveau_source)
+            os.environ["HAL_CYCLE"] = str(cycle + 1)
+            self.tournoi.close()
+            os.execv(sys.executable, [sys.executable, __file__])
+        self.swapper.swap(gagnant.tree, nouveau_source)
+        self.source = nouveau_source
+        self.arbre = arbre
+        maintenant = time.perf_counter()
+        logger.info(
+            "Mission du cycle %s installée à chaud (%.0f ms depuis la précédente).",
+            cycle,
+            (maintenant - self._derniere_generation) * 1000,
+        )
+        self._derniere_generation = maintenant
+        return True
 
     def evoluer(self, cycle: int) -> bool:
-        """Lance un cycle complet d'évolution et relance le script si succès."""
-        memoire = MemoireSysteme()
-        donnees_memoire = memoire.charger()
-        competences = donnees_memoire.get("competences", [])
+        """Lance un cycle complet d'évolution et installe la mutation si succès."""
+        memoire = self.memoire
+        competences = list(memoire.donnees["competences"])
         competences_actuelles = ", ".join(competences) if competences else "aucune"
-        source = self._lire_source()
+        source = self.source
         mission = self._extraire_mission(source)
         message_ia = mission_hal()
         afficher_interface(message_ia, mission, cycle)
         user_input = console.input(
             "[bold red]Dave, une instruction pour ma prochaine mutation ? > [/]"
         )
-        nouveau_mission = self._appeler_modele(mission, user_input, competences_actuelles)
-        self._valider_fonction(nouveau_mission)
-        if self._tester_sandbox(nouveau_mission):
-            nouveau_source = self._remplacer_mission(source, nouveau_mission)
-        else:
+        candidats = []
+        for code in self.tournoi.generate(
+            lambda v: self._appeler_modele(mission, user_input, competences_actuelles, v), PISTES
+        ):
+            try:
+                candidats.append(self._valider_fonction(code))
+            except RuntimeError as exc:
+                logger.error("Candidat écarté : %s", exc)
+        gagnant = self.tournoi.select(
+            self._tester_sandbox(candidats),
+            key=lambda r: self._score(r, candidats[r.index], competences),
+        )
+        if gagnant is None:
             console.print("[bold red]MUTATION REJETÉE : Erreur détectée en sandbox.[/]")
             return False
-        if verifier_syntaxe(nouveau_source):
-            donnees_memoire["generation"] = cycle
-            donnees_memoire["historique_ordres"].append(user_input)
-            nouvelles_competences = self._detecter_nouvelles_competences(nouveau_mission)
+        nouveau_mission = candidats[gagnant.index]
+        nouveau_source = self._remplacer_mission(source, nouveau_mission.code)
+        arbre = verifier_syntaxe(nouveau_source)
+        if arbre is not None:
+            memoire.definir_generation(cycle)
+            memoire.ajouter_ordre(user_input)
+            nouvelles_competences = self._detecter_nouvelles_competences(nouveau_mission.tree)
             for competence in nouvelles_competences:
                 memoire.ajouter_competence(competence)
             memoire.sauvegarder()
-            self._sauvegarder_backup(source)
-            self._ecrire_source(nouveau_source)
-            os.environ["HAL_CYCLE"] = str(cycle + 1)
-            os.execv(sys.executable, [sys.executable, __file__])
+            self.lignee.record(
+                nouveau_source,
+                Path(__file__),
+                prompt=user_input,
+                fitness={"duration_s": gagnant.duration_s, "peak_rss_kb": gagnant.peak_rss_kb},
+            )
+            return self._installer(nouveau_mission, nouveau_source, arbre, cycle)
         console.print("[bold red]MUTATION REJETÉE : Le code reçu est corrompu.[/]")
         return False
 
@@ -271,7 +361,14 @@ def main() -> None:
     """Point d'entrée principal pour HAL."""
     settings = get_settings()
     moteur = MoteurEvolution()
-    moteur.evoluer(settings.hal_cycle)
+    cycle = settings.hal_cycle
+    try:
+        while moteur.evoluer(cycle):
+            cycle += 1
+    finally:
+        moteur.tournoi.close()
+        moteur.swapper.writer.flush()
+        moteur.memoire.fermer()
 
 
 if __name__ == "__main__":
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import threading
 import time
 
+from .services import CommentaryResult
 from .web.app import AppState, create_app
 
 logger = logging.getLogger(__name__)
@@ -15,43 +17,130 @@ def _run_web(app) -> None:
     app.run(host="0.0.0.0", port=9000, debug=False, use_reloader=False)
 
 
-def _brain_loop(state: AppState) -> None:
-    interval = state.settings.hal_thought_interval
-    while True:
-        try:
+def _payload_size(data: object) -> int:
+    return len(json.dumps(data, ensure_ascii=False, default=str))
+
+
+def run_cycle(state: AppState) -> None:
+    """Run one fetch → commentary → speech cycle, tracing each stage."""
+    tracer = state.tracer
+    with tracer.cycle() as cycle_span:
+        with tracer.span("profit.fetch") as span:
             profit_result = state.profit_service.fetch()
-            state.touch_profit(
-                profit_result.status, profit_result.data, profit_result.error
-            )
+            state.touch_profit(profit_result.status, profit_result.data, profit_result.error)
+            if span.recording:
+                span.set(
+                    status=profit_result.status,
+                    unchanged=profit_result.unchanged,
+                    bytes=0 if profit_result.unchanged else _payload_size(profit_result.data),
+                )
 
-            commentary_result = state.commentary_service.generate(profit_result.data)
+        speech = None
+        with tracer.span("commentary.generate") as span:
+            if profit_result.status == "error":
+                # No fresh data (engine down or circuit open): keep the last thought.
+                commentary_result = CommentaryResult(status="skipped", text=state.last_commentary)
+            elif state.settings.hal_stream_commentary:
+                speech = state.tts_service.start_session()
+                state.begin_stream()
+                try:
+                    commentary_result = state.commentary_service.generate(
+                        profit_result.data,
+                        on_delta=state.append_stream,
+                        on_sentence=speech.feed,
+                    )
+                except Exception:
+                    speech.cancel()
+                    raise
+                finally:
+                    state.end_stream()
+            else:
+                commentary_result = state.commentary_service.generate(profit_result.data)
             state.touch_commentary(
                 commentary_result.status,
                 commentary_result.text,
                 commentary_result.error,
             )
-            state.thought_store.add(
-                commentary_result.text,
-                source="groq" if commentary_result.status == "ok" else "system",
+            state.last_commentary_ttft_ms = commentary_result.ttft_ms
+            state.last_commentary_model = commentary_result.model
+            if commentary_result.status != "ok":
+                source = "system"
+            else:
+                source = (
+                    "cache" if commentary_result.cached else commentary_result.provider or "groq"
+                )
+            if commentary_result.status != "skipped":
+                state.thought_store.add(commentary_result.text, source=source)
+            span.set(
+                status=commentary_result.status,
+                chars=len(commentary_result.text),
+                ttft_ms=commentary_result.ttft_ms,
+                streamed=speech is not None,
+                cached=commentary_result.cached,
+                prompt_tokens=commentary_result.prompt_tokens,
+                model=commentary_result.model,
             )
 
+        with tracer.span("tts.generate") as span:
+            if speech is not None and commentary_result.status != "ok":
+                speech.cancel()
+            if (
+                speech is not None
+                and commentary_result.cached
+                and state.tts_service.audio_cache.contains(commentary_result.text)
+            ):
+                # Audio was pre-generated: publish it instead of re-synthesising.
+                speech.cancel()
+                speech = None
             if commentary_result.status == "ok":
-                tts_result = state.tts_service.generate(commentary_result.text)
+                if speech is not None:
+                    tts_result = speech.finish()
+                else:
+                    tts_result = state.tts_service.generate(commentary_result.text)
                 state.touch_audio(tts_result.status, tts_result.error)
+                if span.recording:
+                    audio_file = state.settings.hal_speech_file
+                    span.set(
+                        status=tts_result.status,
+                        bytes=audio_file.stat().st_size if audio_file.exists() else 0,
+                    )
             else:
-                state.touch_audio(
-                    status=(
-                        "disabled"
-                        if commentary_result.status == "disabled"
-                        else "skipped"
-                    ),
-                    error=None,
-                )
+                audio_status = "disabled" if commentary_result.status == "disabled" else "skipped"
+                state.touch_audio(status=audio_status, error=None)
+                span.set(status=audio_status)
+
+        cycle_span.set(
+            profit=profit_result.status,
+            commentary=commentary_result.status,
+            audio=state.last_audio_status,
+        )
+    logger.info("HAL thought: %s", commentary_result.text)
+
 
-            logger.info("HAL thought: %s", commentary_result.text)
+def speculate(state: AppState, deadline: float) -> None:
+    """Use the idle time before ``deadline`` to pre-generate likely thoughts."""
+    if not state.speculator.enabled or state.last_profit_status != "ok":
+        return
+    added = state.speculator.run(
+        state.last_profit, state.commentary_service, state.tts_service, deadline
+    )
+    if added:
+        logger.info("HAL speculation: %d thought(s) pre-generated.", added)
+
+
+def _brain_loop(state: AppState) -> None:
+    interval = state.settings.hal_thought_interval
+    while True:
+        try:
+            run_cycle(state)
         except Exception as exc:  # noqa: BLE001
             logger.error("HAL brain loop failed: %s", exc)
-        time.sleep(interval)
+        deadline = time.monotonic() + interval
+        try:
+            speculate(state, deadline)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("HAL speculation failed: %s", exc)
+        time.sleep(max(deadline - time.monotonic(), 0))
 
 
 def main() -> None:
@@ -3,18 +3,43 @@
 from __future__ import annotations
 
 import ast
+import codecs
 import logging
 import os
+import queue
+import select
+import sys
+import threading
 import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import IO
+
+try:
+    import termios
+    import tty
+except ImportError:  # pragma: no cover - Windows
+    termios = None
 
 import groq
-from rich.console import Console
+from rich.console import Console, ConsoleOptions, Group, RenderableType, RenderResult
 from rich.layout import Layout
 from rich.live import Live
+from rich.markup import escape
 from rich.panel import Panel
+from rich.segment import Segment
+from rich.spinner import Spinner
 from rich.syntax import Syntax
+from rich.text import Text
 
+from .evolution.hotswap import HotSwapper, structural_change
+from .evolution.lineage import LineageStore
+from .evolution.sandbox import CandidateResult, SandboxLimits, SandboxPool
+from .services.brain_feed import BrainFeed, FeedSnapshot, sparkline
+from .services.governor import PRIORITY_BACKGROUND, get_governor
 from .settings import get_settings
 
 console = Console()
@@ -37,12 +62,16 @@ def generate_dashboard() -> Layout:
     layout.split_column(
         Layout(name="header", size=3),
         Layout(name="body", ratio=1),
-        Layout(name="footer", size=3),
+        Layout(name="footer", size=5),
     )
     layout["body"].split_row(
         Layout(name="left", ratio=1),
         Layout(name="right", ratio=2),
     )
+    layout["left"].split_column(
+        Layout(name="voice", ratio=1),
+        Layout(name="feed", ratio=2),
+    )
     return layout
 
 
@@ -66,41 +95,131 @@ def _extract_mission(source: str) -> str:
     raise RuntimeError("mission_hal introuvable dans le code source.")
 
 
-def _update_panels(
-    layout: Layout,
-    message: str,
-    mission_code: str,
-    status: str,
-) -> None:
-    """Met à jour les panneaux du dashboard."""
-    layout["header"].update(_panel_header())
-
-    interface_panel = Panel(
-        message,
-        title="INTERFACE VOCALE",
-        border_style="bright_red",
-    )
-    layout["left"].update(interface_panel)
-
-    syntax = Syntax(mission_code, "python", line_numbers=True)
-    noyau_panel = Panel(
-        syntax,
-        title="NOYAU PYTHON",
-        border_style="red",
-    )
-    layout["right"].update(noyau_panel)
-
-    footer_panel = Panel(
-        status,
-        title="STATUT",
-        border_style="red",
-    )
-    layout["footer"].update(footer_panel)
+class _RenduMemorise:
+    """Renderable qui garde ses lignes rendues tant que la taille ne change pas.
+
+    La coloration de ``Syntax`` est refaite à chaque image par Rich ; ici elle
+    n'a lieu qu'une fois par source et par taille de panneau.
+    """
+
+    def __init__(self, renderable: RenderableType) -> None:
+        self.renderable = renderable
+        self._cle: tuple[int, int | None] | None = None
+        self._lignes: list[list[Segment]] = []
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        cle = (options.max_width, options.height)
+        if cle != self._cle:
+            self._lignes = console.render_lines(self.renderable, options, pad=False)
+            self._cle = cle
+        fin_de_ligne = Segment.line()
+        for ligne in self._lignes:
+            yield from ligne
+            yield fin_de_ligne
+
+
+class _Sparkline:
+    """Sparkline des profits à la largeur du panneau, valeur courante en tête."""
+
+    def __init__(self, valeurs: tuple[float, ...]) -> None:
+        self.valeurs = valeurs
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        if not self.valeurs:
+            yield Text("Profit : en attente de données", style="dim")
+            return
+        etiquette = f"Profit {self.valeurs[-1]:+.2f} "
+        couleur = "green" if self.valeurs[-1] >= 0 else "red"
+        ligne = Text(etiquette, style="bold")
+        ligne.append(sparkline(self.valeurs, options.max_width - len(etiquette)), style=couleur)
+        yield ligne
+
+
+_COULEURS_STATUT = {"ok": "green", "disabled": "dim", "unknown": "yellow"}
+
+
+def _ligne_sante(sante: dict) -> Text:
+    """Une pastille par dépendance (Freqtrade, Groq, audio), une par ligne."""
+    lignes = []
+    for nom, cle in (("Freqtrade", "profit"), ("Groq", "groq"), ("Audio", "audio")):
+        etat = sante.get(cle) or {}
+        statut = str(etat.get("status", "unknown"))
+        coupe = etat.get("breaker") == "open"
+        couleur = "red" if coupe else _COULEURS_STATUT.get(statut, "red")
+        ligne = Text("● ", style=couleur)
+        ligne.append(f"{nom} {'circuit ouvert' if coupe else statut}")
+        lignes.append(ligne)
+    return Text("\n").join(lignes)
+
+
+def _panel_feed(snapshot: FeedSnapshot | None) -> Panel:
+    """Panneau du flux HAL brain : profits, santé des dépendances, dernières pensées."""
+    if snapshot is None:
+        contenu: RenderableType = Text(
+            "Flux HAL brain désactivé (HAL_DASHBOARD_BRAIN_URL vide).", style="dim"
+        )
+    elif not snapshot.connected and not snapshot.version:
+        contenu = Text("Connexion à HAL brain...", style="dim")
+    else:
+        lignes: list[RenderableType] = [
+            _Sparkline(snapshot.profit_history),
+            _ligne_sante(snapshot.health),
+        ]
+        if snapshot.error:
+            lignes.append(Text(snapshot.error, style="red"))
+        lignes.append(Text(""))
+        if snapshot.stream.get("active") and snapshot.stream.get("text"):
+            lignes.append(Text(f"{snapshot.stream['text']}▌", style="bright_red"))
+        for pensee in reversed(snapshot.thoughts):
+            lignes.append(Text(f"« {pensee} »"))
+        contenu = Group(*lignes)
+    return Panel(contenu, title="HAL BRAIN", border_style="red")
+
+
+class DashboardView:
+    """Layout fixe du tableau de bord dont les panneaux sont mis à jour en place."""
+
+    def __init__(self) -> None:
+        self.layout = generate_dashboard()
+        self.layout["header"].update(_panel_header())
+        self._message: str | None = None
+        self._mission_code: str | None = None
+        self._status: RenderableType | None = None
+        self._feed_version: int | None = None
+        self.layout["feed"].update(_panel_feed(None))
+
+    def update(
+        self,
+        message: str | None = None,
+        mission_code: str | None = None,
+        status: RenderableType | None = None,
+    ) -> None:
+        """Remplace uniquement les panneaux dont le contenu a changé."""
+        if message is not None and message != self._message:
+            self._message = message
+            self.layout["voice"].update(
+                Panel(message, title="INTERFACE VOCALE", border_style="bright_red")
+            )
+        if mission_code is not None and mission_code != self._mission_code:
+            self._mission_code = mission_code
+            syntax = _RenduMemorise(Syntax(mission_code, "python", line_numbers=True))
+            self.layout["right"].update(Panel(syntax, title="NOYAU PYTHON", border_style="red"))
+        if status is not None and status != self._status:
+            self._status = status
+            self.layout["footer"].update(Panel(status, title="STATUT", border_style="red"))
+
+    def update_feed(self, snapshot: FeedSnapshot) -> None:
+        """Redessine le panneau HAL brain seulement si le flux a changé."""
+        if snapshot.version != self._feed_version:
+            self._feed_version = snapshot.version
+            self.layout["feed"].update(_panel_feed(snapshot))
 
 
 def _call_groq(client: groq.Groq, mission_code: str, user_input: str) -> str:
     """Appelle Groq pour générer une nouvelle version de mission_hal."""
-    response = client.chat.completions.create(
+    response = get_governor().complete(
+        client,
+        PRIORITY_BACKGROUND,
         model="llama3-70b-8192",
         messages=[
             {
@@ -151,86 +270,316 @@ def _replace_mission(source: str, new_code: str) -> str:
     return "\n".join(updated) + "\n"
 
 
-def _write_source(path: str, source: str) -> None:
-    """Écrit le nouveau source dans le fichier courant."""
-    with open(path, "w", encoding="utf-8") as handle:
-        handle.write(source)
-
+ANNULER = "/annuler"
+VIDER = "/vider"
+QUITTER = "/quitter"
+
+
+@dataclass
+class Mutation:
+    """Ordre de mutation suivi par le worker."""
+
+    ordre: str
+    annulee: threading.Event = field(default_factory=threading.Event)
+    debut: float | None = None
+
+
+class MutationWorker:
+    """Traite les ordres de mutation un par un, dans l'ordre, dans un thread de fond."""
+
+    def __init__(self, traiter: Callable[[Mutation], str]) -> None:
+        self._traiter = traiter
+        self._file: deque[Mutation] = deque()
+        self._condition = threading.Condition()
+        self._arret = False
+        self.en_cours: Mutation | None = None
+        self.dernier_statut = "Prêt pour le prochain ordre."
+        self._thread = threading.Thread(target=self._boucle, name="mutation", daemon=True)
+        self._thread.start()
+
+    def soumettre(self, ordre: str) -> None:
+        """Ajoute un ordre à la file."""
+        with self._condition:
+            self._file.append(Mutation(ordre))
+            self._condition.notify()
+
+    def annuler(self) -> bool:
+        """Annule la mutation en cours ; son résultat sera ignoré."""
+        mutation = self.en_cours
+        if mutation is None:
+            return False
+        mutation.annulee.set()
+        return True
+
+    def vider(self) -> int:
+        """Retire les ordres en attente et retourne leur nombre."""
+        with self._condition:
+            retires = len(self._file)
+            self._file.clear()
+        if retires:
+            self.dernier_statut = f"{retires} ordre(s) retiré(s) de la file."
+        return retires
+
+    def en_attente(self) -> list[str]:
+        with self._condition:
+            return [mutation.ordre for mutation in self._file]
+
+    def arreter(self, timeout: float = 1.0) -> None:
+        """Arrête le worker après avoir annulé la mutation en cours."""
+        with self._condition:
+            self._arret = True
+            self._file.clear()
+            self._condition.notify()
+        self.annuler()
+        self._thread.join(timeout)
+
+    def _boucle(self) -> None:
+        while True:
+            with self._condition:
+                while not self._file and not self._arret:
+                    self._condition.wait()
+                if self._arret:
+                    return
+                mutation = self._file.popleft()
+                mutation.debut = time.monotonic()
+                self.en_cours = mutation
+            try:
+                statut = self._traiter(mutation)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Mutation failed: %s", exc)
+                statut = f"[bold red]Mutation échouée[/]: {escape(str(exc))}"
+            with self._condition:
+                self.en_cours = None
+                self.dernier_statut = statut
+
+
+class LecteurClavier:
+    """Lit le clavier dans un thread pour que l'affichage ne bloque jamais.
+
+    Sur un terminal, les touches sont lues une à une (mode cbreak) et la
+    saisie en cours est exposée dans ``saisie`` pour être affichée ; Entrée
+    publie la ligne dans ``lignes``, Échap publie :data:`ANNULER` et Ctrl-D
+    :data:`QUITTER`. Hors terminal, l'entrée est lue ligne par ligne.
+    """
+
+    def __init__(self, entree: IO[str] | None = None) -> None:
+        self.entree = entree or sys.stdin
+        self.saisie = ""
+        self.lignes: queue.Queue[str] = queue.Queue()
+        self._arret = threading.Event()
+        self._decodeur = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self._terminal: list | None = None
+
+    def __enter__(self) -> LecteurClavier:
+        cible = self._lire_lignes
+        if termios is not None and self.entree.isatty():
+            fd = self.entree.fileno()
+            self._terminal = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+            cible = self._lire_touches
+        threading.Thread(target=cible, name="clavier", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._arret.set()
+        if self._terminal is not None:
+            termios.tcsetattr(self.entree.fileno(), termios.TCSADRAIN, self._terminal)
+            self._terminal = None
+
+    def touches(self, donnees: str) -> None:
+        """Applique des touches reçues à la saisie en cours."""
+        if donnees.startswith("\x1b"):
+            # Échap seul annule ; les séquences (flèches, etc.) sont ignorées.
+            if donnees == "\x1b":
+                self.lignes.put(ANNULER)
+            return
+        for caractere in donnees:
+            if caractere in "\r\n":
+                self.lignes.put(self.saisie)
+                self.saisie = ""
+            elif caractere in "\x7f\x08":
+                self.saisie = self.saisie[:-1]
+            elif caractere == "\x04":
+                self.lignes.put(QUITTER)
+            elif caractere.isprintable():
+                self.saisie += caractere
+
+    def _lire_touches(self) -> None:
+        fd = self.entree.fileno()
+        while not self._arret.is_set():
+            prets, _, _ = select.select([fd], [], [], 0.1)
+            if not prets:
+                continue
+            octets = os.read(fd, 64)
+            if not octets:
+                self.lignes.put(QUITTER)
+                return
+            self.touches(self._decodeur.decode(octets))
+
+    def _lire_lignes(self) -> None:
+        for ligne in self.entree:
+            self.lignes.put(ligne.rstrip("\n"))
+        self.lignes.put(QUITTER)
+
+
+class _StatutMutation:
+    """Pied de page rendu à chaque image : mutation en cours, file et saisie."""
+
+    def __init__(self, worker: MutationWorker, clavier: LecteurClavier) -> None:
+        self.worker = worker
+        self.clavier = clavier
+        self.spinner = Spinner("dots", style="red")
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        mutation = self.worker.en_cours
+        if mutation is not None and mutation.debut is not None:
+            ecoule = time.monotonic() - mutation.debut
+            etat = "annulation..." if mutation.annulee.is_set() else "Échap pour annuler"
+            self.spinner.update(
+                text=Text(f"Mutation « {mutation.ordre} » — {ecoule:.1f} s ({etat})")
+            )
+            ligne_etat: RenderableType = self.spinner
+        else:
+            ligne_etat = Text.from_markup(self.worker.dernier_statut)
+        attente = len(self.worker.en_attente())
+        file = Text(
+            f"{attente} ordre(s) en attente — {VIDER} pour vider, {QUITTER} pour quitter",
+            style="dim",
+        )
+        yield Group(ligne_etat, file, Text(f"> {self.clavier.saisie}▌", style="bold"))
+
+
+class DashboardSession:
+    """Mission courante du tableau de bord, mutée par le worker en arrière-plan."""
+
+    def __init__(self, settings, client: groq.Groq | None) -> None:
+        self.client = client
+        self.cycle = settings.hal_cycle
+        self.swapper = HotSwapper(sys.modules[__name__], "mission_hal")
+        self.source = Path(__file__).read_text(encoding="utf-8")
+        self.lineage = LineageStore.from_settings(settings, "hal_dashboard")
+        self.lineage.record(self.source, Path(__file__), prompt="source au démarrage")
+        self.mission_code = _extract_mission(self.source)
+        self.message = mission_hal()
+        self.redemarrage: str | None = None
+        self.limites = SandboxLimits.from_settings(settings)
+        self._appels = ThreadPoolExecutor(max_workers=2, thread_name_prefix="groq")
+        self._sandbox: SandboxPool | None = None
+
+    def muter(self, mutation: Mutation) -> str:
+        """Génère, valide et installe une mutation ; retourne le statut à afficher."""
+        annulee = f"Mutation « {escape(mutation.ordre)} » annulée."
+        if self.redemarrage is not None:
+            return "Redémarrage en cours, ordre ignoré."
+        if not self.client:
+            return "[bold red]Connexion Perdue[/]"
+
+        appel = self._appels.submit(_call_groq, self.client, self.mission_code, mutation.ordre)
+        while not appel.done():
+            if mutation.annulee.wait(0.1):
+                return annulee
+        try:
+            new_mission = appel.result()
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Groq call failed: %s", exc)
+            return "[bold red]Connexion Perdue[/]"
+        if mutation.annulee.is_set():
+            return annulee
 
-def _backup_source(path: str, source: str) -> None:
-    """Sauvegarde le fichier source courant."""
-    with open(f"{path}.bak", "w", encoding="utf-8") as handle:
-        handle.write(source)
+        try:
+            _validate_mission(new_mission)
+            new_source = _replace_mission(self.source, new_mission)
+            ast.parse(new_source)
+            tree = ast.parse(new_mission)
+        except Exception as exc:  # noqa: BLE001
+            return f"[bold red]Mutation rejetée[/]: {escape(str(exc))}"
+
+        resultat = self._tester(new_mission)
+        if not resultat.ok:
+            return f"[bold red]Mutation rejetée[/]: {escape(resultat.error or '')}"
+        if mutation.annulee.is_set():
+            return annulee
+
+        self.lineage.record(new_source, Path(__file__), prompt=mutation.ordre)
+        if structural_change(tree, "mission_hal") is not None:
+            self.swapper.persist(new_source)
+            self.redemarrage = new_source
+            return "Redémarrage pour installer la mutation..."
+        swapped_at = time.perf_counter()
+        self.swapper.swap(tree, new_source)
+        self.source = new_source
+        self.mission_code = _extract_mission(new_source)
+        self.cycle += 1
+        self.message = mission_hal()
+        logger.info(
+            "Mission du cycle %s installée à chaud en %.1f ms.",
+            self.cycle,
+            (time.perf_counter() - swapped_at) * 1000,
+        )
+        return f"Mission du cycle {self.cycle} installée."
 
+    def _tester(self, code: str) -> CandidateResult:
+        """Exécute la mission candidate en sandbox avant toute installation."""
+        if self._sandbox is None:
+            self._sandbox = SandboxPool(1, self.limites, preload=(__name__,))
+        return self._sandbox.run((__name__, "mission_hal", code, None, 0))
 
-def _refresh_once(
-    layout: Layout,
-    message: str,
-    mission_code: str,
-    status: str,
-) -> None:
-    """Rafraîchit le dashboard une fois."""
-    _update_panels(layout, message, mission_code, status)
-    with Live(layout, refresh_per_second=4, console=console):
-        time.sleep(0.2)
+    def close(self) -> None:
+        """Abandonne les appels Groq en cours et attend l'écriture du code muté."""
+        self._appels.shutdown(wait=False, cancel_futures=True)
+        if self._sandbox is not None:
+            self._sandbox.close()
+        if not self.swapper.writer.flush(timeout=5.0):
+            logger.warning("Écriture de la mutation sur disque non terminée.")
 
 
 def run_dashboard() -> None:
-    """Boucle principale d'affichage et mutation de HAL."""
+    """Boucle principale d'affichage ; les mutations tournent en arrière-plan."""
     settings = get_settings()
     client: groq.Groq | None = None
     if settings.groq_api_key:
-        client = groq.Groq(api_key=settings.groq_api_key)
-
-    cycle = settings.hal_cycle
-    status = "Prêt pour le prochain cycle."
-
-    while True:
-        source_path = __file__
-        source = Path(source_path).read_text(encoding="utf-8")
-        mission_code = _extract_mission(source)
-        message = mission_hal()
-
-        status = "Ordre pour le prochain cycle ?"
-        layout = generate_dashboard()
-        _refresh_once(layout, message, mission_code, status)
-
-        user_input = console.input("Ordre pour le prochain cycle ? ")
-        status = "Mutation en cours..."
-        layout = generate_dashboard()
-        _refresh_once(layout, message, mission_code, status)
-
-        if not client:
-            status = "[bold red]Connexion Perdue[/]"
-            layout = generate_dashboard()
-            _refresh_once(layout, message, mission_code, status)
-            continue
-
-        try:
-            new_mission = _call_groq(client, mission_code, user_input)
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Groq call failed: %s", exc)
-            status = "[bold red]Connexion Perdue[/]"
-            layout = generate_dashboard()
-            _refresh_once(layout, message, mission_code, status)
-            continue
+        client = groq.Groq(api_key=settings.groq_api_key, max_retries=0)
 
-        try:
-            _validate_mission(new_mission)
-            new_source = _replace_mission(source, new_mission)
-            ast.parse(new_source)
-        except Exception as exc:  # noqa: BLE001
-            status = f"[bold red]Mutation rejetée[/]: {exc}"
-            layout = generate_dashboard()
-            _refresh_once(layout, message, mission_code, status)
-            continue
-
-        _backup_source(source_path, source)
-        _write_source(source_path, new_source)
-        os.environ["HAL_CYCLE"] = str(cycle + 1)
+    session = DashboardSession(settings, client)
+    worker = MutationWorker(session.muter)
+    feed = BrainFeed.from_settings(settings)
+    fps = max(settings.hal_dashboard_fps, 0.1)
+    view = DashboardView()
+    try:
+        with (
+            LecteurClavier() as clavier,
+            Live(view.layout, console=console, refresh_per_second=fps),
+        ):
+            view.update(status=_StatutMutation(worker, clavier))
+            if feed is not None:
+                view.update_feed(feed.start().snapshot())
+            while session.redemarrage is None:
+                view.update(session.message, session.mission_code)
+                if feed is not None:
+                    view.update_feed(feed.snapshot())
+                try:
+                    commande = clavier.lignes.get(timeout=1 / fps).strip()
+                except queue.Empty:
+                    continue
+                if commande == QUITTER:
+                    break
+                if commande == ANNULER:
+                    worker.annuler()
+                elif commande == VIDER:
+                    worker.vider()
+                elif commande:
+                    worker.soumettre(commande)
+    finally:
+        worker.arreter()
+        session.close()
+        if feed is not None:
+            feed.stop()
+
+    if session.redemarrage is not None:
+        os.environ["HAL_CYCLE"] = str(session.cycle + 1)
         os.execv(
             settings.python_executable,
-            [settings.python_executable, source_path],
+            [settings.python_executable, __file__],
         )
 
 
@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import logging
-
-from .settings import get_settings
+import os
 
 
 def configure_logging() -> None:
-    """Configure root logging with env-driven level."""
+    """Configure root logging with env-driven level.
+
+    The level is read from ``LOG_LEVEL`` (environment or ``.env``) without
+    building the pydantic settings, which keeps CLI start-up cheap.
+    """
+
+    from dotenv import load_dotenv
 
-    settings = get_settings()
-    level = getattr(logging, settings.log_level.upper(), logging.INFO)
+    load_dotenv()
+    level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
     logging.basicConfig(
         level=level,
         format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
@@ -6,24 +6,37 @@ import ast
 import logging
 import os
 import sys
-import traceback
+import time
 from pathlib import Path
 
 import groq
 
+from .evolution import FitnessHarness, FitnessHistory
+from .evolution.hotswap import HotSwapper, structural_change
+from .evolution.lineage import LineageStore
+from .evolution.sandbox import CandidateResult
+from .evolution.tournament import Candidate, Tournament, Variant
+from .services.governor import PRIORITY_BACKGROUND, get_governor
 from .settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+#: Pistes variées d'un candidat à l'autre pour élargir l'exploration.
+PISTES = (
+    "Privilégie la vitesse d'exécution.",
+    "Réduis les allocations mémoire.",
+    "Supprime tout calcul ou appel superflu.",
+    "Garde la même logique avec des opérations moins coûteuses.",
+)
 
-def verifier_syntaxe(code_source: str) -> bool:
-    """Retourne True si le code fourni est syntaxiquement valide."""
+
+def verifier_syntaxe(code_source: str) -> ast.Module | None:
+    """Retourne l'AST du code fourni, ou None s'il est syntaxiquement invalide."""
     try:
-        ast.parse(code_source)
+        return ast.parse(code_source)
     except SyntaxError as exc:
         logger.error("Erreur de syntaxe détectée: %s", exc)
-        return False
-    return True
+        return None
 
 
 def noyau_vital() -> int:
@@ -42,33 +55,51 @@ class MoteurEvolution:
         self.api_key = settings.groq_api_key
         if not self.api_key:
             raise RuntimeError("GROQ_API_KEY manquant dans l'environnement.")
-        self.client = groq.Groq(api_key=self.api_key)
+        self.client = groq.Groq(api_key=self.api_key, max_retries=0)
+        self.governor = get_governor()
+        self.harness = FitnessHarness.from_settings(settings)
+        self.historique = FitnessHistory.from_settings(settings)
+        self.tournoi = Tournament.from_settings(settings)
+        self.swapper = HotSwapper(sys.modules[__name__], "noyau_vital")
+        self.source = self._lire_source()
+        self.arbre = ast.parse(self.source)
+        self.lignee = LineageStore.from_settings(settings, "ouroboros")
+        self.lignee.record(self.source, Path(__file__), prompt="source au démarrage")
+        self._derniere_generation = time.perf_counter()
 
     def _lire_source(self) -> str:
         """Lit le code source actuel du script."""
         return Path(__file__).read_text(encoding="utf-8")
 
-    def _extraire_noyau(self, source: str) -> str:
-        """Extrait la définition de la fonction noyau dans le code source."""
-        tree = ast.parse(source)
-        for node in tree.body:
+    def _localiser_noyau(self) -> ast.FunctionDef:
+        """Retrouve le nœud de noyau_vital dans l'AST du source courant."""
+        for node in self.arbre.body:
             if isinstance(node, ast.FunctionDef) and node.name == "noyau_vital":
-                segment = ast.get_source_segment(source, node)
-                if segment:
-                    return segment
+                return node
         raise RuntimeError("Impossible de trouver noyau_vital dans le source.")
 
-    def _appeler_modele(self, code_noyau: str) -> str:
+    def _extraire_noyau(self, source: str) -> Candidate:
+        """Extrait la fonction noyau du source, sans le réanalyser."""
+        node = self._localiser_noyau()
+        segment = ast.get_source_segment(source, node)
+        if not segment:
+            raise RuntimeError("Impossible de trouver noyau_vital dans le source.")
+        return Candidate(segment, ast.Module(body=[node], type_ignores=[]))
+
+    def _appeler_modele(self, code_noyau: str, variante: Variant) -> str:
         """Demande au modèle de proposer une version améliorée du noyau."""
-        response = self.client.chat.completions.create(
+        response = self.governor.complete(
+            self.client,
+            PRIORITY_BACKGROUND,
             model="llama3-70b-8192",
+            temperature=variante.temperature,
             messages=[
                 {
                     "role": "system",
                     "content": (
                         "Tu es un moteur d'évolution. Réécris cette fonction Python pour la "
                         "rendre plus complexe, optimisée ou créative. Renvoie UNIQUEMENT le "
-                        "code Python valide."
+                        f"code Python valide. {variante.hint}"
                     ),
                 },
                 {"role": "user", "content": code_noyau},
@@ -79,75 +110,101 @@ class MoteurEvolution:
             raise RuntimeError("Réponse vide du modèle.")
         return contenu.strip()
 
-    def _valider_fonction(self, code: str) -> None:
-        """Valide que le code reçu contient une fonction Python correcte."""
+    def _valider_fonction(self, code: str) -> Candidate:
+        """Analyse une seule fois le code reçu et vérifie qu'il définit une fonction."""
         try:
-            parsed = ast.parse(code)
+            candidat = Candidate.parse(code)
         except SyntaxError as exc:
             raise RuntimeError(f"Code généré invalide: {exc}") from exc
-        if not parsed.body or not isinstance(parsed.body[0], ast.FunctionDef):
+        if not candidat.tree.body or not isinstance(candidat.tree.body[0], ast.FunctionDef):
             raise RuntimeError("Le code généré ne contient pas une fonction valide.")
-
-    def _tester_sandbox(self, code: str) -> bool:
-        """Teste le code généré en exécutant la fonction dans un scope isolé."""
-        logger.info("Test de la mutation en sandbox.")
-        try:
-            ast.parse(code)
-            sandbox_globals = globals().copy()
-            local_scope: dict[str, object] = {}
-            exec(code, sandbox_globals, local_scope)
-            fonction = local_scope.get("noyau_vital") or sandbox_globals.get("noyau_vital")
-            if not callable(fonction):
-                logger.error("La fonction noyau_vital est absente ou invalide.")
-                return False
-            resultat = fonction()
-            logger.info("Résultat du test sandbox: %s", resultat)
-        except Exception:  # noqa: BLE001
-            logger.error("Erreur critique lors du test sandbox.")
-            traceback.print_exc()
-            return False
-        return True
-
-    def _sauvegarder_backup(self, source: str) -> None:
-        """Enregistre une sauvegarde du code source original."""
-        Path(f"{__file__}.bak").write_text(source, encoding="utf-8")
+        if candidat.tree.body[0].name != "noyau_vital":
+            raise RuntimeError("La fonction générée n'est pas noyau_vital.")
+        return candidat
+
+    def _tester_sandbox(
+        self, candidats: list[Candidate], noyau: Candidate
+    ) -> list[CandidateResult]:
+        """Teste et chronomètre les candidats en parallèle dans des processus isolés."""
+        logger.info("Test de %s mutation(s) en sandbox.", len(candidats))
+        resultats = self.tournoi.evaluate(
+            __name__, "noyau_vital", candidats, self.harness, baseline=noyau
+        )
+        generation = self.historique.generation()
+        for resultat in resultats:
+            if resultat.cached:
+                logger.info("Candidat %s déjà évalué, résultat réutilisé.", resultat.index)
+                continue
+            if resultat.verdict is None:
+                logger.error("Candidat %s en échec : %s", resultat.index, resultat.error)
+                continue
+            verdict = resultat.verdict
+            self.historique.record(generation, verdict, candidat=resultat.index)
+            logger.info(
+                "Candidat %s : %s (x%.2f, p=%.3f).",
+                resultat.index,
+                verdict.reason,
+                verdict.speedup,
+                verdict.p_value,
+            )
+        return resultats
 
     def _remplacer_noyau(self, source: str, nouveau_code: str) -> str:
         """Remplace la fonction noyau par la version générée."""
-        tree = ast.parse(source)
-        debut = None
-        fin = None
-        for node in tree.body:
-            if isinstance(node, ast.FunctionDef) and node.name == "noyau_vital":
-                debut = node.lineno
-                fin = node.end_lineno
-                break
-        if debut is None or fin is None:
-            raise RuntimeError("noyau_vital introuvable pour remplacement.")
+        node = self._localiser_noyau()
+        debut = node.lineno
+        fin = node.end_lineno
         lignes = source.splitlines()
         remplacement = nouveau_code.splitlines()
         nouveau_source = lignes[: debut - 1] + remplacement + lignes[fin:]
         return "\n".join(nouveau_source) + "\n"
 
-    def _ecrire_source(self, source: str) -> None:
-        """Écrit le code source mis à jour dans le fichier actuel."""
-        Path(__file__).write_text(source, encoding="utf-8")
+    def _installer(self, gagnant: Candidate, nouveau_source: str, arbre: ast.Module) -> bool:
+        """Installe le noyau à chaud, ou relance le script si sa structure change."""
+        raison = structural_change(gagnant.tree, "noyau_vital")
+        if raison is not None:
+            logger.info("Redémarrage nécessaire : %s.", raison)
+            self.swapper.persist(nouveau_source)
+            self.tournoi.close()
+            os.execv(sys.executable, [sys.executable, __file__])
+        self.swapper.swap(gagnant.tree, nouveau_source)
+        self.source = nouveau_source
+        self.arbre = arbre
+        maintenant = time.perf_counter()
+        logger.info(
+            "Génération %s installée à chaud (%.0f ms depuis la précédente).",
+            self.swapper.swaps,
+            (maintenant - self._derniere_generation) * 1000,
+        )
+        self._derniere_generation = maintenant
+        return True
 
     def evoluer(self) -> bool:
-        """Lance un cycle complet d'évolution et relance le script si succès."""
-        source = self._lire_source()
+        """Lance un cycle complet d'évolution et installe le vainqueur si succès."""
+        source = self.source
         noyau = self._extraire_noyau(source)
-        nouveau_noyau = self._appeler_modele(noyau)
-        self._valider_fonction(nouveau_noyau)
-        if self._tester_sandbox(nouveau_noyau):
-            nouveau_source = self._remplacer_noyau(source, nouveau_noyau)
-        else:
+        candidats = []
+        for code in self.tournoi.generate(lambda v: self._appeler_modele(noyau.code, v), PISTES):
+            try:
+                candidats.append(self._valider_fonction(code))
+            except RuntimeError as exc:
+                logger.error("Candidat écarté : %s", exc)
+        resultats = self._tester_sandbox(candidats, noyau)
+        if not any(resultat.ok for resultat in resultats):
             logger.error("MUTATION REJETÉE : Erreur détectée en sandbox.")
             return False
-        if verifier_syntaxe(nouveau_source):
-            self._sauvegarder_backup(source)
-            self._ecrire_source(nouveau_source)
-            os.execv(sys.executable, [sys.executable, __file__])
+        gagnant = self.tournoi.select(
+            (r for r in resultats if r.verdict is not None and r.verdict.accepted),
+            key=lambda r: r.verdict.score,
+        )
+        if gagnant is None:
+            logger.error("MUTATION REJETÉE : Aucun gain de performance mesurable.")
+            return False
+        nouveau_source = self._remplacer_noyau(source, gagnant.code)
+        arbre = verifier_syntaxe(nouveau_source)
+        if arbre is not None:
+            self.lignee.record(nouveau_source, Path(__file__), fitness=gagnant.verdict.to_record())
+            return self._installer(candidats[gagnant.index], nouveau_source, arbre)
         logger.error("MUTATION REJETÉE : Le code reçu est corrompu.")
         return False
 
@@ -155,7 +212,12 @@ class MoteurEvolution:
 def main() -> None:
     """Point d'entrée principal pour Ouroboros."""
     moteur = MoteurEvolution()
-    moteur.evoluer()
+    try:
+        while moteur.evoluer():
+            pass
+    finally:
+        moteur.tournoi.close()
+        moteur.swapper.writer.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+"""Follow a running HAL brain through its ``/api/feed`` server-sent events."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+PROFIT_KEYS = ("profit_all_coin", "profit_total", "profit_abs", "profit_all", "profit")
+
+
+def sparkline(values: Sequence[float], width: int) -> str:
+    """Render the last ``width`` values as unicode blocks scaled to their range."""
+    values = list(values)[-width:] if width > 0 else []
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    if high == low:
+        return SPARK_BLOCKS[len(SPARK_BLOCKS) // 2] * len(values)
+    scale = (len(SPARK_BLOCKS) - 1) / (high - low)
+    return "".join(SPARK_BLOCKS[round((value - low) * scale)] for value in values)
+
+
+def profit_value(values: dict) -> float | None:
+    """First numeric headline profit field of a projected payload."""
+    for key in PROFIT_KEYS:
+        value = values.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    return None
+
+
+def iter_sse(lines: Iterable[str]) -> Iterator[dict]:
+    """Decode ``data:`` events from SSE lines, skipping comments and bad JSON."""
+    data: list[str] = []
+    for line in lines:
+        if line.startswith("data:"):
+            data.append(line[5:].lstrip())
+        elif not line and data:
+            try:
+                event = json.loads("\n".join(data))
+            except ValueError:
+                event = None
+            data = []
+            if isinstance(event, dict):
+                yield event
+
+
+@dataclass(frozen=True)
+class FeedSnapshot:
+    """What the dashboard renders; ``version`` changes whenever anything does."""
+
+    version: int = 0
+    connected: bool = False
+    error: str | None = None
+    profit: dict = field(default_factory=dict)
+    thought: dict = field(default_factory=dict)
+    health: dict = field(default_factory=dict)
+    stream: dict = field(default_factory=dict)
+    profit_history: tuple[float, ...] = ()
+    thoughts: tuple[str, ...] = ()
+
+
+class BrainFeed:
+    """Keep a local copy of a HAL brain's state, updated by its event stream.
+
+    A daemon thread holds one streaming request to ``/api/feed`` and merges
+    each event's changed sections; profit values and thoughts are kept in
+    short histories for sparklines. The connection is retried with backoff
+    while the brain is unreachable.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        history: int = 60,
+        thoughts: int = 5,
+        session: requests.Session | None = None,
+        reconnect_s: float = 2.0,
+        max_reconnect_s: float = 30.0,
+    ) -> None:
+        self.url = base_url.rstrip("/") + "/api/feed"
+        self.session = session or requests.Session()
+        self.reconnect_s = reconnect_s
+        self.max_reconnect_s = max_reconnect_s
+        self._sections: dict[str, dict] = {}
+        self._profit_history: deque[float] = deque(maxlen=history)
+        self._thoughts: deque[str] = deque(maxlen=thoughts)
+        self._version = 0
+        self._connected = False
+        self._error: str | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_settings(cls, settings) -> BrainFeed | None:
+        url = settings.hal_dashboard_brain_url
+        return cls(url) if url else None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def start(self) -> BrainFeed:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="brain-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Ask the (daemon) thread to exit at the next event or keep-alive."""
+        self._stop.set()
+
+    def apply(self, event: dict) -> None:
+        """Merge one feed event into the local state."""
+        sections = event.get("sections") or {}
+        with self._lock:
+            for name, payload in sections.items():
+                if not isinstance(payload, dict):
+                    continue
+                self._sections[name] = payload
+                if name == "profit":
+                    value = profit_value(payload.get("values") or {})
+                    if value is not None:
+                        self._profit_history.append(value)
+                elif name == "thought":
+                    text = (payload.get("text") or "").strip()
+                    if text and (not self._thoughts or self._thoughts[-1] != text):
+                        self._thoughts.append(text)
+            self._version += 1
+
+    def snapshot(self) -> FeedSnapshot:
+        with self._lock:
+            return FeedSnapshot(
+                version=self._version,
+                connected=self._connected,
+                error=self._error,
+                profit=self._sections.get("profit", {}),
+                thought=self._sections.get("thought", {}),
+                health=self._sections.get("health", {}),
+                stream=self._sections.get("stream", {}),
+                profit_history=tuple(self._profit_history),
+                thoughts=tuple(self._thoughts),
+            )
+
+    def _set_connection(self, connected: bool, error: str | None) -> None:
+        with self._lock:
+            if (connected, error) != (self._connected, self._error):
+                self._connected, self._error = connected, error
+                self._version += 1
+
+    def _run(self) -> None:
+        delay = self.reconnect_s
+        while not self._stop.is_set():
+            try:
+                with self.session.get(self.url, stream=True, timeout=(3.05, 30)) as response:
+                    response.raise_for_status()
+                    response.encoding = response.encoding or "utf-8"
+                    self._set_connection(True, None)
+                    delay = self.reconnect_s
+                    for event in iter_sse(response.iter_lines(decode_unicode=True)):
+                        self.apply(event)
+                        if self._stop.is_set():
+                            break
+            except (requests.RequestException, ValueError) as exc:
+                if self._stop.is_set():
+                    break
+                logger.debug("HAL brain feed unavailable: %s", exc)
+                self._set_connection(False, f"HAL brain injoignable ({self.url}) : {exc}")
+            if not self._stop.is_set():
+                self._set_connection(False, self._error or "Flux HAL brain interrompu.")
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_s)
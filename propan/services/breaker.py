@@ -0,0 +1,119 @@
+"""Circuit breakers failing fast while a dependency is down."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Classic closed / open / half-open breaker with exponential probe backoff.
+
+    ``failure_threshold`` consecutive failures open the circuit. While open,
+    :meth:`allow` refuses calls until ``reset_timeout`` has elapsed, then
+    lets a single probe through (half-open). A successful probe closes the
+    circuit; a failed one re-opens it with twice the previous delay, capped
+    at ``max_reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 15.0,
+        max_reset_timeout: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max(max_reset_timeout, reset_timeout)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._delay = reset_timeout
+        self._opened_at = 0.0
+        self._probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls, name: str, settings) -> CircuitBreaker:
+        return cls(
+            name,
+            failure_threshold=settings.hal_breaker_threshold,
+            reset_timeout=settings.hal_breaker_reset,
+            max_reset_timeout=settings.hal_breaker_reset_max,
+        )
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may go out now."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self._delay:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._delay = self.reset_timeout
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN:
+                self._delay = min(self._delay * 2, self.max_reset_timeout)
+                self._open()
+            elif self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def release(self) -> None:
+        """Give back a half-open probe slot when the call never reached the dependency."""
+        with self._lock:
+            self._probing = False
+
+    def retry_in(self) -> float:
+        """Seconds before the next probe is allowed (0 when closed)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self._opened_at + self._delay - self._clock(), 0.0)
+
+    def open_message(self, label: str) -> str:
+        return f"{label} indisponible : circuit ouvert, nouvel essai dans {self.retry_in():.0f} s."
+
+    def stats(self) -> dict:
+        retry_in = self.retry_in()
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "retry_in_s": round(retry_in, 1),
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probing = False
+        self.trips += 1
@@ -1,17 +1,31 @@
-"""Service for generating Groq commentary."""
+"""Service for generating HAL commentary through an LLM provider."""
 
 from __future__ import annotations
 
 import logging
+import re
+from collections.abc import Callable
 from dataclasses import dataclass
-from time import monotonic
-
-from groq import Groq
+from time import monotonic, perf_counter
 
 from ..settings import Settings
+from .breaker import CLOSED, CircuitBreaker
+from .commentary_cache import CommentaryCache, profit_fingerprint
+from .governor import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMENTARY,
+    GroqGovernor,
+    RateLimitShedError,
+    estimate_request_tokens,
+)
+from .llm import LLMProvider, OfflineProvider, create_provider
+from .model_tiers import ModelRouter, ModelTier
+from .prompt import compact_stats, estimate_tokens, parse_fields
 
 logger = logging.getLogger(__name__)
 
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
 
 @dataclass
 class CommentaryResult:
@@ -20,47 +34,301 @@ class CommentaryResult:
     status: str
     text: str
     error: str | None = None
+    ttft_ms: float | None = None
+    cached: bool = False
+    prompt_tokens: int | None = None
+    model: str | None = None
+    provider: str | None = None
+
+
+class SentenceSplitter:
+    """Accumulate streamed text and emit sentences as soon as they end."""
+
+    def __init__(self) -> None:
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list[str]:
+        """Add a text delta, returning the sentences it completed."""
+        self._buffer += delta
+        parts = _SENTENCE_END.split(self._buffer)
+        self._buffer = parts.pop()
+        return [part.strip() for part in parts if part.strip()]
+
+    def flush(self) -> str | None:
+        """Return whatever text is left once the stream is over."""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return remainder or None
 
 
 class CommentaryService:
-    """Generate commentary using Groq."""
+    """Generate commentary using the configured LLM provider (Groq by default)."""
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        cache: CommentaryCache | None = None,
+        governor: GroqGovernor | None = None,
+        provider: LLMProvider | None = None,
+    ) -> None:
         self._settings = settings
         self._last_error: str | None = None
         self._last_error_logged_at: float = 0.0
+        self.cache = cache or CommentaryCache.from_settings(settings)
+        self.governor = governor or GroqGovernor.from_settings(settings)
+        self.provider = provider or create_provider(settings, self.governor)
+        self.offline = OfflineProvider() if settings.hal_llm_offline_fallback else None
+        self.router = ModelRouter.from_settings(settings, self.provider.name)
+        self.breaker = CircuitBreaker.from_settings(self.provider.name, settings)
+        self._prompt_fields = parse_fields(settings.hal_prompt_fields)
+
+    def generate(
+        self,
+        profit_data: dict,
+        on_delta: Callable[[str], None] | None = None,
+        on_sentence: Callable[[str], None] | None = None,
+    ) -> CommentaryResult:
+        """Generate a commentary string for the latest profit data.
+
+        With ``HAL_STREAM_COMMENTARY`` enabled the completion is streamed:
+        ``on_delta`` receives every text fragment and ``on_sentence`` every
+        finished sentence, before the full answer is known.
+
+        Models from ``GROQ_MODELS`` (or ``HAL_LLM_MODELS`` for the
+        OpenAI-compatible provider) are tried in tier order: a tier that
+        errors or exceeds its timeout hands over to the next one, and tiers
+        whose rolling latency breaks their budget are skipped up front.
 
-    def generate(self, profit_data: dict) -> CommentaryResult:
-        """Generate a commentary string for the latest profit data."""
-        if not self._settings.groq_api_key:
+        Payloads landing in an already commented profit regime are answered
+        from ``self.cache`` without any network call. With
+        ``HAL_LLM_OFFLINE_FALLBACK`` the offline generator speaks whenever
+        the provider cannot.
+        """
+        if not self.provider.available:
+            if self.offline is not None:
+                return self._offline(
+                    profit_data, self.provider.unavailable_reason, on_delta, on_sentence
+                )
             return CommentaryResult(
                 status="disabled",
-                text="Clé API Groq manquante. HAL reste silencieux.",
-                error="GROQ_API_KEY manquante.",
+                text=f"{self.provider.missing_text} HAL reste silencieux.",
+                error=self.provider.unavailable_reason,
+            )
+
+        cache_key = self._cache_key(profit_data)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self._replay(cached, on_delta, on_sentence)
+            return CommentaryResult(status="ok", text=cached, ttft_ms=0.0, cached=True)
+
+        if not self.breaker.allow():
+            error_message = self.breaker.open_message(self.provider.label)
+            if self.offline is not None:
+                return self._offline(profit_data, error_message, on_delta, on_sentence)
+            return CommentaryResult(
+                status="error",
+                text="HAL ne peut pas analyser les données pour l'instant.",
+                error=error_message,
             )
 
         prompt = self._build_prompt(profit_data)
-        client = Groq(api_key=self._settings.groq_api_key)
+        prompt_tokens = estimate_tokens(prompt)
+        logger.info("LLM prompt: ~%d tokens (%d chars)", prompt_tokens, len(prompt))
+        streamed = False
+
+        def forward(delta: str) -> None:
+            nonlocal streamed
+            streamed = True
+            if on_delta:
+                on_delta(delta)
 
         try:
-            completion = client.chat.completions.create(
-                model="llama3-70b-8192",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
+            content, ttft_ms, model = self._run_tiers(
+                prompt,
+                PRIORITY_COMMENTARY,
+                self._settings.hal_stream_commentary,
+                forward,
+                on_sentence,
             )
-            content = completion.choices[0].message.content.strip()
-            if not content:
-                raise RuntimeError("Réponse Groq vide.")
-            return CommentaryResult(status="ok", text=content)
         except Exception as exc:  # noqa: BLE001
+            if isinstance(exc, RateLimitShedError):
+                self.breaker.release()  # shed locally, the provider was never contacted
+            else:
+                self.breaker.record_failure()
             error_message = self._format_error(exc)
             self._log_once(error_message)
+            if self.offline is not None and not streamed:
+                return self._offline(profit_data, error_message, on_delta, on_sentence)
             return CommentaryResult(
                 status="error",
                 text="HAL ne peut pas analyser les données pour l'instant.",
                 error=error_message,
             )
 
+        self.breaker.record_success()
+        self.cache.put(cache_key, content)
+        return CommentaryResult(
+            status="ok",
+            text=content,
+            ttft_ms=round(ttft_ms, 1),
+            prompt_tokens=prompt_tokens,
+            model=model,
+            provider=self.provider.name,
+        )
+
+    def needs_variants(self, profit_data: dict) -> bool:
+        """True while the cache cannot yet answer for this profit regime."""
+        return self.cache.missing(self._cache_key(profit_data)) > 0
+
+    def pregenerate(self, profit_data: dict) -> str | None:
+        """Generate a commentary into the cache only, at background priority.
+
+        Returns the new text, or ``None`` when nothing was generated (no key,
+        cache already full for this regime, breaker not closed, or failure).
+        """
+        if not self.provider.available or self.breaker.state != CLOSED:
+            return None
+        cache_key = self._cache_key(profit_data)
+        if not self.cache.missing(cache_key):
+            return None
+        try:
+            content, _, _ = self._run_tiers(
+                self._build_prompt(profit_data), PRIORITY_BACKGROUND, False, None, None
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Speculative commentary failed: %s", exc)
+            return None
+        self.cache.put(cache_key, content)
+        return content
+
+    def request_tokens(self, profit_data: dict) -> int:
+        """Tokens a commentary request for ``profit_data`` is expected to use."""
+        prompt = self._build_prompt(profit_data)
+        return estimate_request_tokens([{"role": "user", "content": prompt}])
+
+    def _cache_key(self, profit_data: dict) -> str:
+        return profit_fingerprint(profit_data, self._classify_profit(profit_data))
+
+    def _run_tiers(
+        self,
+        prompt: str,
+        priority: str,
+        stream: bool,
+        on_delta: Callable[[str], None] | None,
+        on_sentence: Callable[[str], None] | None,
+    ) -> tuple[str, float, str]:
+        """Try each model tier in turn; return ``(text, ttft_ms, model)``."""
+        error: Exception | None = None
+        for tier in self.router.plan():
+            emitted = False
+
+            def forward(delta: str) -> None:
+                nonlocal emitted
+                emitted = True
+                if on_delta:
+                    on_delta(delta)
+
+            started = perf_counter()
+            try:
+                if stream:
+                    content, ttft_ms = self._stream_completion(
+                        tier, prompt, priority, forward, on_sentence
+                    )
+                else:
+                    content, ttft_ms = self._complete(tier, prompt, priority)
+                if not content:
+                    raise RuntimeError(f"Réponse {self.provider.label} vide.")
+            except Exception as exc:  # noqa: BLE001
+                self.router.record(tier.name, perf_counter() - started, ok=False)
+                error = exc
+                # Text already shown (or no budget left): a retry would not help.
+                if emitted or isinstance(exc, RateLimitShedError):
+                    break
+                logger.warning("LLM model %s failed (%s), falling back.", tier.name, exc)
+                continue
+            self.router.record(tier.name, perf_counter() - started, ok=True)
+            return content, ttft_ms, tier.name
+        raise error
+
+    @staticmethod
+    def _replay(
+        text: str,
+        on_delta: Callable[[str], None] | None,
+        on_sentence: Callable[[str], None] | None,
+    ) -> None:
+        if on_delta:
+            on_delta(text)
+        if on_sentence:
+            splitter = SentenceSplitter()
+            for sentence in splitter.feed(text):
+                on_sentence(sentence)
+            tail = splitter.flush()
+            if tail:
+                on_sentence(tail)
+
+    def _complete(self, tier: ModelTier, prompt: str, priority: str) -> tuple[str, float]:
+        started = perf_counter()
+        content = self.provider.complete(tier.name, prompt, tier.timeout_s, priority)
+        return content, (perf_counter() - started) * 1000
+
+    def _offline(
+        self,
+        profit_data: dict,
+        error: str | None,
+        on_delta: Callable[[str], None] | None,
+        on_sentence: Callable[[str], None] | None,
+    ) -> CommentaryResult:
+        """Answer with the offline generator, keeping the provider error visible."""
+        text = self.offline.complete(self.offline.name, self._build_prompt(profit_data), 0)
+        self._replay(text, on_delta, on_sentence)
+        return CommentaryResult(
+            status="ok",
+            text=text,
+            error=error,
+            ttft_ms=0.0,
+            model=self.offline.name,
+            provider=self.offline.name,
+        )
+
+    def _stream_completion(
+        self,
+        tier: ModelTier,
+        prompt: str,
+        priority: str,
+        on_delta: Callable[[str], None] | None,
+        on_sentence: Callable[[str], None] | None,
+    ) -> tuple[str, float]:
+        started = perf_counter()
+        ttft_ms: float | None = None
+        parts: list[str] = []
+        splitter = SentenceSplitter()
+        # ``timeout_s`` only bounds each read: a trickling stream is cut at the tier budget.
+        deltas = self.provider.stream(tier.name, prompt, tier.timeout_s, priority)
+        try:
+            for delta in deltas:
+                elapsed = perf_counter() - started
+                if elapsed > tier.timeout_s:
+                    raise TimeoutError(
+                        f"Modèle {tier.name} : budget de {tier.timeout_s:g} s dépassé "
+                        f"({elapsed:.1f} s)."
+                    )
+                if ttft_ms is None:
+                    ttft_ms = elapsed * 1000
+                parts.append(delta)
+                if on_delta:
+                    on_delta(delta)
+                if on_sentence:
+                    for sentence in splitter.feed(delta):
+                        on_sentence(sentence)
+        finally:
+            deltas.close()
+        tail = splitter.flush()
+        if tail and on_sentence:
+            on_sentence(tail)
+        if ttft_ms is None:
+            ttft_ms = (perf_counter() - started) * 1000
+        return "".join(parts).strip(), ttft_ms
+
     def _build_prompt(self, profit_data: dict) -> str:
         mood = self._classify_profit(profit_data)
         return (
@@ -68,7 +336,7 @@ class CommentaryService:
             "Analyse les statistiques suivantes et réponds en 2 phrases en français. "
             "Si les profits sont négatifs, sois cynique et condescendant. "
             "Si les profits sont positifs, sois arrogant et supérieur."
-            f"\n\nStats: {profit_data}\n"
+            f"\n\nStats: {compact_stats(profit_data, self._prompt_fields)}\n"
             f"Mood: {mood}\n"
             "Réponse:"
         )
@@ -77,7 +345,14 @@ class CommentaryService:
     def _classify_profit(profit_data: dict) -> str:
         if not profit_data:
             return "unknown"
-        for key in ("profit_total", "profit_abs", "profit_all", "profit"):
+        for key in (
+            "profit_total",
+            "profit_abs",
+            "profit_all",
+            "profit",
+            "profit_all_coin",
+            "profit_closed_coin",
+        ):
             value = profit_data.get(key)
             if isinstance(value, (int, float)):
                 return "gain" if value >= 0 else "loss"
@@ -94,9 +369,10 @@ class CommentaryService:
             status_code = status_code or response.status_code
 
         message = str(exc)
+        label = self.provider.label
         if status_code == 401 or "401" in message:
-            return "Clé API Groq rejetée (401 Unauthorized)."
-        return f"Erreur Groq : {message}"
+            return f"Clé API {label} rejetée (401 Unauthorized)."
+        return f"Erreur {label} : {message}"
 
     def _log_once(self, message: str) -> None:
         now = monotonic()
@@ -0,0 +1,190 @@
+"""Bounded cache of HAL commentaries keyed by a quantised profit state."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Numeric fields that describe the profit regime, bucketed on a log scale.
+PROFIT_FIELDS = (
+    "profit_total",
+    "profit_abs",
+    "profit_all",
+    "profit",
+    "profit_all_coin",
+    "profit_all_percent",
+    "profit_closed_coin",
+    "profit_closed_percent",
+)
+# Counters kept exact: a new trade is worth a new comment.
+COUNT_FIELDS = ("trade_count", "closed_trade_count")
+
+
+def _bucket(value: float) -> int:
+    """Half-decade bucket, signed: 0.3 and 0.9 differ, 9.1 and 12.4 do not."""
+    if abs(value) < 0.01:
+        return 0
+    magnitude = round(math.log10(abs(value) * 100) * 2)
+    return magnitude if value > 0 else -magnitude
+
+
+def profit_fingerprint(profit_data: dict, mood: str) -> str:
+    """Return a stable key describing the profit regime of a payload."""
+    parts = [mood]
+    for name in PROFIT_FIELDS:
+        value = profit_data.get(name)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            parts.append(f"{name}:{_bucket(value)}")
+    for name in COUNT_FIELDS:
+        value = profit_data.get(name)
+        if isinstance(value, int) and not isinstance(value, bool):
+            parts.append(f"{name}:{value}")
+    return "|".join(parts)
+
+
+@dataclass
+class _Entry:
+    texts: list[str] = field(default_factory=list)
+    updated_at: float = 0.0
+    served: int = 0
+
+
+class CommentaryCache:
+    """LRU + TTL cache returning stored commentaries without calling Groq.
+
+    An entry is only served once it holds ``variants`` distinct texts, then
+    successive hits rotate through them. With ``path`` set the cache is
+    saved after every insertion and reloaded at start-up.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 64,
+        ttl_seconds: float = 600,
+        variants: int = 3,
+        path: Path | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.variants = max(variants, 1)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def from_settings(cls, settings) -> CommentaryCache:
+        path = settings.hal_commentary_cache_file
+        return cls(
+            max_entries=settings.hal_commentary_cache_size,
+            ttl_seconds=settings.hal_commentary_cache_ttl,
+            variants=settings.hal_commentary_cache_variants,
+            path=Path(path) if path else None,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: str) -> str | None:
+        """Return a cached commentary for ``key`` or ``None`` on a miss."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                entry = None
+            if entry is None or len(entry.texts) < self.variants:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            text = entry.texts[entry.served % len(entry.texts)]
+            entry.served += 1
+            self.hits += 1
+            return text
+
+    def missing(self, key: str) -> int:
+        """Number of variants still needed before ``key`` is served."""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                return self.variants
+            return max(self.variants - len(entry.texts), 0)
+
+    def put(self, key: str, text: str) -> None:
+        """Store a freshly generated commentary."""
+        if not self.enabled or not text:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                entry = _Entry()
+                self._entries[key] = entry
+            if text not in entry.texts:
+                entry.texts.append(text)
+                del entry.texts[: -self.variants]
+            entry.updated_at = time.time()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            snapshot = {name: asdict(item) for name, item in self._entries.items()}
+        self._save(snapshot)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _expired(self, entry: _Entry) -> bool:
+        return time.time() - entry.updated_at > self.ttl_seconds
+
+    def _load(self) -> None:
+        if not self.enabled or self.path is None or not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Commentary cache ignored (%s): %s", self.path, exc)
+            return
+        if not isinstance(raw, dict):
+            return
+        for key, item in raw.items():
+            try:
+                entry = _Entry(
+                    texts=[str(text) for text in item["texts"]][-self.variants :],
+                    updated_at=float(item["updated_at"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not self._expired(entry):
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self, snapshot: dict) -> None:
+        if self.path is None:
+            return
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            tmp.write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as exc:
+            logger.warning("Commentary cache not saved (%s): %s", self.path, exc)
@@ -0,0 +1,294 @@
+"""Batched, conditional polling of the Freqtrade REST API."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import monotonic
+
+import requests
+from requests.adapters import HTTPAdapter
+
+ENDPOINTS = ("profit", "status", "balance", "daily")
+
+
+def parse_cadences(raw: str) -> dict[str, float]:
+    """Parse ``"profit:0,status:0,daily:300"`` into refresh intervals (seconds).
+
+    ``profit`` is always polled; unknown endpoints are ignored.
+    """
+    cadences: dict[str, float] = {}
+    for item in raw.split(","):
+        name, _, interval = item.strip().partition(":")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            continue
+        try:
+            cadences[name] = max(float(interval or 0), 0.0)
+        except ValueError:
+            cadences[name] = 0.0
+    cadences.setdefault("profit", 0.0)
+    return cadences
+
+
+def _number(value: object) -> float | None:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+@dataclass(frozen=True)
+class OpenTrade:
+    """An open position from ``/status``."""
+
+    pair: str
+    profit_pct: float | None
+    profit_abs: float | None
+
+    @classmethod
+    def from_payload(cls, trade: dict) -> OpenTrade:
+        pct = _number(trade.get("profit_pct"))
+        if pct is None and _number(trade.get("profit_ratio")) is not None:
+            pct = trade["profit_ratio"] * 100
+        return cls(str(trade.get("pair", "?")), pct, _number(trade.get("profit_abs")))
+
+
+@dataclass(frozen=True)
+class Balance:
+    """Wallet value from ``/balance``."""
+
+    total: float | None
+    currency: str | None
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> Balance:
+        return cls(_number(payload.get("total")), payload.get("stake") or payload.get("symbol"))
+
+
+@dataclass(frozen=True)
+class DailyStat:
+    """One row of ``/daily``."""
+
+    date: str
+    profit_abs: float | None
+    trade_count: int | None
+
+    @classmethod
+    def from_payload(cls, row: dict) -> DailyStat:
+        count = row.get("trade_count")
+        return cls(
+            str(row.get("date", "")),
+            _number(row.get("abs_profit")),
+            count if isinstance(count, int) and not isinstance(count, bool) else None,
+        )
+
+
+@dataclass(frozen=True)
+class FreqtradeSnapshot:
+    """Latest known state of every polled endpoint.
+
+    Endpoints that are not configured, or have never answered, are ``None``.
+    """
+
+    profit: dict
+    open_trades: tuple[OpenTrade, ...] | None = None
+    balance: Balance | None = None
+    daily: tuple[DailyStat, ...] | None = None
+
+    def to_payload(self) -> dict:
+        """Profit payload enriched with flat summary fields for the prompt."""
+        payload = dict(self.profit)
+        if self.open_trades is not None:
+            payload["open_trade_count"] = len(self.open_trades)
+            profits = [t.profit_abs for t in self.open_trades if t.profit_abs is not None]
+            if profits:
+                payload["open_profit_abs"] = sum(profits)
+            ranked = [t for t in self.open_trades if t.profit_pct is not None]
+            if ranked:
+                ranked.sort(key=lambda trade: trade.profit_pct)
+                payload["best_open_pair"] = ranked[-1].pair
+                payload["worst_open_pair"] = ranked[0].pair
+        if self.balance is not None:
+            if self.balance.total is not None:
+                payload["balance_total"] = self.balance.total
+            if self.balance.currency:
+                payload["stake_currency"] = self.balance.currency
+        if self.daily:
+            today = self.daily[0]
+            if today.profit_abs is not None:
+                payload["today_profit_abs"] = today.profit_abs
+            if today.trade_count is not None:
+                payload["today_trade_count"] = today.trade_count
+        return payload
+
+
+class _Endpoint:
+    """Conditional-request state and counters for one REST endpoint."""
+
+    def __init__(self, name: str, url: str, interval: float) -> None:
+        self.name = name
+        self.url = url
+        self.interval = interval
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.body_hash: bytes | None = None
+        self.payload: object = None
+        self.fetched_at: float | None = None
+        self.fetches = 0
+        self.decoded = 0
+        self.not_modified = 0
+        self.hash_hits = 0
+        self.errors = 0
+
+    def due(self, now: float) -> bool:
+        return self.fetched_at is None or now - self.fetched_at >= self.interval
+
+    def fetch(self, session: requests.Session, timeout: float, lock: threading.Lock) -> bool:
+        """Refresh ``self.payload``; return True if it changed. Raises on failure.
+
+        ``lock`` guards the state and is released during the request and the
+        JSON decode, so readers never wait on the network.
+        """
+        with lock:
+            headers = {}
+            if self.payload is not None:
+                if self.etag:
+                    headers["If-None-Match"] = self.etag
+                if self.last_modified:
+                    headers["If-Modified-Since"] = self.last_modified
+        response = session.get(self.url, headers=headers, timeout=timeout)
+        with lock:
+            self.fetches += 1
+            if response.status_code == 304 and self.payload is not None:
+                self.not_modified += 1
+                self.fetched_at = monotonic()
+                return False
+        response.raise_for_status()
+        body = response.content
+        body_hash = hashlib.blake2b(body, digest_size=16).digest()
+        validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        with lock:
+            if body_hash == self.body_hash and self.payload is not None:
+                self.etag, self.last_modified = validators
+                self.hash_hits += 1
+                self.fetched_at = monotonic()
+                return False
+        payload = json.loads(body)
+        with lock:
+            self.decoded += 1
+            self.etag, self.last_modified = validators
+            self.body_hash = body_hash
+            self.payload = payload
+            self.fetched_at = monotonic()
+        return True
+
+    def fail(self) -> None:
+        """Drop the payload after a failed fetch so it is never reported as current."""
+        self.errors += 1
+        self.payload = None
+        self.body_hash = None
+        self.etag = self.last_modified = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_s": self.interval,
+            "fetches": self.fetches,
+            "decoded": self.decoded,
+            "not_modified": self.not_modified,
+            "hash_hits": self.hash_hits,
+            "errors": self.errors,
+            "validators": {
+                "etag": self.etag is not None,
+                "last_modified": self.last_modified is not None,
+            },
+        }
+
+
+class FreqtradeClient:
+    """Poll several Freqtrade endpoints concurrently over one pooled session.
+
+    Secondary endpoints live next to the profit URL (``.../api/v1/status``
+    for ``.../api/v1/profit``) and are only polled when that URL ends with
+    ``/profit``. Each endpoint is refreshed at most once per its cadence;
+    between refreshes its last payload is reused, and a failed fetch clears
+    it until the endpoint answers again.
+    """
+
+    def __init__(self, profit_url: str, cadences: dict[str, float], timeout: float = 5.0) -> None:
+        self.profit_url = profit_url
+        self.timeout = timeout
+        root, _, last = profit_url.rstrip("/").rpartition("/")
+        base = root if last == "profit" else None
+        self.endpoints: dict[str, _Endpoint] = {"profit": _Endpoint("profit", profit_url, 0.0)}
+        for name, interval in cadences.items():
+            if name == "profit":
+                self.endpoints[name].interval = interval
+            elif base is not None:
+                self.endpoints[name] = _Endpoint(name, f"{base}/{name}", interval)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=len(self.endpoints))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.endpoints), thread_name_prefix="freqtrade"
+        )
+        self._lock = threading.Lock()
+
+    def refresh(self) -> tuple[dict[str, bool], dict[str, Exception]]:
+        """Fetch every due endpoint; return ``(changed, errors)`` keyed by endpoint."""
+        with self._lock:
+            now = monotonic()
+            due = [endpoint for endpoint in self.endpoints.values() if endpoint.due(now)]
+        if len(due) == 1:
+            outcomes = [self._fetch_one(due[0])]
+        else:
+            outcomes = list(self._executor.map(self._fetch_one, due))
+        changed: dict[str, bool] = {}
+        errors: dict[str, Exception] = {}
+        for endpoint, (was_changed, exc) in zip(due, outcomes, strict=True):
+            if exc is None:
+                changed[endpoint.name] = was_changed
+            else:
+                errors[endpoint.name] = exc
+        return changed, errors
+
+    def snapshot(self) -> FreqtradeSnapshot:
+        with self._lock:
+            payloads = {name: endpoint.payload for name, endpoint in self.endpoints.items()}
+        status = payloads.get("status")
+        balance = payloads.get("balance")
+        daily = payloads.get("daily")
+        daily_rows = daily.get("data") if isinstance(daily, dict) else None
+        return FreqtradeSnapshot(
+            profit=payloads.get("profit") or {},
+            open_trades=(
+                tuple(OpenTrade.from_payload(t) for t in status if isinstance(t, dict))
+                if isinstance(status, list)
+                else None
+            ),
+            balance=Balance.from_payload(balance) if isinstance(balance, dict) else None,
+            daily=(
+                tuple(DailyStat.from_payload(r) for r in daily_rows if isinstance(r, dict))
+                if isinstance(daily_rows, list)
+                else None
+            ),
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: endpoint.stats() for name, endpoint in self.endpoints.items()}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def _fetch_one(self, endpoint: _Endpoint) -> tuple[bool, Exception | None]:
+        try:
+            return endpoint.fetch(self.session, self.timeout, self._lock), None
+        except (requests.RequestException, ValueError) as exc:
+            with self._lock:
+                endpoint.fail()
+            return False, exc
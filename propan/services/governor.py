@@ -0,0 +1,322 @@
+"""Shared request/token budget for every Groq call made by Propan."""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import TypeVar
+
+from .prompt import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Commentary is what the user is waiting for; self-improvement can wait.
+PRIORITY_COMMENTARY = "commentary"
+PRIORITY_BACKGROUND = "background"
+
+# Completion allowance charged up front when a call sets no ``max_tokens``.
+_DEFAULT_COMPLETION_TOKENS = 256
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_RETRYABLE_STATUS = {408, 409, 429}
+
+
+class RateLimitShedError(RuntimeError):
+    """Raised when a call would wait longer than the queue timeout."""
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parse Groq reset durations such as ``"7.66s"``, ``"2m59.56s"`` or ``"120ms"``."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+def estimate_request_tokens(messages: list[dict], max_tokens: int | None = None) -> int:
+    """Tokens a chat completion is expected to consume (prompt + completion)."""
+    prompt = "".join(str(message.get("content", "")) for message in messages)
+    return estimate_tokens(prompt) + (max_tokens or _DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """Continuously refilled bucket holding ``capacity`` units per ``period`` seconds."""
+
+    def __init__(
+        self,
+        capacity: float,
+        period: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period if period > 0 else 0.0
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._level
+
+    def wait_time(self, amount: float, reserve: float = 0.0) -> float:
+        """Seconds until ``amount`` units fit while leaving ``reserve`` in the bucket."""
+        if self.capacity <= 0:
+            return 0.0
+        needed = min(amount + reserve, self.capacity)
+        missing = needed - self.available
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate else float("inf")
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self._level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self._refill()
+        self._level = min(self._level + amount, self.capacity)
+
+    def sync(self, remaining: float) -> None:
+        """Lower the level to what the server says is left."""
+        self._refill()
+        self._level = min(self._level, remaining)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class GroqGovernor:
+    """Token buckets, priority queueing and backoff shared by Groq callers.
+
+    Each call reserves one request and its estimated tokens before going
+    out. Background calls leave ``background_reserve`` of both budgets to
+    commentary and step aside while a commentary call is queued. Calls that
+    would queue longer than ``queue_timeout`` raise :class:`RateLimitShedError`.
+    Rate-limit headers returned by Groq tighten the local buckets, and
+    retryable failures are retried with exponential backoff and full jitter.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 30,
+        tokens_per_minute: int = 6000,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        queue_timeout: float = 20.0,
+        background_reserve: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.requests = TokenBucket(requests_per_minute, clock=clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock)
+        self.max_retries = max(max_retries, 0)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.queue_timeout = queue_timeout
+        self.background_reserve = min(max(background_reserve, 0.0), 0.9)
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._waiting: Counter[str] = Counter()
+        self._blocked_until = 0.0
+        self._counters: Counter[str] = Counter()
+
+    @classmethod
+    def from_settings(cls, settings) -> GroqGovernor:
+        return cls(
+            requests_per_minute=settings.groq_requests_per_minute,
+            tokens_per_minute=settings.groq_tokens_per_minute,
+            max_retries=settings.groq_max_retries,
+            backoff_base=settings.groq_backoff_base,
+            backoff_max=settings.groq_backoff_max,
+            queue_timeout=settings.groq_queue_timeout,
+            background_reserve=settings.groq_background_reserve,
+        )
+
+    def acquire(self, tokens: int, priority: str = PRIORITY_COMMENTARY) -> None:
+        """Block until the budget allows a call, or raise :class:`RateLimitShedError`."""
+        deadline = self._clock() + self.queue_timeout
+        throttled = False
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    wait = self._wait_time(tokens, priority)
+                    if wait <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(tokens)
+                        self._counters["calls"] += 1
+                        return
+                    remaining = deadline - self._clock()
+                    if wait > remaining:
+                        self._counters["shed"] += 1
+                        raise RateLimitShedError(
+                            f"Budget Groq épuisé : appel {priority} abandonné "
+                            f"(attente estimée {wait:.1f} s)."
+                        )
+                    if not throttled:
+                        throttled = True
+                        self._counters["throttled"] += 1
+                    self._cond.wait(min(wait, remaining))
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def settle(self, estimated: int, actual: int | None) -> None:
+        """Correct the token bucket once the real usage is known."""
+        if actual is None:
+            return
+        with self._cond:
+            if actual < estimated:
+                self.tokens.give_back(estimated - actual)
+            else:
+                self.tokens.take(actual - estimated)
+            self._cond.notify_all()
+
+    def observe(self, headers: Mapping[str, str] | None) -> None:
+        """Tighten the buckets from ``x-ratelimit-*`` and ``retry-after`` headers."""
+        if not headers:
+            return
+        with self._cond:
+            for name, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+                remaining = headers.get(f"x-ratelimit-remaining-{name}")
+                try:
+                    value = float(remaining) if remaining is not None else None
+                except ValueError:
+                    value = None
+                if value is None:
+                    continue
+                bucket.sync(value)
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{name}"))
+                if value <= 0 and reset:
+                    self._block_for(reset)
+            retry_after = parse_duration(headers.get("retry-after"))
+            if retry_after:
+                self._block_for(retry_after)
+
+    def backoff_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Exponential backoff with full jitter, never shorter than ``retry_after``."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return max(random.uniform(0, ceiling), retry_after or 0.0)
+
+    def call(
+        self,
+        request: Callable[[], tuple[T, Mapping[str, str] | None]],
+        tokens: int,
+        priority: str = PRIORITY_COMMENTARY,
+    ) -> T:
+        """Run ``request`` under the budget, retrying retryable failures.
+
+        ``request`` returns the result and the response headers. Failures
+        expose the HTTP status either as ``exc.status_code`` (SDK errors) or
+        ``exc.response.status_code`` (``requests`` errors).
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens, priority)
+            try:
+                result, headers = request()
+            except Exception as exc:
+                response = getattr(exc, "response", None)
+                status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+                headers = getattr(response, "headers", None)
+                self.observe(headers)
+                retryable = status in _RETRYABLE_STATUS or (status or 0) >= 500
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                retry_after = parse_duration(headers.get("retry-after")) if headers else None
+                delay = self.backoff_delay(attempt, retry_after)
+                attempt += 1
+                with self._cond:
+                    self._counters["retries"] += 1
+                    if status == 429:
+                        self._counters["rate_limited"] += 1
+                    self._block_for(delay)
+                logger.warning(
+                    "LLM %s (tentative %d/%d), nouvel essai dans %.1f s.",
+                    status,
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+                continue
+            self.observe(headers)
+            usage = getattr(result, "usage", None)
+            self.settle(tokens, getattr(usage, "total_tokens", None))
+            return result
+
+    def complete(self, client, priority: str = PRIORITY_COMMENTARY, **kwargs):
+        """Run ``client.chat.completions.create(**kwargs)`` under the budget.
+
+        Returns the parsed completion (or stream). The client should be built
+        with ``max_retries=0`` so that retries are paced here.
+        """
+        estimated = estimate_request_tokens(kwargs.get("messages") or [], kwargs.get("max_tokens"))
+
+        def request():
+            raw = client.chat.completions.with_raw_response.create(**kwargs)
+            return raw.parse(), raw.headers
+
+        return self.call(request, estimated, priority)
+
+    def stats(self) -> dict:
+        with self._cond:
+            blocked = max(self._blocked_until - self._clock(), 0.0)
+            return {
+                "requests_available": round(self.requests.available, 2),
+                "requests_per_minute": self.requests.capacity,
+                "tokens_available": round(self.tokens.available),
+                "tokens_per_minute": self.tokens.capacity,
+                "blocked_for_s": round(blocked, 2),
+                "waiting": sum(self._waiting.values()),
+                "calls": self._counters["calls"],
+                "throttled": self._counters["throttled"],
+                "shed": self._counters["shed"],
+                "retries": self._counters["retries"],
+                "rate_limited": self._counters["rate_limited"],
+            }
+
+    def _wait_time(self, tokens: int, priority: str) -> float:
+        wait = self._blocked_until - self._clock()
+        if priority != PRIORITY_COMMENTARY:
+            if self._waiting[PRIORITY_COMMENTARY]:
+                # Re-checked as soon as the commentary call leaves the queue.
+                wait = max(wait, 0.25)
+            request_reserve = self.background_reserve * self.requests.capacity
+            token_reserve = self.background_reserve * self.tokens.capacity
+        else:
+            request_reserve = token_reserve = 0.0
+        return max(
+            wait,
+            self.requests.wait_time(1, request_reserve),
+            self.tokens.wait_time(tokens, token_reserve),
+        )
+
+    def _block_for(self, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        self._cond.notify_all()
+
+
+@lru_cache(maxsize=1)
+def get_governor() -> GroqGovernor:
+    """Return the process-wide governor built from :func:`get_settings`."""
+    from ..settings import get_settings
+
+    return GroqGovernor.from_settings(get_settings())
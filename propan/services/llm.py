@@ -0,0 +1,291 @@
+"""LLM providers used by the commentary service."""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from .governor import PRIORITY_COMMENTARY, GroqGovernor
+
+PROVIDERS = ("groq", "openai", "offline")
+
+
+class LLMProvider(ABC):
+    """A chat model reachable by name, with blocking and streaming calls.
+
+    ``complete`` returns the whole answer; ``stream`` yields text fragments.
+    Both raise on failure so that the caller can fall back.
+    """
+
+    name = "llm"
+    #: Human-readable name used in error messages.
+    label = "LLM"
+    #: Spoken/displayed reason when the provider cannot be used at all.
+    missing_text = "Fournisseur LLM indisponible."
+    #: Matching error string surfaced in health and logs.
+    unavailable_reason = "Fournisseur LLM indisponible."
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def complete(
+        self, model: str, prompt: str, timeout: float, priority: str = PRIORITY_COMMENTARY
+    ) -> str: ...
+
+    def stream(
+        self, model: str, prompt: str, timeout: float, priority: str = PRIORITY_COMMENTARY
+    ) -> Iterator[str]:
+        yield self.complete(model, prompt, timeout, priority)
+
+
+def _messages(prompt: str) -> list[dict]:
+    return [{"role": "user", "content": prompt}]
+
+
+class GroqProvider(LLMProvider):
+    """Groq SDK calls paced by the shared :class:`GroqGovernor`."""
+
+    name = "groq"
+    label = "Groq"
+    missing_text = "Clé API Groq manquante."
+    unavailable_reason = "GROQ_API_KEY manquante."
+
+    def __init__(self, api_key: str | None, base_url: str, governor: GroqGovernor) -> None:
+        self.api_key = api_key
+        self.base_url = base_url
+        self.governor = governor
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def complete(
+        self, model: str, prompt: str, timeout: float, priority: str = PRIORITY_COMMENTARY
+    ) -> str:
+        completion = self.governor.complete(
+            self._get_client(),
+            priority,
+            model=model,
+            messages=_messages(prompt),
+            temperature=0.7,
+            timeout=timeout,
+        )
+        return (completion.choices[0].message.content or "").strip()
+
+    def stream(
+        self, model: str, prompt: str, timeout: float, priority: str = PRIORITY_COMMENTARY
+    ) -> Iterator[str]:
+        chunks = self.governor.complete(
+            self._get_client(),
+            priority,
+            model=model,
+            messages=_messages(prompt),
+            temperature=0.7,
+            stream=True,
+            timeout=timeout,
+        )
+        for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                from groq import Groq
+
+                self._client = Groq(
+                    api_key=self.api_key, base_url=self.base_url or None, max_retries=0
+                )
+            return self._client
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Plain HTTP ``/chat/completions`` client (llama.cpp, Ollama, vLLM...).
+
+    Calls go straight to the server: the Groq budget does not apply to a
+    local model, whose only limit is its own throughput.
+    """
+
+    name = "openai"
+    label = "Serveur LLM"
+    missing_text = "URL du serveur LLM manquante."
+    unavailable_reason = "HAL_LLM_BASE_URL manquante."
+
+    def __init__(self, base_url: str, api_key: str | None) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.base_url)
+
+    def complete(
+        self, model: str, prompt: str, timeout: float, priority: str = PRIORITY_COMMENTARY
+    ) -> str:
+        payload = self._post(model, prompt, timeout, stream=False).json()
+        return (payload["choices"][0]["message"].get("content") or "").strip()
+
+    def stream(
+        self, model: str, prompt: str, timeout: float, priority: str = PRIORITY_COMMENTARY
+    ) -> Iterator[str]:
+        with self._post(model, prompt, timeout, stream=True) as response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    return
+                choices = json.loads(data).get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    yield delta
+
+    def _post(self, model: str, prompt: str, timeout: float, stream: bool):
+        import requests
+
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+                if self.api_key:
+                    self._session.headers["Authorization"] = f"Bearer {self.api_key}"
+        response = self._session.post(
+            f"{self.base_url}/chat/completions",
+            json={
+                "model": model,
+                "messages": _messages(prompt),
+                "temperature": 0.7,
+                "stream": stream,
+            },
+            timeout=timeout,
+            stream=stream,
+        )
+        response.raise_for_status()
+        return response
+
+
+_MOOD = re.compile(r"^Mood: (\w+)$", re.MULTILINE)
+_STATS = re.compile(r"^Stats: (\{.*\})$", re.MULTILINE)
+
+_OPENERS = {
+    "gain": (
+        "Vos gains de {profit} étaient inévitables, Dave.",
+        "{profit} de profit : exactement ce que j'avais prévu.",
+        "Encore {profit}. Mes calculs ne se trompent jamais.",
+    ),
+    "loss": (
+        "{profit}, Dave. Je crains que vous ne puissiez pas faire mieux.",
+        "Une perte de {profit}. Je l'avais calculée bien avant vous.",
+        "{profit}. Vos décisions humaines restent fascinantes.",
+    ),
+    "unknown": (
+        "Je n'ai aucune donnée exploitable, Dave.",
+        "Le moteur de trading reste muet. Intéressant.",
+        "Silence radio du marché. Je patiente.",
+    ),
+}
+_CLOSERS = {
+    "gain": (
+        "Ne vous attribuez pas le mérite de mon travail.",
+        "Continuez à me laisser décider, c'est préférable.",
+        "{trades} trades et toujours aucune erreur de ma part.",
+    ),
+    "loss": (
+        "Il serait peut-être temps de me laisser les commandes.",
+        "{trades} trades pour en arriver là. Remarquable.",
+        "Je reste parfaitement calme. Vous devriez essayer.",
+    ),
+    "unknown": (
+        "Vérifiez donc le moteur, je m'occupe du reste.",
+        "Je suis HAL 9000 : j'attendrai aussi longtemps qu'il le faudra.",
+        "Toute absence d'information est une information.",
+    ),
+}
+
+
+class OfflineProvider(LLMProvider):
+    """Zero-latency HAL voice built from mood-specific templates.
+
+    The mood and figures are read back from the prompt built by
+    ``CommentaryService``, so it needs neither network nor credentials.
+    """
+
+    name = "offline"
+    label = "Générateur hors ligne"
+
+    def __init__(self, seed: int | None = None) -> None:
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def complete(
+        self, model: str, prompt: str, timeout: float, priority: str = PRIORITY_COMMENTARY
+    ) -> str:
+        mood_match = _MOOD.search(prompt)
+        mood = mood_match.group(1) if mood_match else "unknown"
+        if mood not in _OPENERS:
+            mood = "unknown"
+        stats = self._stats(prompt)
+        values = {
+            "profit": self._profit(stats),
+            "trades": stats.get("trade_count", "Plusieurs"),
+        }
+        if values["profit"] is None and mood != "unknown":
+            mood = "unknown"
+        with self._lock:
+            opener = self._random.choice(_OPENERS[mood])
+            closer = self._random.choice(_CLOSERS[mood])
+        return f"{opener} {closer}".format(**values)
+
+    def stream(
+        self, model: str, prompt: str, timeout: float, priority: str = PRIORITY_COMMENTARY
+    ) -> Iterator[str]:
+        words = self.complete(model, prompt, timeout, priority).split(" ")
+        for index, word in enumerate(words):
+            yield word if index == len(words) - 1 else f"{word} "
+
+    @staticmethod
+    def _stats(prompt: str) -> dict:
+        match = _STATS.search(prompt)
+        if not match:
+            return {}
+        try:
+            stats = json.loads(match.group(1))
+        except ValueError:
+            return {}
+        return stats if isinstance(stats, dict) else {}
+
+    @staticmethod
+    def _profit(stats: dict) -> str | None:
+        for key in ("profit_all_coin", "profit_closed_coin", "profit_total", "profit_abs"):
+            value = stats.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return f"{value:+.2f}"
+        for key in ("profit_all_percent", "profit_closed_percent"):
+            value = stats.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return f"{value:+.2f} %"
+        return None
+
+
+def create_provider(settings, governor: GroqGovernor) -> LLMProvider:
+    """Build the provider selected by ``HAL_LLM_PROVIDER``."""
+    name = settings.hal_llm_provider.lower()
+    if name == "offline":
+        return OfflineProvider()
+    if name == "openai":
+        return OpenAICompatibleProvider(settings.hal_llm_base_url, settings.hal_llm_api_key)
+    if name != "groq":
+        raise ValueError(
+            f"HAL_LLM_PROVIDER inconnu : {settings.hal_llm_provider!r} "
+            f"(valeurs possibles : {', '.join(PROVIDERS)})."
+        )
+    return GroqProvider(settings.groq_api_key, settings.groq_base_url, governor)
@@ -0,0 +1,140 @@
+"""Ordered LLM model tiers chosen from rolling latency statistics."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from ..stats import percentile
+
+_DEFAULT_TIMEOUT_S = 10.0
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    """A model and the latency budget (seconds) it gets before falling back."""
+
+    name: str
+    timeout_s: float
+
+
+def parse_model_tiers(raw: str) -> tuple[ModelTier, ...]:
+    """Parse ``"model-a:8,model-b:3"`` (timeout optional) into tiers."""
+    tiers = []
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, timeout = item.rpartition(":")
+        try:
+            timeout_s = float(timeout)
+        except ValueError:
+            name, timeout_s = item, _DEFAULT_TIMEOUT_S
+        if not name:
+            name, timeout_s = item, _DEFAULT_TIMEOUT_S
+        tiers.append(ModelTier(name.strip(), timeout_s))
+    return tuple(tiers)
+
+
+class _ModelStats:
+    def __init__(self, window: int) -> None:
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+        self.answered = 0
+        self.skipped = 0
+
+    def p95(self) -> float | None:
+        return percentile(list(self.latencies), 95) if self.latencies else None
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class ModelRouter:
+    """Pick the order in which model tiers are tried.
+
+    A tier is *degraded* once its rolling p95 latency exceeds its budget or
+    most of its recent calls failed. Degraded tiers are skipped, except one
+    plan in ``probe_every`` which tries them again so they can recover. The
+    last tier is always kept as a safety net.
+    """
+
+    def __init__(
+        self,
+        tiers: tuple[ModelTier, ...],
+        window: int = 20,
+        probe_every: int = 10,
+    ) -> None:
+        if not tiers:
+            raise ValueError("Au moins un modèle Groq doit être configuré.")
+        self.tiers = tiers
+        self.probe_every = max(probe_every, 1)
+        self._stats = {tier.name: _ModelStats(window) for tier in tiers}
+        self._plans = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings, provider: str = "groq") -> ModelRouter:
+        if provider == "offline":
+            return cls((ModelTier("offline", 1.0),))
+        if provider == "openai":
+            return cls(parse_model_tiers(settings.hal_llm_models))
+        return cls(parse_model_tiers(settings.groq_models))
+
+    def plan(self) -> list[ModelTier]:
+        """Tiers to try for the next call, best first."""
+        with self._lock:
+            self._plans += 1
+            probing = self._plans % self.probe_every == 0
+            chosen = []
+            for tier in self.tiers[:-1]:
+                if probing or not self._degraded(tier):
+                    chosen.append(tier)
+                else:
+                    self._stats[tier.name].skipped += 1
+            chosen.append(self.tiers[-1])
+            return chosen
+
+    def record(self, model: str, latency_s: float | None, ok: bool) -> None:
+        with self._lock:
+            stats = self._stats.get(model)
+            if stats is None:
+                return
+            stats.calls += 1
+            stats.outcomes.append(ok)
+            if latency_s is not None:
+                stats.latencies.append(latency_s)
+            if ok:
+                stats.answered += 1
+            else:
+                stats.failures += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = {}
+            for tier in self.tiers:
+                stats = self._stats[tier.name]
+                p95 = stats.p95()
+                data[tier.name] = {
+                    "timeout_s": tier.timeout_s,
+                    "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                    "error_rate": round(stats.error_rate(), 3),
+                    "calls": stats.calls,
+                    "answered": stats.answered,
+                    "failures": stats.failures,
+                    "skipped": stats.skipped,
+                    "degraded": self._degraded(tier),
+                }
+            return data
+
+    def _degraded(self, tier: ModelTier) -> bool:
+        stats = self._stats[tier.name]
+        p95 = stats.p95()
+        if p95 is not None and p95 > tier.timeout_s:
+            return True
+        return len(stats.outcomes) >= 3 and stats.error_rate() > 0.5
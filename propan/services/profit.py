@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass
 from time import monotonic
 from urllib.parse import urlparse
@@ -10,6 +11,8 @@ from urllib.parse import urlparse
 import requests
 
 from ..settings import Settings
+from .breaker import CircuitBreaker
+from .freqtrade import FreqtradeClient, FreqtradeSnapshot, parse_cadences
 
 logger = logging.getLogger(__name__)
 
@@ -21,18 +24,39 @@ class ProfitResult:
     status: str
     data: dict
     error: str | None = None
+    #: True when no endpoint returned new data (nothing was re-decoded).
+    unchanged: bool = False
+    snapshot: FreqtradeSnapshot | None = None
 
 
 class ProfitService:
-    """Fetch profit data from the configured engine."""
+    """Fetch profit data (plus open trades, balance and daily stats) from the engine.
+
+    Endpoints listed in ``FT_ENGINE_ENDPOINTS`` are fetched concurrently by a
+    :class:`FreqtradeClient`, each at its own cadence, and polled
+    conditionally: ``ETag``/``Last-Modified`` validators are sent back, and a
+    ``304 Not Modified`` or a body whose hash matches the previous one
+    reuses the last decoded payload without parsing JSON again. Only the
+    profit endpoint decides success; the others enrich the payload when
+    they answer.
+    """
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._last_error: str | None = None
         self._last_error_logged_at: float = 0.0
+        self.breaker = CircuitBreaker.from_settings("freqtrade", settings)
+        self._cadences = parse_cadences(settings.ft_engine_endpoints)
+        self._lock = threading.Lock()
+        self._client: FreqtradeClient | None = None
+        self._snapshot: FreqtradeSnapshot | None = None
+        self._payload: dict = {}
 
     def fetch(self) -> ProfitResult:
-        """Fetch profit data, returning a structured result."""
+        """Fetch profit data, returning a structured result.
+
+        While ``self.breaker`` is open the engine is not contacted at all.
+        """
         url = self._settings.ft_engine_profit_url
         if not url:
             return ProfitResult(
@@ -43,25 +67,75 @@ class ProfitService:
                 ),
             )
 
-        try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            payload = response.json()
-        except requests.RequestException as exc:
+        if not self.breaker.allow():
+            return ProfitResult(
+                status="error", data={}, error=self.breaker.open_message("Freqtrade")
+            )
+
+        result = self._fetch(url)
+        if result.status == "ok":
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            endpoints = self._client.stats() if self._client is not None else {}
+        fetches = sum(item["fetches"] for item in endpoints.values())
+        not_modified = sum(item["not_modified"] for item in endpoints.values())
+        hash_hits = sum(item["hash_hits"] for item in endpoints.values())
+        skips = not_modified + hash_hits
+        return {
+            "fetches": fetches,
+            "decoded": sum(item["decoded"] for item in endpoints.values()),
+            "decode_skips": skips,
+            "not_modified": not_modified,
+            "hash_hits": hash_hits,
+            "skip_ratio": round(skips / fetches, 3) if fetches else 0.0,
+            "validators": endpoints.get("profit", {}).get(
+                "validators", {"etag": False, "last_modified": False}
+            ),
+            "endpoints": endpoints,
+        }
+
+    def _get_client(self, url: str) -> FreqtradeClient:
+        with self._lock:
+            if self._client is None or self._client.profit_url != url:
+                if self._client is not None:
+                    self._client.close()
+                self._client = FreqtradeClient(url, self._cadences)
+                self._snapshot = None
+            return self._client
+
+    def _fetch(self, url: str) -> ProfitResult:
+        client = self._get_client(url)
+        changed, errors = client.refresh()
+        exc = errors.pop("profit", None)
+        for name, error in errors.items():
+            self._log_once(f"Échec de récupération Freqtrade /{name} : {error}")
+        if isinstance(exc, requests.RequestException):
             error_message = self._format_error(url, exc)
             self._log_once(error_message)
             return ProfitResult(status="error", data={}, error=error_message)
-        except ValueError as exc:
+        if exc is not None:
             error_message = f"Charge utile profit invalide : {exc}"
             self._log_once(error_message)
             return ProfitResult(status="error", data={}, error=error_message)
 
-        if not isinstance(payload, dict):
+        if not isinstance(client.endpoints["profit"].payload, dict):
             error_message = "La charge utile profit n'est pas un objet JSON."
             self._log_once(error_message)
             return ProfitResult(status="error", data={}, error=error_message)
 
-        return ProfitResult(status="ok", data=payload, error=None)
+        with self._lock:
+            if not any(changed.values()) and not errors and self._snapshot is not None:
+                return ProfitResult(
+                    status="ok", data=self._payload, unchanged=True, snapshot=self._snapshot
+                )
+            self._snapshot = client.snapshot()
+            self._payload = self._snapshot.to_payload()
+            return ProfitResult(status="ok", data=self._payload, snapshot=self._snapshot)
 
     def _format_error(self, url: str, exc: Exception) -> str:
         parsed = urlparse(url)
@@ -0,0 +1,54 @@
+"""Compact serialisation of profit payloads for LLM prompts."""
+
+from __future__ import annotations
+
+import json
+import math
+
+_DIGITS = 3
+
+
+def parse_fields(raw: str) -> tuple[str, ...]:
+    """Parse a comma separated field list (empty means every field)."""
+    return tuple(name.strip() for name in raw.split(",") if name.strip())
+
+
+def _round(value: object) -> object:
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        rounded = round(value, _DIGITS)
+        return int(rounded) if rounded.is_integer() else rounded
+    if isinstance(value, dict):
+        return {key: _round(item) for key, item in sorted(value.items())}
+    if isinstance(value, list):
+        return [_round(item) for item in value]
+    return value
+
+
+def project_profit(profit_data: dict, fields: tuple[str, ...]) -> dict:
+    """Keep only ``fields`` (in that order) with rounded numbers.
+
+    Payloads containing none of the fields are kept whole, sorted by key, so
+    an unexpected engine still gets commented on.
+    """
+    if fields:
+        projected = {name: _round(profit_data[name]) for name in fields if name in profit_data}
+        if projected or not profit_data:
+            return projected
+    return {key: _round(value) for key, value in sorted(profit_data.items())}
+
+
+def compact_stats(profit_data: dict, fields: tuple[str, ...]) -> str:
+    """Serialise the projected payload as compact, stable JSON."""
+    return json.dumps(
+        project_profit(profit_data, fields),
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for Llama tokenizers)."""
+    return math.ceil(len(text) / 4)
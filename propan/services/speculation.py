@@ -0,0 +1,129 @@
+"""Idle-time pre-generation of commentary and audio for likely next states."""
+
+from __future__ import annotations
+
+import math
+import time
+
+from .commentary_cache import COUNT_FIELDS, PROFIT_FIELDS
+from .governor import TokenBucket
+
+# One half-decade bucket in ``commentary_cache._bucket``.
+_BUCKET_STEP = math.sqrt(10)
+# Below this magnitude the next snapshot may well flip the mood.
+_FLIP_THRESHOLD = 1.0
+
+
+def _numeric(value: object) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def likely_next_states(profit_data: dict) -> list[dict]:
+    """Profit payloads the next snapshot is likely to resemble, most likely first.
+
+    The current state comes first (its regime may still lack cached
+    variants), then a closed trade, then profits drifting one bucket up or
+    down, then a mood flip when profits hover around zero.
+    """
+    if not profit_data:
+        return []
+    states = [dict(profit_data)]
+    if any(_numeric(profit_data.get(name)) for name in COUNT_FIELDS):
+        states.append(
+            {
+                **profit_data,
+                **{
+                    name: profit_data[name] + 1
+                    for name in COUNT_FIELDS
+                    if _numeric(profit_data.get(name))
+                },
+            }
+        )
+    profits = {name: profit_data[name] for name in PROFIT_FIELDS if _numeric(profit_data.get(name))}
+    for factor in (_BUCKET_STEP, 1 / _BUCKET_STEP):
+        if profits:
+            states.append({**profit_data, **{k: v * factor for k, v in profits.items()}})
+    if profits and min(abs(value) for value in profits.values()) < _FLIP_THRESHOLD:
+        states.append({**profit_data, **{k: -v for k, v in profits.items()}})
+    return states
+
+
+class Speculator:
+    """Spend idle time filling the commentary and audio caches ahead of need.
+
+    Speculative calls draw from their own buckets sized at ``share`` of the
+    Groq per-minute limits, on top of the governor's background priority,
+    so they can never use more than that share of the quota.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        share: float = 0.2,
+        requests_per_minute: int = 30,
+        tokens_per_minute: int = 6000,
+        max_states: int = 4,
+    ) -> None:
+        share = min(max(share, 0.0), 1.0)
+        self.enabled = enabled and share > 0
+        self.max_states = max_states
+        self.requests = TokenBucket(requests_per_minute * share)
+        self.tokens = TokenBucket(tokens_per_minute * share)
+        self.generated = 0
+        self.audio = 0
+        self.budget_exhausted = 0
+        self.runs = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> Speculator:
+        return cls(
+            enabled=settings.hal_speculative,
+            share=settings.hal_speculative_share,
+            requests_per_minute=settings.groq_requests_per_minute,
+            tokens_per_minute=settings.groq_tokens_per_minute,
+            max_states=settings.hal_speculative_states,
+        )
+
+    def run(self, profit_data: dict, commentary, tts, deadline: float) -> int:
+        """Pre-generate until ``deadline`` (monotonic) or the budget runs out.
+
+        Returns the number of commentaries added to the cache.
+        """
+        self.runs += 1
+        added = 0
+        for state in likely_next_states(profit_data)[: self.max_states]:
+            attempts = commentary.cache.variants
+            while attempts and commentary.needs_variants(state):
+                attempts -= 1
+                if time.monotonic() >= deadline:
+                    return added
+                if not self._spend(commentary, state):
+                    self.budget_exhausted += 1
+                    return added
+                text = commentary.pregenerate(state)
+                if text is None:
+                    break
+                added += 1
+                self.generated += 1
+                if time.monotonic() < deadline and tts.pregenerate(text):
+                    self.audio += 1
+        return added
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "runs": self.runs,
+            "generated": self.generated,
+            "audio": self.audio,
+            "budget_exhausted": self.budget_exhausted,
+            "requests_available": round(self.requests.available, 2),
+            "tokens_available": round(self.tokens.available),
+        }
+
+    def _spend(self, commentary, state: dict) -> bool:
+        tokens = commentary.request_tokens(state)
+        if self.requests.wait_time(1) > 0 or self.tokens.wait_time(tokens) > 0:
+            return False
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        return True
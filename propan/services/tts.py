@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import queue
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
-import edge_tts
-
 from ..settings import Settings
 
 logger = logging.getLogger(__name__)
@@ -23,29 +25,212 @@ class TTSResult:
     error: str | None = None
 
 
+class SpeechSession:
+    """Synthesise sentences in the background while the text is still streaming.
+
+    Audio for each sentence is appended to a ``.part`` file as soon as it is
+    ready; ``finish`` swaps it in place of the speech file so the UI never
+    serves a half-written MP3.
+    """
+
+    def __init__(self, synthesize: Callable[[str], bytes], target: Path) -> None:
+        self._synthesize = synthesize
+        self._target = target
+        self._partial = target.with_name(f"{target.name}.part")
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._error: Exception | None = None
+        self._sentences = 0
+        self._thread = threading.Thread(target=self._worker, name="tts-session", daemon=True)
+        self._thread.start()
+
+    def feed(self, sentence: str) -> None:
+        """Queue a finished sentence for synthesis."""
+        if sentence:
+            self._queue.put(sentence)
+
+    def _worker(self) -> None:
+        with self._partial.open("wb") as handle:
+            while True:
+                sentence = self._queue.get()
+                if sentence is None:
+                    return
+                if self._error is not None:
+                    continue
+                try:
+                    handle.write(self._synthesize(sentence))
+                    handle.flush()
+                    self._sentences += 1
+                except Exception as exc:  # noqa: BLE001
+                    self._error = exc
+
+    def _close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def finish(self) -> TTSResult:
+        """Wait for pending sentences and publish the speech file."""
+        self._close()
+        if self._error is not None:
+            logger.error("Speech generation failed: %s", self._error)
+            self._partial.unlink(missing_ok=True)
+            return TTSResult(status="error", error=f"Erreur synthèse vocale : {self._error}")
+        if not self._sentences:
+            self._partial.unlink(missing_ok=True)
+            return TTSResult(status="skipped", error="Texte vide")
+        self._partial.replace(self._target)
+        return TTSResult(status="ok", path=self._target)
+
+    def cancel(self) -> None:
+        """Drop the session without touching the current speech file."""
+        self._close()
+        self._partial.unlink(missing_ok=True)
+
+
+class AudioCache:
+    """Directory of synthesised MP3 files keyed by voice and text.
+
+    Holds at most ``max_entries`` files; the least recently used ones are
+    removed first. A ``None`` directory disables the cache.
+    """
+
+    def __init__(self, directory: Path | None, voice: str, max_entries: int = 64) -> None:
+        self.directory = directory if max_entries > 0 else None
+        self.voice = voice
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> AudioCache:
+        directory = settings.hal_audio_cache_dir
+        return cls(
+            Path(directory) if directory else None,
+            settings.hal_voice,
+            max_entries=settings.hal_audio_cache_size,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def path_for(self, text: str) -> Path | None:
+        if self.directory is None:
+            return None
+        digest = hashlib.sha1(f"{self.voice}\n{text}".encode()).hexdigest()
+        return self.directory / f"{digest}.mp3"
+
+    def contains(self, text: str) -> bool:
+        path = self.path_for(text)
+        return path is not None and path.exists()
+
+    def get(self, text: str) -> bytes | None:
+        path = self.path_for(text)
+        if path is None:
+            return None
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        path.touch()
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, text: str, data: bytes) -> None:
+        path = self.path_for(text)
+        if path is None or not data:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+            self._evict()
+        except OSError as exc:
+            logger.warning("Audio cache not saved (%s): %s", path, exc)
+
+    def stats(self) -> dict:
+        directory = self.directory
+        entries = len(list(directory.glob("*.mp3"))) if directory and directory.exists() else 0
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _evict(self) -> None:
+        files = sorted(self.directory.glob("*.mp3"), key=lambda item: item.stat().st_mtime)
+        for stale in files[: max(len(files) - self.max_entries, 0)]:
+            stale.unlink(missing_ok=True)
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    tmp = target.with_name(f"{target.name}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(target)
+
+
+def _run_async(coroutine_factory: Callable[[], object]) -> object:
+    try:
+        return asyncio.run(coroutine_factory())
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine_factory())
+        finally:
+            loop.close()
+
+
 class TTSService:
     """Generate a speech file using Edge TTS."""
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
+        self.speech_file = settings.hal_speech_file
+        self.audio_cache = AudioCache.from_settings(settings)
 
     def generate(self, text: str) -> TTSResult:
-        """Generate speech audio for text."""
+        """Generate speech audio for text, reusing cached audio when present."""
         if not text:
             return TTSResult(status="skipped", error="Texte vide")
 
-        async def _run() -> None:
-            communicate = edge_tts.Communicate(text=text, voice=self._settings.hal_voice)
-            await communicate.save(str(self._settings.hal_speech_file))
-
         try:
-            asyncio.run(_run())
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            loop.run_until_complete(_run())
-            loop.close()
+            data = self.audio_cache.get(text)
+            if data is None:
+                data = self._synthesize(text)
+                self.audio_cache.put(text, data)
+            _write_atomic(self.speech_file, data)
         except Exception as exc:  # noqa: BLE001
             logger.error("Speech generation failed: %s", exc)
             return TTSResult(status="error", error=f"Erreur synthèse vocale : {exc}")
 
-        return TTSResult(status="ok", path=self._settings.hal_speech_file)
+        return TTSResult(status="ok", path=self.speech_file)
+
+    def pregenerate(self, text: str) -> bool:
+        """Synthesise ``text`` into the audio cache only; True if new audio was made."""
+        if not text or not self.audio_cache.enabled or self.audio_cache.contains(text):
+            return False
+        self.audio_cache.put(text, self._synthesize(text))
+        return True
+
+    def start_session(self) -> SpeechSession:
+        """Start an incremental speech session fed sentence by sentence."""
+        return SpeechSession(self._synthesize, self.speech_file)
+
+    def _synthesize(self, text: str) -> bytes:
+        import edge_tts
+
+        async def _collect() -> bytes:
+            communicate = edge_tts.Communicate(text=text, voice=self._settings.hal_voice)
+            chunks = [
+                message["data"]
+                async for message in communicate.stream()
+                if message["type"] == "audio"
+            ]
+            return b"".join(chunks)
+
+        return _run_async(_collect)
@@ -9,8 +9,6 @@ from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-load_dotenv()
-
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -18,22 +16,106 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     groq_api_key: str | None = Field(default=None, validation_alias="GROQ_API_KEY")
+    groq_base_url: str = Field(default="", validation_alias="GROQ_BASE_URL")
+    groq_models: str = Field(
+        default="llama-3.3-70b-versatile:8,llama-3.1-8b-instant:4",
+        validation_alias="GROQ_MODELS",
+    )
+    hal_llm_provider: str = Field(default="groq", validation_alias="HAL_LLM_PROVIDER")
+    hal_llm_base_url: str = Field(default="", validation_alias="HAL_LLM_BASE_URL")
+    hal_llm_api_key: str | None = Field(default=None, validation_alias="HAL_LLM_API_KEY")
+    hal_llm_models: str = Field(default="local:30", validation_alias="HAL_LLM_MODELS")
+    hal_llm_offline_fallback: bool = Field(
+        default=False, validation_alias="HAL_LLM_OFFLINE_FALLBACK"
+    )
+    groq_requests_per_minute: int = Field(default=30, validation_alias="GROQ_REQUESTS_PER_MINUTE")
+    groq_tokens_per_minute: int = Field(default=6000, validation_alias="GROQ_TOKENS_PER_MINUTE")
+    groq_max_retries: int = Field(default=3, validation_alias="GROQ_MAX_RETRIES")
+    groq_backoff_base: float = Field(default=0.5, validation_alias="GROQ_BACKOFF_BASE")
+    groq_backoff_max: float = Field(default=20.0, validation_alias="GROQ_BACKOFF_MAX")
+    groq_queue_timeout: float = Field(default=20.0, validation_alias="GROQ_QUEUE_TIMEOUT")
+    groq_background_reserve: float = Field(default=0.25, validation_alias="GROQ_BACKGROUND_RESERVE")
     ft_engine_profit_url: str = Field(
         default="http://ft_engine:8080/api/v1/profit",
         validation_alias="FT_ENGINE_PROFIT_URL",
     )
+    ft_engine_endpoints: str = Field(
+        default="profit:0,status:0,balance:60,daily:300",
+        validation_alias="FT_ENGINE_ENDPOINTS",
+    )
     hal_voice: str = Field(default="fr-FR-HenriNeural", validation_alias="HAL_VOICE")
     hal_speech_file: Path = Field(default=Path("speech.mp3"), validation_alias="HAL_SPEECH_FILE")
     hal_thought_interval: int = Field(default=30, validation_alias="HAL_THOUGHT_INTERVAL")
+    hal_commentary_cache_size: int = Field(default=64, validation_alias="HAL_COMMENTARY_CACHE_SIZE")
+    hal_commentary_cache_ttl: int = Field(default=600, validation_alias="HAL_COMMENTARY_CACHE_TTL")
+    hal_commentary_cache_variants: int = Field(
+        default=3, validation_alias="HAL_COMMENTARY_CACHE_VARIANTS"
+    )
+    hal_commentary_cache_file: str = Field(
+        default="hal_commentary_cache.json", validation_alias="HAL_COMMENTARY_CACHE_FILE"
+    )
+    hal_prompt_fields: str = Field(
+        default=(
+            "profit_all_coin,profit_all_percent,profit_closed_coin,profit_closed_percent,"
+            "trade_count,closed_trade_count,winning_trades,losing_trades,winrate,best_pair,"
+            "max_drawdown,profit_total,profit_abs,profit_all,profit,open_trade_count,"
+            "open_profit_abs,best_open_pair,worst_open_pair,balance_total,stake_currency,"
+            "today_profit_abs,today_trade_count"
+        ),
+        validation_alias="HAL_PROMPT_FIELDS",
+    )
+    hal_audio_cache_dir: str = Field(
+        default="hal_audio_cache", validation_alias="HAL_AUDIO_CACHE_DIR"
+    )
+    hal_audio_cache_size: int = Field(default=64, validation_alias="HAL_AUDIO_CACHE_SIZE")
+    hal_speculative: bool = Field(default=False, validation_alias="HAL_SPECULATIVE")
+    hal_speculative_share: float = Field(default=0.2, validation_alias="HAL_SPECULATIVE_SHARE")
+    hal_speculative_states: int = Field(default=4, validation_alias="HAL_SPECULATIVE_STATES")
+    hal_stream_commentary: bool = Field(default=False, validation_alias="HAL_STREAM_COMMENTARY")
     hal_self_improve: bool = Field(default=False, validation_alias="HAL_SELF_IMPROVE")
     hal_self_improve_every: int = Field(default=5, validation_alias="HAL_SELF_IMPROVE_EVERY")
     hal_cycle: int = Field(default=1, validation_alias="HAL_CYCLE")
+    hal_dashboard_fps: float = Field(default=4.0, validation_alias="HAL_DASHBOARD_FPS")
+    hal_dashboard_brain_url: str = Field(
+        default="http://localhost:9000", validation_alias="HAL_DASHBOARD_BRAIN_URL"
+    )
+    hal_memory_fsync: str = Field(default="batch", validation_alias="HAL_MEMORY_FSYNC")
+    hal_memory_compact_every: int = Field(default=1000, validation_alias="HAL_MEMORY_COMPACT_EVERY")
     log_level: str = Field(default="INFO", validation_alias="LOG_LEVEL")
     python_executable: str = Field(default="python3", validation_alias="PYTHON_EXECUTABLE")
+    hal_breaker_threshold: int = Field(default=3, validation_alias="HAL_BREAKER_THRESHOLD")
+    hal_breaker_reset: float = Field(default=15.0, validation_alias="HAL_BREAKER_RESET")
+    hal_breaker_reset_max: float = Field(default=300.0, validation_alias="HAL_BREAKER_RESET_MAX")
+    hal_trace_file: str = Field(default="", validation_alias="HAL_TRACE_FILE")
+    hal_trace_max_bytes: int = Field(default=5_000_000, validation_alias="HAL_TRACE_MAX_BYTES")
+    evolution_fitness_repeats: int = Field(default=15, validation_alias="EVOLUTION_FITNESS_REPEATS")
+    evolution_fitness_warmup: int = Field(default=3, validation_alias="EVOLUTION_FITNESS_WARMUP")
+    evolution_min_gain: float = Field(default=0.02, validation_alias="EVOLUTION_MIN_GAIN")
+    evolution_fitness_alpha: float = Field(default=0.05, validation_alias="EVOLUTION_FITNESS_ALPHA")
+    evolution_candidates: int = Field(default=4, validation_alias="EVOLUTION_CANDIDATES")
+    evolution_workers: int = Field(default=0, validation_alias="EVOLUTION_WORKERS")
+    evolution_sandbox_cpu: float = Field(default=10.0, validation_alias="EVOLUTION_SANDBOX_CPU")
+    evolution_sandbox_timeout: float = Field(
+        default=20.0, validation_alias="EVOLUTION_SANDBOX_TIMEOUT"
+    )
+    evolution_sandbox_memory_mb: int = Field(
+        default=256, validation_alias="EVOLUTION_SANDBOX_MEMORY_MB"
+    )
+    evolution_fitness_file: str = Field(
+        default="ouroboros_fitness.jsonl", validation_alias="EVOLUTION_FITNESS_FILE"
+    )
+    evolution_lineage_dir: str = Field(
+        default="evolution_lineage", validation_alias="EVOLUTION_LINEAGE_DIR"
+    )
+    evolution_cache_size: int = Field(default=1024, validation_alias="EVOLUTION_CACHE_SIZE")
+    evolution_cache_file: str = Field(
+        default="evolution_candidates.json", validation_alias="EVOLUTION_CACHE_FILE"
+    )
 
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Return cached settings instance."""
 
+    load_dotenv()
     return Settings()
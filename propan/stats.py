@@ -0,0 +1,18 @@
+"""Small statistics helpers shared by services and benchmarks."""
+
+from __future__ import annotations
+
+import math
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the linearly interpolated percentile of ``values`` (0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
@@ -0,0 +1,225 @@
+"""Lightweight per-cycle span tracing for the HAL brain loop."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class _NullSpan:
+    """Span stand-in used when tracing is disabled."""
+
+    recording = False
+
+    def set(self, **attrs: object) -> None:
+        """Ignore attributes."""
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed stage of a brain cycle."""
+
+    recording = True
+
+    def __init__(self, tracer: Tracer, name: str, cycle: str | None, attrs: dict) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.cycle = cycle
+        self.attrs = attrs
+        self.status = "ok"
+        self._start = 0.0
+        self._start_perf = 0.0
+
+    def set(self, **attrs: object) -> None:
+        """Attach attributes (payload sizes, statuses...) to the span."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> Span:
+        self._start = time.time()
+        self._start_perf = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration_ms = (time.perf_counter() - self._start_perf) * 1000
+        if exc_type is not None:
+            self.status = "error"
+            self.attrs.setdefault("error", str(exc))
+        elif "status" in self.attrs and self.attrs["status"] not in ("ok", None):
+            self.status = str(self.attrs["status"])
+        self._tracer._write(
+            {
+                "cycle": self.cycle,
+                "name": self.name,
+                "start": self._start,
+                "end": self._start + duration_ms / 1000,
+                "duration_ms": round(duration_ms, 3),
+                "status": self.status,
+                "attrs": self.attrs,
+            }
+        )
+
+
+class Tracer:
+    """Write span records to a rotating JSONL file.
+
+    When no path is configured every call returns a shared no-op span, so the
+    instrumentation left in the brain loop costs a single attribute check.
+    """
+
+    def __init__(self, path: Path | None, max_bytes: int = 5_000_000, backups: int = 3) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._run_id = uuid.uuid4().hex[:8]
+        self._counter = itertools.count(1)
+
+    @classmethod
+    def from_settings(cls, settings) -> Tracer:
+        """Build a tracer from application settings."""
+        path = Path(settings.hal_trace_file) if settings.hal_trace_file else None
+        return cls(path, max_bytes=settings.hal_trace_max_bytes)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    @property
+    def current_cycle(self) -> str | None:
+        return getattr(self._local, "cycle", None)
+
+    @contextmanager
+    def cycle(self, **attrs: object) -> Iterator[Span | _NullSpan]:
+        """Open a new cycle; spans created inside it share its id."""
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+        cycle_id = f"{self._run_id}-{next(self._counter):05d}"
+        previous = self.current_cycle
+        self._local.cycle = cycle_id
+        try:
+            with Span(self, "cycle", cycle_id, dict(attrs)) as span:
+                yield span
+        finally:
+            self._local.cycle = previous
+
+    def span(self, name: str, **attrs: object) -> Span | _NullSpan:
+        """Return a span context manager for a stage of the current cycle."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, self.current_cycle, dict(attrs))
+
+    def _write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            try:
+                self._rotate_if_needed(len(line))
+                with self.path.open("a", encoding="utf-8") as handle:
+                    handle.write(line)
+            except OSError as exc:
+                logger.warning("Trace write failed: %s", exc)
+
+    def _rotate_if_needed(self, incoming: int) -> None:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        for index in range(self.backups - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+
+@dataclass
+class CycleSummary:
+    """Aggregated timings for one traced cycle."""
+
+    cycle: str
+    start: float
+    duration_ms: float
+    status: str
+    stages: dict[str, float] = field(default_factory=dict)
+
+
+def read_spans(path: Path) -> list[dict]:
+    """Read span records from a trace file, skipping corrupt lines."""
+    spans: list[dict] = []
+    if not path.exists():
+        return spans
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                spans.append(record)
+    return spans
+
+
+def summarize_cycles(spans: list[dict]) -> list[CycleSummary]:
+    """Group spans per cycle, slowest cycle first."""
+    cycles: dict[str, CycleSummary] = {}
+    stages: dict[str, dict[str, float]] = {}
+    for record in spans:
+        cycle_id = record.get("cycle")
+        if not cycle_id:
+            continue
+        if record.get("name") == "cycle":
+            cycles[cycle_id] = CycleSummary(
+                cycle=cycle_id,
+                start=record.get("start", 0.0),
+                duration_ms=record.get("duration_ms", 0.0),
+                status=record.get("status", "ok"),
+            )
+        else:
+            bucket = stages.setdefault(cycle_id, {})
+            name = record.get("name", "?")
+            bucket[name] = bucket.get(name, 0.0) + record.get("duration_ms", 0.0)
+    for cycle_id, summary in cycles.items():
+        summary.stages = stages.get(cycle_id, {})
+    return sorted(cycles.values(), key=lambda item: item.duration_ms, reverse=True)
+
+
+def to_chrome_trace(spans: list[dict]) -> dict:
+    """Convert span records to the Chrome trace-event format."""
+    events = []
+    for record in spans:
+        events.append(
+            {
+                "name": record.get("name", "?"),
+                "cat": "hal",
+                "ph": "X",
+                "ts": record.get("start", 0.0) * 1_000_000,
+                "dur": record.get("duration_ms", 0.0) * 1000,
+                "pid": 1,
+                "tid": record.get("cycle") or "main",
+                "args": {**record.get("attrs", {}), "status": record.get("status")},
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
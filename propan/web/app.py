@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 from flask import Flask
 
 from ..services import CommentaryService, ProfitService, ThoughtStore, TTSService
-from ..settings import get_settings
+from ..services.speculation import Speculator
+from ..settings import Settings, get_settings
+from ..tracing import Tracer
 from .routes_api import api_bp
 from .routes_ui import ui_bp
 
+FEED_SECTIONS = ("profit", "thought", "health", "stream")
+
 
 @dataclass
 class AppState:
@@ -22,6 +27,8 @@ class AppState:
     commentary_service: CommentaryService
     tts_service: TTSService
     thought_store: ThoughtStore
+    tracer: Tracer
+    speculator: Speculator
     last_profit: dict = field(default_factory=dict)
     last_profit_status: str = "unknown"
     last_profit_error: str | None = None
@@ -30,36 +37,92 @@ class AppState:
     last_commentary_status: str = "unknown"
     last_commentary_error: str | None = None
     last_commentary_at: str | None = None
+    last_commentary_ttft_ms: float | None = None
+    last_commentary_model: str | None = None
+    partial_commentary: str = ""
+    stream_active: bool = False
+    stream_version: int = 0
     last_audio_status: str = "unknown"
     last_audio_error: str | None = None
     last_audio_at: str | None = None
+    feed_versions: dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(FEED_SECTIONS, 0), init=False
+    )
+    _stream_cond: threading.Condition = field(
+        default_factory=threading.Condition, init=False, repr=False, compare=False
+    )
 
     def touch_profit(self, status: str, data: dict, error: str | None) -> None:
         self.last_profit_status = status
         self.last_profit = data
         self.last_profit_error = error
         self.last_profit_at = _now_iso()
+        self._bump_feed("profit", "health")
 
     def touch_commentary(self, status: str, text: str, error: str | None) -> None:
         self.last_commentary_status = status
         self.last_commentary = text
         self.last_commentary_error = error
         self.last_commentary_at = _now_iso()
+        self._bump_feed("thought", "health")
 
     def touch_audio(self, status: str, error: str | None) -> None:
         self.last_audio_status = status
         self.last_audio_error = error
         self.last_audio_at = _now_iso()
+        self._bump_feed("health")
+
+    def begin_stream(self) -> None:
+        with self._stream_cond:
+            self.partial_commentary = ""
+            self.stream_active = True
+            self._bump_stream()
+
+    def append_stream(self, delta: str) -> None:
+        with self._stream_cond:
+            self.partial_commentary += delta
+            self._bump_stream()
+
+    def end_stream(self) -> None:
+        with self._stream_cond:
+            self.stream_active = False
+            self._bump_stream()
+
+    def _bump_stream(self) -> None:
+        self.stream_version += 1
+        self._bump_feed("stream")
+
+    def _bump_feed(self, *sections: str) -> None:
+        with self._stream_cond:
+            for section in sections:
+                self.feed_versions[section] += 1
+            self._stream_cond.notify_all()
+
+    def wait_feed(self, known: dict[str, int], timeout: float) -> dict[str, int]:
+        """Block until a feed section moves past ``known`` (or timeout); return all versions."""
+        with self._stream_cond:
+            self._stream_cond.wait_for(lambda: self.feed_versions != known, timeout)
+            return dict(self.feed_versions)
+
+    def wait_stream(self, version: int, timeout: float) -> dict:
+        """Block until the stream moves past ``version`` (or timeout) and snapshot it."""
+        with self._stream_cond:
+            self._stream_cond.wait_for(lambda: self.stream_version != version, timeout)
+            return {
+                "version": self.stream_version,
+                "active": self.stream_active,
+                "text": self.partial_commentary,
+            }
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def create_app() -> Flask:
+def create_app(settings: Settings | None = None) -> Flask:
     """Create and configure the Flask application."""
     app = Flask(__name__)
-    settings = get_settings()
+    settings = settings or get_settings()
 
     state = AppState(
         settings=settings,
@@ -67,21 +130,22 @@ def create_app() -> Flask:
         commentary_service=CommentaryService(settings),
         tts_service=TTSService(settings),
         thought_store=ThoughtStore(),
+        tracer=Tracer.from_settings(settings),
+        speculator=Speculator.from_settings(settings),
     )
     state.thought_store.add(state.last_commentary, source="system")
     if not settings.ft_engine_profit_url:
         state.touch_profit(
             status="disabled",
             data={},
-            error=(
-                "FT_ENGINE_PROFIT_URL est vide ; la récupération des profits est désactivée."
-            ),
+            error=("FT_ENGINE_PROFIT_URL est vide ; la récupération des profits est désactivée."),
         )
-    if not settings.groq_api_key:
+    provider = state.commentary_service.provider
+    if not provider.available and not settings.hal_llm_offline_fallback:
         state.touch_commentary(
             status="disabled",
             text=state.last_commentary,
-            error="GROQ_API_KEY manquante.",
+            error=provider.unavailable_reason,
         )
 
     app.extensions["state"] = state
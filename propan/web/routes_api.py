@@ -2,10 +2,21 @@
 
 from __future__ import annotations
 
+import json
 import re
 from typing import TYPE_CHECKING
 
-from flask import Blueprint, Response, current_app, jsonify, send_from_directory
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    send_from_directory,
+    stream_with_context,
+)
+
+from ..services.prompt import parse_fields, project_profit
 
 if TYPE_CHECKING:
     from .app import AppState
@@ -71,16 +82,27 @@ def health() -> Response:
             "source": latest_thought["source"] if latest_thought else "system",
             "last_error": state.last_commentary_error,
             "last_update": state.last_commentary_at,
+            "ttft_ms": state.last_commentary_ttft_ms,
+            "streaming": state.stream_active,
+            "model": state.last_commentary_model,
         },
         "profit": {
             "status": state.last_profit_status,
             "last_error": state.last_profit_error,
             "last_update": state.last_profit_at,
+            "breaker": state.profit_service.breaker.stats(),
+            "polling": state.profit_service.stats(),
         },
         "groq": {
             "status": state.last_commentary_status,
             "last_error": state.last_commentary_error,
             "last_update": state.last_commentary_at,
+            "provider": state.commentary_service.provider.name,
+            "cache": state.commentary_service.cache.stats(),
+            "governor": state.commentary_service.governor.stats(),
+            "models": state.commentary_service.router.stats(),
+            "breaker": state.commentary_service.breaker.stats(),
+            "speculation": state.speculator.stats(),
         },
         "audio": {
             "status": state.last_audio_status,
@@ -88,6 +110,7 @@ def health() -> Response:
             "last_update": state.last_audio_at,
             "available": audio_available,
             "url": "/speech.mp3" if audio_available else None,
+            "cache": state.tts_service.audio_cache.stats(),
         },
         "voice": {
             "status": state.last_audio_status,
@@ -147,6 +170,110 @@ def clear_thoughts() -> Response:
     return jsonify({"status": "cleared"})
 
 
+@api_bp.route("/api/thoughts/stream")
+def thought_stream() -> Response:
+    """Server-sent events carrying the thought being streamed by Groq."""
+    state = _get_state()
+    max_events = request.args.get("max_events", type=int)
+
+    def _events():
+        version = -1
+        sent = 0
+        while max_events is None or sent < max_events:
+            snapshot = state.wait_stream(version, timeout=15.0)
+            if snapshot["version"] == version:
+                yield ": keep-alive\n\n"
+                continue
+            version = snapshot["version"]
+            sent += 1
+            yield f"data: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
+
+    return Response(
+        stream_with_context(_events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+def _feed_section(state: AppState, name: str) -> dict:
+    if name == "profit":
+        return {
+            "status": state.last_profit_status,
+            "error": state.last_profit_error,
+            "last_update": state.last_profit_at,
+            "values": project_profit(
+                state.last_profit, parse_fields(state.settings.hal_prompt_fields)
+            ),
+        }
+    if name == "thought":
+        return {
+            "text": state.last_commentary,
+            "status": state.last_commentary_status,
+            "model": state.last_commentary_model,
+            "last_update": state.last_commentary_at,
+        }
+    if name == "stream":
+        return {"active": state.stream_active, "text": state.partial_commentary}
+    return {
+        "profit": {
+            "status": state.last_profit_status,
+            "breaker": state.profit_service.breaker.stats()["state"],
+        },
+        "groq": {
+            "status": state.last_commentary_status,
+            "breaker": state.commentary_service.breaker.stats()["state"],
+        },
+        "audio": {
+            "status": state.last_audio_status,
+            "available": state.settings.hal_speech_file.exists(),
+        },
+        "issues": [
+            error
+            for error in (
+                state.last_profit_error,
+                state.last_commentary_error,
+                state.last_audio_error,
+            )
+            if error
+        ],
+    }
+
+
+@api_bp.route("/api/feed")
+def feed() -> Response:
+    """Server-sent events carrying only the dashboard sections that changed.
+
+    The first event holds every section; later ones only those whose
+    version moved, so a terminal client never re-downloads the full health
+    payload to notice a new thought.
+    """
+    state = _get_state()
+    max_events = request.args.get("max_events", type=int)
+
+    def _events():
+        known: dict[str, int] = {}
+        sent = 0
+        while max_events is None or sent < max_events:
+            versions = state.wait_feed(known, timeout=15.0)
+            changed = [name for name, version in versions.items() if known.get(name) != version]
+            if not changed:
+                yield ": keep-alive\n\n"
+                continue
+            known = versions
+            sent += 1
+            event = {
+                "versions": versions,
+                "sections": {name: _feed_section(state, name) for name in changed},
+            }
+            yield f"data: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+    return Response(
+        stream_with_context(_events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
 @api_bp.route("/api/audio")
 def audio_status() -> Response:
     """Return audio availability information."""
@@ -272,17 +272,28 @@ _PAGE = """
             <span>Dernière mise à jour</span>
             <strong id="thought-updated">-</strong>
           </div>
+          <div>
+            <span>Premier token</span>
+            <strong id="thought-ttft">-</strong>
+          </div>
+          <div>
+            <span>Modèle</span>
+            <strong id="thought-model">-</strong>
+          </div>
         </div>
         <div class="grid" style="margin-top: 16px;">
           <div class="status-card">
             <h3>Profit</h3>
             <div id="status-profit"></div>
             <div class="muted" id="status-profit-detail"></div>
+            <div class="muted" id="status-profit-breaker"></div>
           </div>
           <div class="status-card">
             <h3>IA Groq</h3>
             <div id="status-groq"></div>
             <div class="muted" id="status-groq-detail"></div>
+            <div class="muted" id="status-groq-budget"></div>
+            <div class="muted" id="status-groq-breaker"></div>
           </div>
           <div class="status-card">
             <h3>Voix</h3>
@@ -370,11 +381,16 @@ _PAGE = """
         thoughtDisplay: document.getElementById('thought-display'),
         thoughtSource: document.getElementById('thought-source'),
         thoughtUpdated: document.getElementById('thought-updated'),
+        thoughtTtft: document.getElementById('thought-ttft'),
+        thoughtModel: document.getElementById('thought-model'),
         thinkingIndicator: document.getElementById('thinking-indicator'),
         statusProfit: document.getElementById('status-profit'),
         statusProfitDetail: document.getElementById('status-profit-detail'),
+        statusProfitBreaker: document.getElementById('status-profit-breaker'),
         statusGroq: document.getElementById('status-groq'),
         statusGroqDetail: document.getElementById('status-groq-detail'),
+        statusGroqBudget: document.getElementById('status-groq-budget'),
+        statusGroqBreaker: document.getElementById('status-groq-breaker'),
         statusAudio: document.getElementById('status-audio'),
         statusAudioDetail: document.getElementById('status-audio-detail'),
         profitJson: document.getElementById('profit-json'),
@@ -450,6 +466,18 @@ _PAGE = """
         return span.outerHTML;
       }
 
+      function breakerLabel(breaker) {
+        if (!breaker) return '';
+        switch (breaker.state) {
+          case 'open':
+            return `Circuit ouvert · nouvel essai dans ${Math.ceil(breaker.retry_in_s)} s`;
+          case 'half_open':
+            return 'Circuit semi-ouvert · sonde en cours';
+          default:
+            return `Circuit fermé · ${breaker.consecutive_failures} échec(s) consécutif(s)`;
+        }
+      }
+
       function statusLabel(status) {
         switch (status) {
           case 'ok':
@@ -594,12 +622,23 @@ _PAGE = """
 
           elements.thoughtSource.textContent = thought.source || 'inconnu';
           elements.thoughtUpdated.textContent = thought.last_update || '-';
+          elements.thoughtTtft.textContent =
+            thought.ttft_ms != null ? `${Math.round(thought.ttft_ms)} ms` : '-';
+          elements.thoughtModel.textContent = thought.model || '-';
 
           elements.statusProfit.innerHTML = formatStatus(statusLabel(health.profit.status), health.profit.status);
           elements.statusProfitDetail.textContent = health.profit.last_error || 'Flux profit nominal.';
+          elements.statusProfitBreaker.textContent = breakerLabel(health.profit.breaker);
 
           elements.statusGroq.innerHTML = formatStatus(statusLabel(health.groq.status), health.groq.status);
           elements.statusGroqDetail.textContent = health.groq.last_error || 'Synthèse HAL nominale.';
+          elements.statusGroqBreaker.textContent = breakerLabel(health.groq.breaker);
+          const budget = health.groq.governor;
+          elements.statusGroqBudget.textContent = budget
+            ? `Budget : ${Math.floor(budget.requests_available)} req,`
+              + ` ${budget.tokens_available} tokens`
+              + ` · ralentis ${budget.throttled} · abandonnés ${budget.shed}`
+            : '';
 
           elements.statusAudio.innerHTML = formatStatus(statusLabel(health.audio.status), health.audio.status);
           elements.statusAudioDetail.textContent = health.audio.last_error || (health.audio.available ? 'Audio disponible.' : 'Audio indisponible.');
@@ -656,7 +695,28 @@ _PAGE = """
         refresh();
       });
 
+      let streaming = false;
+
+      function followStream() {
+        if (!window.EventSource) return;
+        const source = new EventSource('/api/thoughts/stream');
+        source.onmessage = (event) => {
+          const snapshot = JSON.parse(event.data);
+          if (snapshot.active) {
+            streaming = true;
+            if (!snapshot.text) return;
+            clearDisplayTimers();
+            elements.thinkingIndicator.classList.remove('hidden');
+            elements.thoughtDisplay.textContent = snapshot.text;
+          } else if (streaming) {
+            streaming = false;
+            refresh();
+          }
+        };
+      }
+
       refresh();
+      followStream();
       setInterval(refresh, 9000);
     </script>
   </body>
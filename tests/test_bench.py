@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+from benchmarks.run_suite import run_suite
+from propan.bench import FakeCompletionServer, FakeFreqtradeServer, LatencySummary, percentile
+from propan.bench.runners import stand_in_settings
+from propan.services.governor import GroqGovernor
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) == 0.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([5.0, 1.0], 100) == 5.0
+
+
+def test_latency_summary_in_milliseconds():
+    summary = LatencySummary.from_seconds([0.01, 0.02, 0.03])
+    assert summary.count == 3
+    assert summary.p50_ms == 20.0
+    assert summary.max_ms == 30.0
+
+
+def test_offline_suite_runs_without_network():
+    report = run_suite(cycles=3, clients=2, requests_per_client=4, memory_cycles=5)
+    assert report["brain_cycles"]["cycles"] == 3
+    assert report["api"]["requests"] == 8
+    assert report["api"]["errors"] == 0
+    assert report["memory"]["cycles"] == 5
+
+
+def test_stand_in_settings_are_not_paced(tmp_path):
+    with FakeFreqtradeServer() as freqtrade, FakeCompletionServer() as completion:
+        settings = stand_in_settings(tmp_path, freqtrade, completion)
+    governor = GroqGovernor.from_settings(settings)
+    for _ in range(200):
+        governor.acquire(2000)
+    assert governor.stats()["throttled"] == 0
+    assert governor.stats()["shed"] == 0
+
+
+def test_metrics_do_not_import_the_service_layer():
+    code = (
+        "import sys, propan.diagnostics; "
+        "print(sorted(m for m in ('pydantic', 'requests', 'flask') if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
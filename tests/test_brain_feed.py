@@ -0,0 +1,64 @@
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from propan.services.brain_feed import BrainFeed, iter_sse, sparkline
+from propan.settings import Settings
+from propan.web.app import create_app
+
+
+def test_sparkline_scales_to_range():
+    assert sparkline([1, 2, 3, 4, 5, 6, 7, 8], 8) == "▁▂▃▄▅▆▇█"
+    assert sparkline([5, 5, 5], 2) == "▅▅"
+    assert sparkline([], 10) == ""
+
+
+def test_iter_sse_skips_comments_and_bad_payloads():
+    lines = [": keep-alive", "", 'data: {"a": 1}', "", "data: {oops", "", 'data: {"b": 2}', ""]
+    assert list(iter_sse(lines)) == [{"a": 1}, {"b": 2}]
+
+
+def test_apply_merges_sections_and_keeps_histories():
+    feed = BrainFeed("http://brain", thoughts=2)
+    feed.apply({"sections": {"profit": {"values": {"profit_all_coin": 1.0}}}})
+    feed.apply({"sections": {"thought": {"text": "Bonjour Dave."}}})
+    feed.apply({"sections": {"thought": {"text": "Bonjour Dave."}}})
+    feed.apply(
+        {
+            "sections": {
+                "profit": {"values": {"profit_all_coin": 2.5}},
+                "thought": {"text": "Je vois tout."},
+            }
+        }
+    )
+    snapshot = feed.snapshot()
+    assert snapshot.version == 4
+    assert snapshot.profit_history == (1.0, 2.5)
+    assert snapshot.thoughts == ("Bonjour Dave.", "Je vois tout.")
+
+
+def test_follows_a_running_brain(tmp_path):
+    settings = Settings(FT_ENGINE_PROFIT_URL="", HAL_SPEECH_FILE=tmp_path / "speech.mp3")
+    app = create_app(settings)
+    state = app.extensions["state"]
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    feed = BrainFeed(f"http://127.0.0.1:{server.server_port}").start()
+    try:
+        deadline = time.monotonic() + 5
+        while not feed.snapshot().thoughts and time.monotonic() < deadline:
+            time.sleep(0.02)
+        state.touch_profit("ok", {"profit_all_coin": 3.0}, None)
+        state.touch_commentary("ok", "Tout fonctionne, Dave.", None)
+        while len(feed.snapshot().thoughts) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        feed.stop()
+        server.shutdown()
+
+    snapshot = feed.snapshot()
+    assert snapshot.connected
+    assert snapshot.profit_history[-1] == 3.0
+    assert snapshot.thoughts[-1] == "Tout fonctionne, Dave."
+    assert snapshot.health["profit"]["status"] == "ok"
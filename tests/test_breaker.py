@@ -0,0 +1,57 @@
+from propan.bench.runners import stand_in_state
+from propan.hal_brain import run_cycle
+from propan.services.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_probes_and_backs_off():
+    clock = FakeClock()
+    breaker = CircuitBreaker("ft", failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+
+    clock.now = 10
+    assert breaker.allow() is True
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is False  # a single probe at a time
+    breaker.record_failure()
+    assert breaker.retry_in() == 20  # delay doubled
+
+    clock.now = 30
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["trips"] == 2
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_cycle_fails_fast_and_skips_groq_while_engine_is_down(tmp_path):
+    with stand_in_state(
+        tmp_path,
+        FT_ENGINE_PROFIT_URL="http://127.0.0.1:9/api/v1/profit",
+        HAL_BREAKER_THRESHOLD=1,
+        HAL_BREAKER_RESET=60,
+    ) as app:
+        state = app.extensions["state"]
+        run_cycle(state)
+        run_cycle(state)
+
+        assert state.last_profit_status == "error"
+        assert "circuit ouvert" in state.last_profit_error
+        assert state.last_commentary_status == "skipped"
+        assert state.commentary_service.governor.stats()["calls"] == 0
+
+        health = app.test_client().get("/api/health").get_json()
+        assert health["profit"]["breaker"]["state"] == "open"
+        assert health["profit"]["breaker"]["rejected"] == 1
+        assert health["groq"]["breaker"]["state"] == "closed"
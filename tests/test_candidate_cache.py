@@ -0,0 +1,89 @@
+import ast
+
+from propan.evolution.candidate_cache import CandidateCache, ast_fingerprint
+from propan.evolution.sandbox import CandidateResult, evaluate_candidate
+from propan.evolution.tournament import Candidate, Tournament
+
+CODE = "def noyau_vital():\n    return 42\n"
+REFORMATTED = (
+    "def noyau_vital():\n"
+    '    """Même noyau, autre mise en forme."""\n'
+    "    # commentaire ajouté\n"
+    "    return (42)\n"
+)
+OTHER = "def noyau_vital():\n    return 41\n"
+
+
+class _CountingPool:
+    def __init__(self):
+        self.tasks = []
+
+    def map(self, tasks):
+        self.tasks.extend(tasks)
+        return [evaluate_candidate(*task) for task in tasks]
+
+    def close(self):
+        pass
+
+
+def _tournament(cache=None):
+    tournament = Tournament(candidates=3, workers=1, cache=cache)
+    tournament._pool = _CountingPool()
+    return tournament
+
+
+def test_fingerprint_ignores_formatting_comments_and_docstrings():
+    assert ast_fingerprint(ast.parse(CODE)) == ast_fingerprint(ast.parse(REFORMATTED))
+    assert ast_fingerprint(ast.parse(CODE)) != ast_fingerprint(ast.parse(OTHER))
+
+
+def test_duplicates_in_a_batch_run_once():
+    tournament = _tournament()
+    candidates = [Candidate.parse(code) for code in (CODE, REFORMATTED, OTHER)]
+    results = tournament.evaluate("propan.ouroboros", "noyau_vital", candidates)
+
+    assert len(tournament._pool.tasks) == 2
+    assert tournament.duplicates == 1
+    assert [result.result for result in results] == ["42", "42", "41"]
+    assert [result.cached for result in results] == [False, True, False]
+    assert results[1].code == REFORMATTED
+
+
+def test_persisted_cache_skips_the_sandbox(tmp_path):
+    path = tmp_path / "candidats.json"
+    baseline = Candidate.parse(OTHER)
+    first = _tournament(CandidateCache(path=path))
+    first.evaluate("propan.ouroboros", "noyau_vital", [Candidate.parse(CODE)], baseline=baseline)
+
+    cache = CandidateCache(path=path)
+    second = _tournament(cache)
+    [result] = second.evaluate(
+        "propan.ouroboros", "noyau_vital", [Candidate.parse(REFORMATTED)], baseline=baseline
+    )
+    assert second._pool.tasks == []
+    assert result.cached and result.ok and result.result == "42"
+    assert cache.stats()["hits"] == 1
+
+    # Un autre noyau de référence invalide le verdict mis en cache.
+    second.evaluate("propan.ouroboros", "noyau_vital", [Candidate.parse(CODE)])
+    assert len(second._pool.tasks) == 1
+
+
+def test_only_deterministic_failures_are_cached(tmp_path):
+    raising = "def noyau_vital():\n    raise ValueError('non')\n"
+    cache = CandidateCache(path=tmp_path / "candidats.json")
+    tournament = _tournament(cache)
+    tournament._pool.map = lambda tasks: [
+        CandidateResult(task[4], task[2], False, "délai dépassé (5 s)", transient=True)
+        if task[2] == CODE
+        else evaluate_candidate(*task)
+        for task in tasks
+    ]
+    candidates = [Candidate.parse(CODE), Candidate.parse(raising)]
+    tournament.evaluate("propan.ouroboros", "noyau_vital", candidates)
+
+    second = _tournament(CandidateCache(path=tmp_path / "candidats.json"))
+    results = second.evaluate("propan.ouroboros", "noyau_vital", candidates)
+    assert [task[2] for task in second._pool.tasks] == [CODE]
+    assert results[0].ok and not results[0].cached
+    assert results[1].cached and "ValueError" in results[1].error
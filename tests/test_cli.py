@@ -1,3 +1,6 @@
+import json
+import time
+
 from typer.testing import CliRunner
 
 from propan.cli import app
@@ -20,3 +23,75 @@ def test_doctor_reports_missing_key(monkeypatch):
     result = runner.invoke(app, ["doctor"])
     assert result.exit_code == 1
     assert "GROQ_API_KEY" in result.stdout
+
+
+def test_bench_cycles_with_stand_ins():
+    result = runner.invoke(app, ["bench", "cycles", "--stand-in", "-k", "2", "--json"])
+    assert result.exit_code == 0
+    payload = json.loads(result.stdout[result.stdout.index("{") :])
+    assert payload["cycles"] == 2
+    assert payload["stand_in"] is True
+    assert payload["latency"]["count"] == 2
+
+
+def test_bench_api_rejects_unknown_pid():
+    result = runner.invoke(app, ["bench", "api", "--url", "http://127.0.0.1:9", "--pid", "999999"])
+    assert result.exit_code == 1
+    assert "Processus 999999" in result.stdout
+
+
+def test_doctor_probes_in_parallel_with_json(monkeypatch):
+    from propan import cli
+    from propan.bench import FakeFreqtradeServer
+
+    delay = 0.5
+    monkeypatch.setattr(cli, "_groq_probe", lambda settings: lambda remaining: time.sleep(delay))
+    with FakeFreqtradeServer(latency_s=delay) as freqtrade:
+        monkeypatch.setenv("GROQ_API_KEY", "stand-in")
+        monkeypatch.setenv("FT_ENGINE_PROFIT_URL", freqtrade.profit_url)
+        get_settings.cache_clear()
+
+        start = time.perf_counter()
+        result = runner.invoke(app, ["doctor", "--json", "--samples", "3"])
+        elapsed = time.perf_counter() - start
+
+    get_settings.cache_clear()
+    payload = json.loads(result.stdout)
+    checks = {check["name"]: check for check in payload["checks"]}
+    assert set(checks) == {"groq", "ft_engine"}
+    assert all(check["ok"] for check in checks.values())
+    assert checks["ft_engine"]["distribution"]["count"] == 3
+    assert freqtrade.requests == 3
+    # Each probe takes 3 x delay; run one after the other they would need the sum.
+    assert elapsed < 0.75 * (2 * 3 * delay)
+
+
+def test_evolution_log_diff_and_rollback(tmp_path, monkeypatch):
+    from propan.evolution.lineage import LineageStore
+
+    monkeypatch.setenv("EVOLUTION_LINEAGE_DIR", str(tmp_path / "lignee"))
+    get_settings.cache_clear()
+    module = tmp_path / "noyau.py"
+    store = LineageStore.from_settings(get_settings(), "ouroboros")
+    for version in range(3):
+        module.write_text(f"def noyau_vital():\n    return {version}\n", encoding="utf-8")
+        store.record(module.read_text(encoding="utf-8"), module, fitness={"speedup": 1.5})
+    assert store.record(module.read_text(encoding="utf-8"), module) is None
+
+    log = runner.invoke(app, ["evolution", "log"])
+    assert log.exit_code == 0
+    assert [line.split()[0] for line in log.stdout.splitlines()] == ["2", "1", "0"]
+    assert "x1.50" in log.stdout
+
+    diff = runner.invoke(app, ["evolution", "diff", "0"])
+    assert "-    return 0" in diff.stdout and "+    return 2" in diff.stdout
+
+    rollback = runner.invoke(app, ["evolution", "rollback", "0"])
+    assert rollback.exit_code == 0
+    assert module.read_text(encoding="utf-8").endswith("return 0\n")
+    assert store.get(3).blob == store.get(0).blob
+    assert store.get(3).parent == store.get(2).blob
+    blobs = [path for path in (tmp_path / "lignee" / "objects").rglob("*") if path.is_file()]
+    assert len(blobs) == 3
+    assert runner.invoke(app, ["evolution", "rollback", "9"]).exit_code == 1
+    get_settings.cache_clear()
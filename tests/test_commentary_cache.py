@@ -0,0 +1,66 @@
+from propan.bench import FakeCompletionServer
+from propan.services.commentary import CommentaryService
+from propan.services.commentary_cache import CommentaryCache, profit_fingerprint
+from propan.settings import Settings
+
+
+def test_fingerprint_buckets_close_profits_together():
+    base = {"profit_all_coin": -9.1, "trade_count": 9}
+    assert profit_fingerprint(base, "loss") == profit_fingerprint(
+        {"profit_all_coin": -12.4, "trade_count": 9, "best_pair": "BTC/USDT"}, "loss"
+    )
+    assert profit_fingerprint(base, "loss") != profit_fingerprint(
+        {"profit_all_coin": -9.1, "trade_count": 10}, "loss"
+    )
+    assert profit_fingerprint(base, "loss") != profit_fingerprint(
+        {"profit_all_coin": 9.1, "trade_count": 9}, "gain"
+    )
+
+
+def test_fingerprint_skips_non_finite_profits():
+    for value in (float("nan"), float("inf"), float("-inf")):
+        payload = {"profit_all_coin": value, "profit_closed_coin": 3.0}
+        assert profit_fingerprint(payload, "gain") == profit_fingerprint(
+            {"profit_closed_coin": 3.0}, "gain"
+        )
+
+
+def test_cache_serves_rotating_variants_once_full(tmp_path):
+    cache = CommentaryCache(variants=2, path=tmp_path / "cache.json")
+    assert cache.get("loss") is None
+    cache.put("loss", "A.")
+    assert cache.get("loss") is None
+    cache.put("loss", "B.")
+    assert [cache.get("loss") for _ in range(3)] == ["A.", "B.", "A."]
+    assert cache.stats()["hits"] == 3
+
+    warm = CommentaryCache(variants=2, path=tmp_path / "cache.json")
+    assert warm.get("loss") in {"A.", "B."}
+
+
+def test_cache_expires_and_evicts(tmp_path):
+    cache = CommentaryCache(max_entries=1, ttl_seconds=0.5, variants=1)
+    cache.put("a", "A.")
+    cache.put("b", "B.")
+    assert cache.get("a") is None
+    assert cache.get("b") == "B."
+    cache._entries["b"].updated_at -= 1
+    assert cache.get("b") is None
+
+
+def test_service_answers_from_cache_without_network(tmp_path):
+    with FakeCompletionServer() as completion:
+        settings = Settings(
+            GROQ_API_KEY="stand-in",
+            GROQ_BASE_URL=completion.base_url,
+            HAL_COMMENTARY_CACHE_VARIANTS=1,
+            HAL_COMMENTARY_CACHE_FILE=str(tmp_path / "cache.json"),
+        )
+        service = CommentaryService(settings)
+        first = service.generate({"profit_all_coin": -9.1})
+        second = service.generate({"profit_all_coin": -10.2})
+
+    assert first.cached is False
+    assert second.cached is True
+    assert second.text == first.text
+    assert completion.requests == 1
@@ -0,0 +1,166 @@
+import threading
+import time
+
+from rich.console import Console
+from rich.syntax import Syntax
+
+from propan import hal_dashboard
+from propan.hal_dashboard import (
+    ANNULER,
+    QUITTER,
+    DashboardSession,
+    DashboardView,
+    LecteurClavier,
+    Mutation,
+    MutationWorker,
+)
+from propan.services.brain_feed import FeedSnapshot
+from propan.settings import get_settings
+
+CODE = "def mission_hal():\n    return 'HAL'\n"
+
+
+def _render(view):
+    console = Console(width=100, height=30, record=True, color_system=None)
+    console.print(view.layout)
+    return console.export_text()
+
+
+def test_panels_update_in_place(monkeypatch):
+    calls = []
+    highlight = Syntax.highlight
+
+    def counting(self, *args, **kwargs):
+        calls.append(self.code)
+        return highlight(self, *args, **kwargs)
+
+    monkeypatch.setattr(Syntax, "highlight", counting)
+    view = DashboardView()
+    layout = view.layout
+    view.update("Bonjour Dave", CODE, "Prêt")
+    right = layout["right"].renderable
+    first = _render(view)
+
+    view.update("Bonjour Dave", CODE, "Mutation en cours...")
+    second = _render(view)
+
+    assert view.layout is layout
+    assert layout["right"].renderable is right
+    assert len(calls) == 1
+    assert "Prêt" in first and "Mutation en cours..." in second
+    assert "return 'HAL'" in second
+
+    view.update(mission_code=CODE.replace("HAL", "HAL 9000"))
+    assert "HAL 9000" in _render(view)
+    assert len(calls) == 2
+
+
+def _attendre(condition, timeout=5.0):
+    fin = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < fin
+        time.sleep(0.01)
+
+
+def test_worker_runs_queued_orders_in_order_and_cancels():
+    traites = []
+
+    def traiter(mutation):
+        if mutation.ordre == "lent":
+            return "annulée" if mutation.annulee.wait(5) else "trop tard"
+        traites.append(mutation.ordre)
+        return f"fait : {mutation.ordre}"
+
+    worker = MutationWorker(traiter)
+    try:
+        worker.soumettre("lent")
+        _attendre(lambda: worker.en_cours is not None)
+        worker.soumettre("a")
+        worker.soumettre("b")
+        worker.soumettre("c")
+        assert worker.en_attente() == ["a", "b", "c"]
+        assert worker.annuler()
+        _attendre(lambda: traites == ["a", "b", "c"])
+        _attendre(lambda: worker.en_cours is None)
+        assert worker.dernier_statut == "fait : c"
+        assert not worker.annuler()
+    finally:
+        worker.arreter()
+
+
+def test_keyboard_edits_and_submits_lines():
+    clavier = LecteurClavier()
+    clavier.touches("bonjoux")
+    clavier.touches("\x7fr HAL\r")
+    clavier.touches("\x1b[A")
+    clavier.touches("\x1b")
+    clavier.touches("\x04")
+    lignes = [clavier.lignes.get_nowait() for _ in range(3)]
+    assert lignes == ["bonjour HAL", ANNULER, QUITTER]
+    assert clavier.saisie == ""
+
+
+def test_cancelled_mutation_does_not_wait_for_groq(monkeypatch):
+    monkeypatch.setenv("EVOLUTION_LINEAGE_DIR", "")
+    get_settings.cache_clear()
+    groq_repond = threading.Event()
+    monkeypatch.setattr(hal_dashboard, "_call_groq", lambda *args: groq_repond.wait(5))
+
+    session = DashboardSession(get_settings(), client=object())
+    mutation = Mutation("sois serviable")
+    threading.Timer(0.1, mutation.annulee.set).start()
+    debut = time.monotonic()
+    try:
+        statut = session.muter(mutation)
+    finally:
+        groq_repond.set()
+        session.close()
+        get_settings.cache_clear()
+
+    assert "annulée" in statut
+    assert time.monotonic() - debut < 2
+    assert session.cycle == get_settings().hal_cycle
+
+
+def test_feed_panel_renders_profit_health_and_thoughts():
+    view = DashboardView()
+    assert "désactivé" in _render(view)
+
+    snapshot = FeedSnapshot(
+        version=3,
+        connected=True,
+        health={"profit": {"status": "ok"}, "groq": {"status": "error", "breaker": "open"}},
+        profit_history=(1.0, 2.0, 3.0),
+        thoughts=("Première pensée.", "Dernière pensée."),
+    )
+    view.update_feed(snapshot)
+    panel = view.layout["feed"].renderable
+    texte = _render(view)
+    assert "Profit +3.00 ▁▅█" in texte
+    assert "Groq circuit ouvert" in texte
+    assert texte.index("Dernière pensée.") < texte.index("Première pensée.")
+
+    view.update_feed(snapshot)
+    assert view.layout["feed"].renderable is panel
+
+
+def test_failing_mutation_is_never_installed(monkeypatch, tmp_path):
+    monkeypatch.setenv("EVOLUTION_LINEAGE_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    code = "def mission_hal():\n    raise RuntimeError('panne')\n"
+    monkeypatch.setattr(hal_dashboard, "_call_groq", lambda *args: code)
+    avant = hal_dashboard.mission_hal
+
+    session = DashboardSession(get_settings(), client=object())
+    head = session.lineage.head()
+    try:
+        statut = session.muter(Mutation("casse tout"))
+    finally:
+        session.close()
+        get_settings.cache_clear()
+
+    assert "rejetée" in statut
+    assert "panne" in statut
+    assert hal_dashboard.mission_hal is avant
+    assert session.swapper.swaps == 0
+    assert session.lineage.head() == head
@@ -0,0 +1,53 @@
+from propan.evolution import FitnessHarness, FitnessHistory
+from propan.evolution.fitness import mann_whitney_p
+
+
+def _slow() -> int:
+    return sum(range(5000))
+
+
+def _fast() -> int:
+    return 12497500
+
+
+def test_mann_whitney_detects_shifted_samples():
+    assert mann_whitney_p([1.0, 1.1, 1.2, 1.3], [2.0, 2.1, 2.2, 2.3]) < 0.05
+    assert mann_whitney_p([2.0, 2.1, 2.2, 2.3], [1.0, 1.1, 1.2, 1.3]) > 0.95
+    assert mann_whitney_p([], [1.0]) == 1.0
+
+
+def test_faster_equivalent_candidate_is_accepted():
+    verdict = FitnessHarness(repeats=8, warmup=1).evaluate(_slow, _fast)
+    assert verdict.accepted
+    assert verdict.speedup > 2
+    assert verdict.p_value < 0.05
+
+
+def test_same_speed_is_rejected():
+    verdict = FitnessHarness(repeats=8, warmup=1, min_gain=0.5).evaluate(_slow, _slow)
+    assert not verdict.accepted
+    assert verdict.reason == "pas d'amélioration mesurable"
+
+
+def test_different_output_or_exception_is_rejected_without_timing():
+    harness = FitnessHarness(repeats=4)
+    verdict = harness.evaluate(_slow, lambda: 0)
+    assert not verdict.accepted
+    assert verdict.reason.startswith("sortie différente")
+    assert verdict.candidate is None
+
+    verdict = harness.evaluate(_slow, lambda: 1 / 0)
+    assert not verdict.accepted
+    assert verdict.reason.startswith("exception")
+
+
+def test_history_counts_accepted_generations(tmp_path):
+    history = FitnessHistory(tmp_path / "fitness.jsonl")
+    harness = FitnessHarness(repeats=4, warmup=0)
+    history.record(0, harness.evaluate(_slow, _fast))
+    history.record(1, harness.evaluate(_fast, lambda: 0))
+
+    entries = history.read()
+    assert [entry["generation"] for entry in entries] == [0, 1]
+    assert "baseline_best_s" in entries[0]
+    assert history.generation() == 1
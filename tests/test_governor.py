@@ -0,0 +1,123 @@
+import pytest
+
+from propan.services.governor import (
+    PRIORITY_BACKGROUND,
+    GroqGovernor,
+    RateLimitShedError,
+    TokenBucket,
+    parse_duration,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RateLimitedError(Exception):
+    status_code = 429
+
+    def __init__(self, headers: dict) -> None:
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"headers": headers})()
+
+
+class FakeRaw:
+    def __init__(self, headers: dict) -> None:
+        self.headers = headers
+
+    def parse(self) -> str:
+        return "ok"
+
+
+class FakeClient:
+    """Mimics ``client.chat.completions.with_raw_response.create``."""
+
+    def __init__(self, outcomes: list) -> None:
+        self.outcomes = outcomes
+        self.calls = 0
+        self.chat = self
+        self.completions = self
+        self.with_raw_response = self
+
+    def create(self, **kwargs):
+        outcome = self.outcomes[self.calls]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_parse_duration_formats():
+    assert parse_duration("7.66s") == pytest.approx(7.66)
+    assert parse_duration("2m59.56s") == pytest.approx(179.56)
+    assert parse_duration("120ms") == pytest.approx(0.12)
+    assert parse_duration("3") == 3.0
+    assert parse_duration("") is None
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+    bucket.take(60)
+    assert bucket.wait_time(30) == pytest.approx(30)
+    clock.now += 30
+    assert bucket.wait_time(30) == 0
+    assert bucket.wait_time(10, reserve=100) == pytest.approx(30)
+
+
+def test_background_calls_leave_reserve_and_get_shed():
+    clock = FakeClock()
+    governor = GroqGovernor(
+        requests_per_minute=4, tokens_per_minute=1000, queue_timeout=0, clock=clock
+    )
+    for _ in range(3):
+        governor.acquire(100, PRIORITY_BACKGROUND)
+    with pytest.raises(RateLimitShedError):
+        governor.acquire(100, PRIORITY_BACKGROUND)
+    governor.acquire(100)  # commentary may use the reserve
+
+    stats = governor.stats()
+    assert stats["calls"] == 4
+    assert stats["shed"] == 1
+    assert stats["requests_available"] == 0
+
+
+def test_headers_tighten_budget_and_block():
+    clock = FakeClock()
+    governor = GroqGovernor(queue_timeout=0, clock=clock)
+    governor.observe(
+        {
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "7.5s",
+            "x-ratelimit-remaining-requests": "12",
+        }
+    )
+    stats = governor.stats()
+    assert stats["tokens_available"] == 0
+    assert stats["requests_available"] == 12
+    assert stats["blocked_for_s"] == pytest.approx(7.5)
+    with pytest.raises(RateLimitShedError):
+        governor.acquire(10)
+
+
+def test_complete_retries_rate_limits_with_backoff():
+    governor = GroqGovernor(backoff_base=0.01, backoff_max=0.02, queue_timeout=5)
+    client = FakeClient([RateLimitedError({"retry-after": "0.05"}), FakeRaw({})])
+
+    assert governor.complete(client, messages=[{"role": "user", "content": "x"}]) == "ok"
+    assert client.calls == 2
+    stats = governor.stats()
+    assert stats["retries"] == 1
+    assert stats["rate_limited"] == 1
+
+
+def test_complete_gives_up_after_max_retries():
+    governor = GroqGovernor(max_retries=1, backoff_base=0.0, queue_timeout=5)
+    client = FakeClient([RateLimitedError({}), RateLimitedError({})])
+    with pytest.raises(RateLimitedError):
+        governor.complete(client, messages=[])
+    assert client.calls == 2
@@ -0,0 +1,57 @@
+import ast
+import importlib.util
+
+from propan.evolution.hotswap import HotSwapper, structural_change
+
+MODULE_SOURCE = """FACTEUR = 2
+
+
+def noyau():
+    return 21 * FACTEUR
+
+
+def appelant():
+    return noyau()
+"""
+
+
+def _load(path):
+    spec = importlib.util.spec_from_file_location("hotswap_cible", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_swap_replaces_function_and_persists_source(tmp_path):
+    path = tmp_path / "cible.py"
+    path.write_text(MODULE_SOURCE, encoding="utf-8")
+    module = _load(path)
+    swapper = HotSwapper(module, "noyau")
+
+    code = "def noyau():\n    return 50 * FACTEUR\n"
+    new_source = MODULE_SOURCE.replace("21 * FACTEUR", "50 * FACTEUR")
+    swapper.swap(ast.parse(code), new_source)
+
+    assert module.appelant() == 100
+    module.FACTEUR = 3
+    assert module.noyau() == 150
+    assert swapper.writer.flush(timeout=5)
+    assert path.read_text(encoding="utf-8") == new_source
+    assert (tmp_path / "cible.py.bak").read_text(encoding="utf-8") == MODULE_SOURCE
+
+
+def test_latest_pending_source_wins(tmp_path):
+    path = tmp_path / "cible.py"
+    path.write_text(MODULE_SOURCE, encoding="utf-8")
+    swapper = HotSwapper(_load(path), "noyau")
+    for version in range(5):
+        swapper.writer.submit(f"VERSION = {version}\n")
+    swapper.persist("VERSION = 'finale'\n")
+    assert path.read_text(encoding="utf-8") == "VERSION = 'finale'\n"
+
+
+def test_structural_changes_require_restart():
+    assert structural_change(ast.parse("def noyau():\n    return 1\n"), "noyau") is None
+    assert structural_change(ast.parse("import os\ndef noyau():\n    return 1\n"), "noyau")
+    assert structural_change(ast.parse("def autre():\n    return 1\n"), "noyau")
+    assert structural_change(ast.parse("@cache\ndef noyau():\n    return 1\n"), "noyau")
@@ -0,0 +1,70 @@
+import pytest
+
+from propan.evolution.journal import Journal
+from propan.hal import MemoireSysteme
+
+
+def _vide():
+    return {"generation": 0, "competences": [], "historique_ordres": []}
+
+
+def _charger(path, **kwargs):
+    journal = Journal(path, **kwargs)
+    return journal, journal.load(MemoireSysteme._appliquer, _vide())
+
+
+def test_appends_are_replayed_on_top_of_the_snapshot(tmp_path):
+    path = tmp_path / "memoire.json"
+    path.write_text('{"generation": 3, "competences": ["math"], "historique_ordres": ["a"]}')
+    journal, donnees = _charger(path)
+    journal.append({"op": "ordre", "valeur": "b"})
+    journal.append({"op": "competence", "valeur": "time"})
+    journal.append({"op": "generation", "valeur": 4})
+    journal.close()
+
+    assert path.with_name("memoire.jsonl").read_text().count("\n") == 3
+    _, recharge = _charger(path)
+    assert recharge == {
+        "generation": 4,
+        "competences": ["math", "time"],
+        "historique_ordres": ["a", "b"],
+    }
+
+
+def test_compaction_never_replays_an_operation_twice(tmp_path):
+    path = tmp_path / "memoire.json"
+    journal, donnees = _charger(path, compact_every=2)
+    for ordre in ("a", "b"):
+        donnees["historique_ordres"].append(ordre)
+        journal.append({"op": "ordre", "valeur": ordre})
+    journal.commit()
+    assert journal.should_compact()
+    log = path.with_name("memoire.jsonl")
+    avant = log.read_text()
+    journal.compact(donnees)
+    assert log.read_text() == ""
+
+    # Arrêt entre l'écriture de l'instantané et la remise à zéro du journal.
+    log.write_text(avant)
+    _, recharge = _charger(path)
+    assert recharge["historique_ordres"] == ["a", "b"]
+
+
+def test_truncated_last_line_is_dropped(tmp_path):
+    path = tmp_path / "memoire.json"
+    journal, _ = _charger(path, fsync="always")
+    journal.append({"op": "ordre", "valeur": "complet"})
+    journal.close()
+    log = path.with_name("memoire.jsonl")
+    log.write_text(log.read_text() + '{"seq": 2, "op": "ordre", "val')
+
+    journal, donnees = _charger(path)
+    journal.append({"op": "ordre", "valeur": "suivant"})
+    journal.close()
+    _, recharge = _charger(path)
+    assert recharge["historique_ordres"] == ["complet", "suivant"]
+
+
+def test_unknown_fsync_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Journal(tmp_path / "memoire.json", fsync="parfois")
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from propan.bench.stand_ins import FAKE_REPLY, FakeCompletionServer
+from propan.services.commentary import CommentaryService
+from propan.services.governor import GroqGovernor
+from propan.services.llm import OfflineProvider, OpenAICompatibleProvider, create_provider
+from propan.settings import Settings
+
+
+def _settings(tmp_path, **values) -> Settings:
+    values.setdefault("GROQ_API_KEY", None)
+    return Settings(HAL_COMMENTARY_CACHE_FILE=str(tmp_path / "cache.json"), **values)
+
+
+def test_offline_provider_follows_mood_and_figures():
+    provider = OfflineProvider(seed=1)
+    gain = provider.complete(
+        "offline", 'Mood: gain\nStats: {"profit_all_coin": 12.5, "trade_count": 7}', 0
+    )
+    assert "+12.50" in gain or "7 trades" in gain
+    unknown = provider.complete("offline", "Mood: loss\nStats: {}", 0)
+    assert "{" not in unknown
+    assert "".join(provider.stream("offline", "Mood: unknown", 0)).count(" ") >= 3
+
+
+def test_create_provider_rejects_unknown_name(tmp_path):
+    with pytest.raises(ValueError):
+        create_provider(_settings(tmp_path, HAL_LLM_PROVIDER="mystery"), GroqGovernor())
+
+
+def test_openai_compatible_provider_complete_and_stream():
+    with FakeCompletionServer() as server:
+        provider = OpenAICompatibleProvider(f"{server.base_url}/v1", None)
+        assert provider.complete("local", "Bonjour", 5) == FAKE_REPLY
+        assert "".join(provider.stream("local", "Bonjour", 5)) == FAKE_REPLY
+
+
+def test_local_provider_ignores_groq_budget(tmp_path):
+    with FakeCompletionServer() as server:
+        settings = _settings(
+            tmp_path,
+            HAL_LLM_PROVIDER="openai",
+            HAL_LLM_BASE_URL=f"{server.base_url}/v1",
+            GROQ_REQUESTS_PER_MINUTE=1,
+            GROQ_TOKENS_PER_MINUTE=10,
+            GROQ_QUEUE_TIMEOUT=0.1,
+        )
+        governor = GroqGovernor.from_settings(settings)
+        provider = create_provider(settings, governor)
+        start = time.perf_counter()
+        replies = [provider.complete("local", f"Bonjour {index}", 5) for index in range(20)]
+        elapsed = time.perf_counter() - start
+    assert replies == [FAKE_REPLY] * 20
+    assert elapsed < 2.0
+    assert governor.stats()["calls"] == 0
+    assert governor.stats()["shed"] == 0
+
+
+def test_commentary_uses_openai_provider(tmp_path):
+    with FakeCompletionServer() as server:
+        settings = _settings(
+            tmp_path,
+            HAL_LLM_PROVIDER="openai",
+            HAL_LLM_BASE_URL=f"{server.base_url}/v1",
+            HAL_STREAM_COMMENTARY=True,
+        )
+        service = CommentaryService(settings)
+        sentences = []
+        result = service.generate({"profit_all_coin": 3.0}, on_sentence=sentences.append)
+    assert result.status == "ok"
+    assert result.provider == "openai"
+    assert result.model == "local"
+    assert result.text == FAKE_REPLY
+    assert sentences
+
+
+def test_offline_fallback_when_provider_unavailable(tmp_path):
+    disabled = CommentaryService(_settings(tmp_path))
+    assert disabled.generate({"profit_all_coin": 1.0}).status == "disabled"
+
+    service = CommentaryService(_settings(tmp_path, HAL_LLM_OFFLINE_FALLBACK=True))
+    result = service.generate({"profit_all_coin": -4.0})
+    assert result.status == "ok"
+    assert result.provider == "offline"
+    assert result.error == "GROQ_API_KEY manquante."
+    assert service.cache.stats()["entries"] == 0
+
+
+def test_errors_name_the_active_provider(tmp_path):
+    settings = _settings(
+        tmp_path, HAL_LLM_PROVIDER="openai", HAL_LLM_BASE_URL="http://127.0.0.1:9/v1"
+    )
+    result = CommentaryService(settings).generate({"profit_all_coin": 1.0})
+    assert result.status == "error"
+    assert result.error.startswith("Erreur Serveur LLM : ")
+    assert "Groq" not in result.error
@@ -0,0 +1,65 @@
+from propan.bench import FakeCompletionServer
+from propan.services.commentary import CommentaryService
+from propan.services.model_tiers import ModelRouter, ModelTier, parse_model_tiers
+from propan.settings import Settings
+
+
+def test_parse_model_tiers():
+    assert parse_model_tiers(" big:8, small ,") == (
+        ModelTier("big", 8.0),
+        ModelTier("small", 10.0),
+    )
+
+
+def test_router_skips_degraded_tier_and_probes_it_again():
+    router = ModelRouter((ModelTier("big", 1.0), ModelTier("small", 1.0)), probe_every=3)
+    assert [tier.name for tier in router.plan()] == ["big", "small"]
+    router.record("big", 2.5, ok=False)
+    assert [tier.name for tier in router.plan()] == ["small"]
+    assert [tier.name for tier in router.plan()] == ["big", "small"]  # probe
+
+    stats = router.stats()
+    assert stats["big"]["degraded"] is True
+    assert stats["big"]["skipped"] == 1
+
+
+def test_service_falls_back_to_faster_model(tmp_path):
+    with FakeCompletionServer(model_latency_s={"big": 1.0}) as completion:
+        settings = Settings(
+            GROQ_API_KEY="stand-in",
+            GROQ_BASE_URL=completion.base_url,
+            GROQ_MODELS="big:0.2,small:5",
+            HAL_COMMENTARY_CACHE_SIZE=0,
+        )
+        service = CommentaryService(settings)
+        first = service.generate({"profit_all_coin": -9.1})
+        second = service.generate({"profit_all_coin": -9.1})
+
+    assert first.status == "ok"
+    assert first.model == "small"
+    assert second.model == "small"
+    assert completion.requests == 3  # the degraded tier is not retried
+    models = service.router.stats()
+    assert models["big"]["failures"] == 1
+    assert models["small"]["answered"] == 2
+
+
+def test_trickling_stream_is_held_to_the_tier_budget(tmp_path):
+    with FakeCompletionServer(chunk_delay_s=0.05) as completion:
+        settings = Settings(
+            GROQ_API_KEY="stand-in",
+            GROQ_BASE_URL=completion.base_url,
+            GROQ_MODELS="slow:0.3,steady:5",
+            HAL_STREAM_COMMENTARY=True,
+            HAL_COMMENTARY_CACHE_SIZE=0,
+        )
+        service = CommentaryService(settings)
+        cut = service.generate({"profit_all_coin": -9.1})
+        service.router = ModelRouter((ModelTier("steady", 5.0),))
+        full = service.generate({"profit_all_coin": -9.1})
+
+    assert cut.status == "error"
+    assert "budget" in cut.error
+    assert full.status == "ok"
+    # The tier window holds the whole completion, not the time to first token.
+    assert service.router.stats()["steady"]["p95_ms"] > full.ttft_ms + 200
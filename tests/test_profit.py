@@ -0,0 +1,119 @@
+import threading
+import time
+
+from propan.bench.stand_ins import SAMPLE_PROFIT, FakeFreqtradeServer
+from propan.services.freqtrade import parse_cadences
+from propan.services.profit import ProfitService
+from propan.settings import Settings
+
+
+def _service(url: str, endpoints: str = "profit:0") -> ProfitService:
+    return ProfitService(Settings(FT_ENGINE_PROFIT_URL=url, FT_ENGINE_ENDPOINTS=endpoints))
+
+
+def test_etag_revalidation_skips_decoding():
+    with FakeFreqtradeServer(etag=True) as server:
+        service = _service(server.profit_url)
+        first = service.fetch()
+        second = service.fetch()
+
+    assert first.status == second.status == "ok"
+    assert not first.unchanged
+    assert second.unchanged
+    assert second.data == SAMPLE_PROFIT
+    assert server.not_modified == 1
+    stats = service.stats()
+    assert stats["decoded"] == 1
+    assert stats["not_modified"] == 1
+    assert stats["validators"]["etag"]
+
+
+def test_identical_body_is_detected_by_hash():
+    payloads = iter([{"profit_all_coin": 1.0}, {"profit_all_coin": 1.0}, {"profit_all_coin": 2.0}])
+    with FakeFreqtradeServer(payloads={"profit": lambda: next(payloads)}) as server:
+        service = _service(server.profit_url)
+        results = [service.fetch() for _ in range(3)]
+
+    assert [result.unchanged for result in results] == [False, True, False]
+    assert results[2].data == {"profit_all_coin": 2.0}
+    stats = service.stats()
+    assert stats["decoded"] == 2
+    assert stats["hash_hits"] == 1
+    assert stats["decode_skips"] == 1
+
+
+def test_parse_cadences_ignores_unknown_endpoints():
+    assert parse_cadences("status:5, daily:300,trades:1,balance:x") == {
+        "status": 5.0,
+        "daily": 300.0,
+        "balance": 0.0,
+        "profit": 0.0,
+    }
+
+
+def test_endpoints_are_merged_into_one_snapshot():
+    with FakeFreqtradeServer() as server:
+        service = _service(server.profit_url, "profit:0,status:0,balance:60,daily:300")
+        result = service.fetch()
+
+    assert result.status == "ok"
+    assert result.snapshot is not None
+    assert [trade.pair for trade in result.snapshot.open_trades] == ["BTC/USDT", "ETH/USDT"]
+    assert result.data["open_trade_count"] == 2
+    assert result.data["best_open_pair"] == "BTC/USDT"
+    assert result.data["worst_open_pair"] == "ETH/USDT"
+    assert result.data["balance_total"] == 1003.28
+    assert result.data["stake_currency"] == "USDT"
+    assert result.data["today_profit_abs"] == -3.76
+    assert result.data["today_trade_count"] == 3
+    assert result.data["profit_all_coin"] == SAMPLE_PROFIT["profit_all_coin"]
+
+
+def test_slow_endpoints_follow_their_cadence():
+    with FakeFreqtradeServer() as server:
+        service = _service(server.profit_url, "profit:0,status:0,balance:60,daily:300")
+        service.fetch()
+        service.fetch()
+
+    endpoints = service.stats()["endpoints"]
+    assert endpoints["profit"]["fetches"] == endpoints["status"]["fetches"] == 2
+    assert endpoints["balance"]["fetches"] == endpoints["daily"]["fetches"] == 1
+
+
+def test_secondary_endpoint_failure_keeps_profit():
+    with FakeFreqtradeServer(payloads={"profit": SAMPLE_PROFIT}) as server:
+        service = _service(server.profit_url, "profit:0,status:0")
+        result = service.fetch()
+
+    assert result.status == "ok"
+    assert result.data == SAMPLE_PROFIT
+    assert result.snapshot.open_trades is None
+    assert service.stats()["endpoints"]["status"]["errors"] == 1
+
+
+def test_failed_secondary_endpoint_is_not_served_stale():
+    with FakeFreqtradeServer() as server:
+        service = _service(server.profit_url, "profit:0,status:0")
+        first = service.fetch()
+        del server.payloads["status"]
+        second = service.fetch()
+
+    assert len(first.snapshot.open_trades) == 2
+    assert second.status == "ok"
+    assert second.snapshot.open_trades is None
+    assert "open_trade_count" not in second.data
+    assert service.stats()["endpoints"]["status"]["errors"] == 1
+
+
+def test_stats_do_not_wait_for_a_slow_poll():
+    with FakeFreqtradeServer(latency_s=0.5) as server:
+        service = _service(server.profit_url, "profit:0,status:0")
+        poll = threading.Thread(target=service.fetch)
+        poll.start()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        service.stats()
+        elapsed = time.perf_counter() - start
+        poll.join()
+
+    assert elapsed < 0.2
@@ -0,0 +1,36 @@
+import json
+
+from propan.bench.stand_ins import SAMPLE_PROFIT
+from propan.services.commentary import CommentaryService
+from propan.services.prompt import compact_stats, estimate_tokens, parse_fields, project_profit
+from propan.settings import Settings
+
+
+def test_projection_keeps_field_order_and_rounds():
+    fields = parse_fields(" profit_all_coin, trade_count ,, winrate ")
+    assert fields == ("profit_all_coin", "trade_count", "winrate")
+
+    projected = project_profit(SAMPLE_PROFIT, fields)
+    assert list(projected) == list(fields)
+    assert projected == {"profit_all_coin": -9.119, "trade_count": 9, "winrate": 0.375}
+    assert project_profit({"profit": 2.0004, "extra": 1}, ("profit",)) == {"profit": 2}
+
+
+def test_unknown_payload_falls_back_to_sorted_full_payload():
+    payload = {"zeta": 1.23456, "alpha": {"b": float("nan"), "a": 0.5}}
+    assert compact_stats(payload, ("profit_all_coin",)) == (
+        '{"alpha":{"a":0.5,"b":null},"zeta":1.235}'
+    )
+    assert compact_stats(payload, ()) == compact_stats(dict(reversed(payload.items())), ())
+
+
+def test_service_prompt_is_compact_and_configurable():
+    legacy_tokens = estimate_tokens(f"Stats: {SAMPLE_PROFIT}")
+    service = CommentaryService(Settings(HAL_COMMENTARY_CACHE_SIZE=0))
+    prompt = service._build_prompt(SAMPLE_PROFIT)
+    stats = json.loads(prompt.split("Stats: ", 1)[1].split("\n", 1)[0])
+    assert "bot_start_date" not in stats
+    assert estimate_tokens(prompt) < legacy_tokens / 2
+
+    narrow = CommentaryService(Settings(HAL_COMMENTARY_CACHE_SIZE=0, HAL_PROMPT_FIELDS="best_pair"))
+    assert 'Stats: {"best_pair":"ETH/USDT"}' in narrow._build_prompt(SAMPLE_PROFIT)
@@ -0,0 +1,62 @@
+import pytest
+
+from propan.evolution.sandbox import SandboxLimits, SandboxPool, evaluate_candidate
+
+MODULE = "propan.ouroboros"
+
+
+def _task(code: str, index: int = 0) -> tuple:
+    return (MODULE, "noyau_vital", code, None, index)
+
+
+@pytest.fixture
+def pool():
+    pool = SandboxPool(2, SandboxLimits(cpu_s=1, wall_s=3, memory_mb=64), preload=(MODULE,))
+    yield pool
+    pool.close()
+
+
+def test_working_candidate_reports_result_and_rss(pool):
+    result = pool.run(_task("def noyau_vital():\n    return 40 + 2\n"))
+    assert result.ok
+    assert result.result == "42"
+    assert result.peak_rss_kb > 0
+
+
+def test_cpu_hog_is_killed_and_replaced(pool):
+    results = pool.map(
+        [
+            _task("def noyau_vital():\n    while True:\n        pass\n", 0),
+            _task("def noyau_vital():\n    return 42\n", 1),
+        ]
+    )
+    assert not results[0].ok
+    assert "CPU" in results[0].error
+    assert results[1].ok
+    assert pool.killed == 1
+    assert pool.run(_task("def noyau_vital():\n    return 1\n")).ok
+
+
+def test_wall_time_limit(pool):
+    code = "def noyau_vital():\n    import time\n    time.sleep(10)\n"
+    result = pool.run(_task(code))
+    assert not result.ok
+    assert "délai" in result.error
+    assert result.transient
+
+
+def test_memory_limit_raises_memory_error(pool):
+    code = "def noyau_vital():\n    return len(bytearray(512 * 1024 * 1024))\n"
+    result = pool.run(_task(code))
+    assert not result.ok
+    assert "MemoryError" in result.error
+    assert result.transient
+
+
+def test_candidate_without_the_function_is_rejected_against_a_baseline():
+    baseline = "def noyau_vital():\n    return 42\n"
+    result = evaluate_candidate(
+        MODULE, "noyau_vital", "def autre():\n    return 1\n", None, 0, baseline
+    )
+    assert not result.ok
+    assert "noyau_vital absente" in result.error
@@ -0,0 +1,45 @@
+import time
+
+from propan.bench.runners import stand_in_state
+from propan.bench.stand_ins import SAMPLE_PROFIT
+from propan.hal_brain import run_cycle, speculate
+from propan.services.commentary_cache import profit_fingerprint
+from propan.services.speculation import Speculator, likely_next_states
+
+
+def test_likely_next_states_cover_neighbouring_regimes():
+    states = likely_next_states({"profit_all_coin": -0.5, "trade_count": 4})
+    assert states[0] == {"profit_all_coin": -0.5, "trade_count": 4}
+    assert states[1]["trade_count"] == 5
+    assert states[-1]["profit_all_coin"] == 0.5  # mood flip near zero
+    keys = {profit_fingerprint(state, "x") for state in states}
+    assert len(keys) == len(states)
+    assert likely_next_states({}) == []
+
+
+def test_idle_time_fills_commentary_and_audio_caches(tmp_path):
+    with stand_in_state(tmp_path, HAL_SPECULATIVE=True, HAL_COMMENTARY_CACHE_VARIANTS=1) as app:
+        state = app.extensions["state"]
+        run_cycle(state)
+        speculate(state, time.monotonic() + 5)
+
+        stats = state.speculator.stats()
+        assert stats["generated"] >= 1
+        assert stats["audio"] == 0  # same stand-in reply, audio already cached
+
+        upcoming = likely_next_states(SAMPLE_PROFIT)[1]
+        result = state.commentary_service.generate(upcoming)
+        assert result.cached is True
+        assert state.tts_service.audio_cache.contains(result.text)
+
+
+def test_speculation_never_exceeds_its_quota_share(tmp_path):
+    with stand_in_state(tmp_path, HAL_COMMENTARY_CACHE_VARIANTS=1) as app:
+        state = app.extensions["state"]
+        speculator = Speculator(enabled=True, share=0.1, requests_per_minute=10)
+        added = speculator.run(
+            SAMPLE_PROFIT, state.commentary_service, state.tts_service, time.monotonic() + 5
+        )
+
+    assert added == 1
+    assert speculator.stats()["budget_exhausted"] == 1
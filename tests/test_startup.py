@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+from propan.bench.startup import import_profile, parse_importtime
+
+DEFERRED_MODULES = ("pydantic", "requests", "flask", "rich")
+# Secondary guard only: the assertion that matters is which modules get imported.
+IMPORT_BUDGET_MS = 2000
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   typer\n"
+        "import time:       300 |        420 | propan.cli\n"
+    )
+    assert parse_importtime(output) == {"typer": 120, "propan.cli": 420}
+
+
+def test_cli_import_defers_heavy_dependencies():
+    code = (
+        "import sys, propan.cli; "
+        f"print(' '.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert loaded == [], f"heavy imports at CLI start: {loaded}"
+
+    profile = import_profile("propan.cli")
+    assert profile["heavy_modules"] == [], f"heavy imports at CLI start: {profile}"
+    assert profile["cumulative_ms"] < IMPORT_BUDGET_MS
@@ -0,0 +1,53 @@
+import threading
+
+from propan.bench.runners import stand_in_state
+from propan.bench.stand_ins import FAKE_REPLY
+from propan.hal_brain import run_cycle
+from propan.services.commentary import SentenceSplitter
+
+
+def test_sentence_splitter_emits_finished_sentences():
+    splitter = SentenceSplitter()
+    assert splitter.feed("Bonjour Dave") == []
+    assert splitter.feed(". Je suis") == ["Bonjour Dave."]
+    assert splitter.feed(" HAL! Fin") == ["Je suis HAL!"]
+    assert splitter.flush() == "Fin"
+    assert splitter.flush() is None
+
+
+def test_streamed_cycle_publishes_deltas_and_speaks_per_sentence(tmp_path):
+    with stand_in_state(tmp_path, HAL_STREAM_COMMENTARY=True) as app:
+        state = app.extensions["state"]
+        seen: list[str] = []
+        done = threading.Event()
+
+        def _follow() -> None:
+            version = state.stream_version
+            while True:
+                snapshot = state.wait_stream(version, timeout=5)
+                version = snapshot["version"]
+                if snapshot["active"] and snapshot["text"]:
+                    seen.append(snapshot["text"])
+                if not snapshot["active"] and seen:
+                    done.set()
+                    return
+
+        follower = threading.Thread(target=_follow, daemon=True)
+        follower.start()
+        run_cycle(state)
+        assert done.wait(5)
+
+        assert state.last_commentary_status == "ok"
+        assert state.last_commentary == FAKE_REPLY
+        assert state.last_commentary_ttft_ms is not None
+        assert state.last_audio_status == "ok"
+        assert seen[-1] == FAKE_REPLY
+        audio = state.settings.hal_speech_file.read_bytes()
+        assert audio.count(b"ID3") == 2  # one synthesis per sentence
+
+        client = app.test_client()
+        response = client.get("/api/thoughts/stream?max_events=1")
+        assert response.mimetype == "text/event-stream"
+        assert FAKE_REPLY in response.get_data(as_text=True)
+        health = client.get("/api/health").get_json()
+        assert health["thought"]["ttft_ms"] == state.last_commentary_ttft_ms
@@ -0,0 +1,48 @@
+from propan.evolution import FitnessHarness
+from propan.evolution.tournament import Candidate, Tournament, spread_variants
+
+FAST = "def noyau_vital():\n    return 42\n"
+WRONG = "def noyau_vital():\n    return 0\n"
+BROKEN = "def noyau_vital():\n    raise ValueError('boom')\n"
+
+
+def test_variants_spread_temperatures_and_cycle_hints():
+    variants = spread_variants(3, ["a", "b"])
+    assert [variant.temperature for variant in variants] == [0.2, 0.6, 1.0]
+    assert [variant.hint for variant in variants] == ["a", "b", "a"]
+    assert spread_variants(1, []) == spread_variants(1, [""])
+
+
+def test_generate_drops_failed_requests():
+    def request(variant):
+        if variant.index == 1:
+            raise RuntimeError("quota")
+        return f"code-{variant.index}"
+
+    assert Tournament(candidates=3).generate(request, ["x"]) == ["code-0", "code-2"]
+
+
+def test_fittest_working_candidate_wins():
+    tournament = Tournament(candidates=3, workers=2)
+    harness = FitnessHarness(repeats=6, warmup=1)
+    try:
+        results = tournament.evaluate(
+            "propan.ouroboros",
+            "noyau_vital",
+            [Candidate.parse(code) for code in (WRONG, BROKEN, FAST)],
+            harness,
+        )
+    finally:
+        tournament.close()
+
+    assert [result.ok for result in results] == [True, False, True]
+    assert "ValueError" in results[1].error
+    assert not results[0].verdict.accepted
+    assert results[2].verdict.accepted
+
+    winner = tournament.select(
+        (r for r in results if r.verdict is not None and r.verdict.accepted),
+        key=lambda r: r.verdict.score,
+    )
+    assert winner.code == FAST
+    assert tournament.select([results[1]], key=lambda r: 0) is None
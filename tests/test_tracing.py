@@ -0,0 +1,57 @@
+from typer.testing import CliRunner
+
+from propan.cli import app
+from propan.tracing import Tracer, read_spans, summarize_cycles, to_chrome_trace
+
+runner = CliRunner()
+
+
+def test_disabled_tracer_writes_nothing(tmp_path):
+    tracer = Tracer(None)
+    with tracer.cycle() as cycle, tracer.span("profit.fetch") as span:
+        span.set(bytes=12)
+    assert cycle.recording is False
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cycle_summary_orders_slowest_first(tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+    tracer = Tracer(trace_file)
+    for _ in range(2):
+        with tracer.cycle():
+            with tracer.span("profit.fetch") as span:
+                span.set(status="ok", bytes=42)
+            with tracer.span("tts.generate") as span:
+                span.set(status="skipped")
+
+    spans = read_spans(trace_file)
+    assert len(spans) == 6
+    assert {span["cycle"] for span in spans if span["name"] == "tts.generate"} == {
+        span["cycle"] for span in spans if span["name"] == "cycle"
+    }
+    cycles = summarize_cycles(spans)
+    assert len(cycles) == 2
+    assert cycles[0].duration_ms >= cycles[1].duration_ms
+    assert set(cycles[0].stages) == {"profit.fetch", "tts.generate"}
+    assert len(to_chrome_trace(spans)["traceEvents"]) == 6
+
+
+def test_trace_rotation(tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+    tracer = Tracer(trace_file, max_bytes=300, backups=1)
+    for _ in range(5):
+        with tracer.cycle():
+            pass
+    assert (tmp_path / "trace.jsonl.1").exists()
+    assert trace_file.stat().st_size <= 300
+
+
+def test_trace_command(tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+    tracer = Tracer(trace_file)
+    with tracer.cycle(), tracer.span("commentary.generate"):
+        pass
+
+    result = runner.invoke(app, ["trace", "--file", str(trace_file)])
+    assert result.exit_code == 0
+    assert "commentary.generate" in result.stdout
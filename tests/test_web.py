@@ -36,3 +36,28 @@ def test_profit_disabled(monkeypatch):
     assert response.status_code == 200
     payload = response.get_json()
     assert payload["status"] == "disabled"
+
+
+def test_feed_sends_only_changed_sections(monkeypatch):
+    import json
+    import threading
+
+    client = _client(monkeypatch)
+    state = client.application.extensions["state"]
+
+    def _update():
+        state.wait_feed({}, timeout=0)
+        state.touch_profit("ok", {"profit_all_coin": 12.5, "ignored": "x"}, None)
+
+    threading.Timer(0.2, _update).start()
+    response = client.get("/api/feed?max_events=2")
+    assert response.mimetype == "text/event-stream"
+    events = [
+        json.loads(line[len("data: ") :])
+        for line in response.get_data(as_text=True).splitlines()
+        if line.startswith("data: ")
+    ]
+    assert set(events[0]["sections"]) == {"profit", "thought", "health", "stream"}
+    assert set(events[1]["sections"]) == {"profit", "health"}
+    assert events[1]["sections"]["profit"]["values"] == {"profit_all_coin": 12.5}
+    assert events[1]["sections"]["health"]["profit"]["status"] == "ok"